@@ -0,0 +1,43 @@
+"""foreign key indexes of user_roles and the team/guardian link tables
+
+Revision ID: 2a7f5c8e0d19
+Revises: 9c4d7e1b2f56
+Create Date: 2026-10-18 16:48:55.260394
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2a7f5c8e0d19'
+down_revision = '9c4d7e1b2f56'
+branch_labels = None
+depends_on = None
+
+# Foreign keys the repositories and relationships look rows up by: roles
+# of a user (login, /auth/me, role updates deleting by user_id), users of a
+# role, players and officials of a team, players of a guardian. Without
+# them every lookup, and every FK check when a parent row goes, scans the
+# whole link table. The live-row listing indexes of users and teams are in
+# 6e2b9d4f1a83.
+INDEXES = [
+    ("ix_user_roles_user_id", "user_roles", "user_id"),
+    ("ix_user_roles_role_id", "user_roles", "role_id"),
+    ("ix_team_players_team_id", "team_players", "team_id"),
+    ("ix_team_officials_team_id", "team_officials", "team_id"),
+    ("ix_guardian_players_guardian_id", "guardian_players", "guardian_id"),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently: the tables stay writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,131 @@
+"""Partition perf_logs by created_at
+
+Revision ID: 3f1c9a7d2e40
+Revises: 8b5cfa202327
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2e40'
+down_revision = '8b5cfa202327'
+branch_labels = None
+depends_on = None
+
+
+# Rows per UPDATE when backfilling a NULL created_at
+BACKFILL_BATCH = 10000
+
+
+def upgrade() -> None:
+    # perf_logs is large, so nothing below scans it under ACCESS EXCLUSIVE.
+    # The table becomes the first partition (MINVALUE up to `legacy_upper`)
+    # without copying rows: a validated CHECK matching the partition bound
+    # lets SET NOT NULL and ATTACH PARTITION skip their scans, and the
+    # (id, created_at) unique index is built beforehand for the attach to
+    # adopt. Retention drops the partition once it has fully expired.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        # A plain read, concurrent with writes. Rows are stamped with the
+        # current time, so two days ahead leaves room for the migration.
+        legacy_upper = bind.execute(sa.text("""
+            SELECT GREATEST(
+                date_trunc('day', timezone('Asia/Jakarta', now())) + interval '2 days',
+                COALESCE(date_trunc('day', max(created_at)) + interval '1 day', '-infinity')
+            ) FROM perf_logs
+        """)).scalar()
+
+        # Catalog only; from here on new rows are checked, old ones are not yet
+        op.execute(
+            "ALTER TABLE perf_logs ADD CONSTRAINT perf_logs_legacy_bound "
+            f"CHECK (created_at IS NOT NULL AND created_at < '{legacy_upper.isoformat()}') NOT VALID"
+        )
+
+        # Short transactions over id ranges of the primary key
+        low, high = bind.execute(sa.text("SELECT min(id), max(id) FROM perf_logs")).one()
+        for start in range(low or 0, (high or 0) + 1, BACKFILL_BATCH):
+            bind.execute(sa.text(
+                "UPDATE perf_logs SET created_at = 'epoch'::timestamp "
+                "WHERE id >= :start AND id < :end AND created_at IS NULL"
+            ), {"start": start, "end": start + BACKFILL_BATCH})
+
+        # Scans under SHARE UPDATE EXCLUSIVE: reads and writes carry on
+        op.execute("ALTER TABLE perf_logs VALIDATE CONSTRAINT perf_logs_legacy_bound")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS perf_logs_legacy_id_created_at "
+            "ON perf_logs (id, created_at)"
+        )
+
+    # Catalog changes only, thanks to the constraint and index above
+    op.execute("ALTER TABLE perf_logs RENAME TO perf_logs_legacy")
+    op.execute("ALTER TABLE perf_logs_legacy DROP CONSTRAINT perf_logs_pkey")
+    op.execute("ALTER TABLE perf_logs_legacy ALTER COLUMN created_at SET NOT NULL")
+    # The attach only adopts an index that backs a constraint
+    op.execute(
+        "ALTER TABLE perf_logs_legacy ADD CONSTRAINT perf_logs_legacy_pkey "
+        "PRIMARY KEY USING INDEX perf_logs_legacy_id_created_at"
+    )
+
+    op.execute("""
+        CREATE TABLE perf_logs (
+            id INTEGER NOT NULL DEFAULT nextval('perf_logs_id_seq'),
+            method VARCHAR NOT NULL,
+            url VARCHAR NOT NULL,
+            req_headers JSONB,
+            req_body JSONB,
+            resp_status SMALLINT,
+            duration FLOAT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT timezone('Asia/Jakarta', now()),
+            CONSTRAINT perf_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE perf_logs_id_seq OWNED BY perf_logs.id")
+    op.execute("ALTER TABLE perf_logs_legacy ALTER COLUMN id DROP DEFAULT")
+
+    # Attach the legacy table and create monthly partitions up to three months
+    # ahead; script/maintain_perf_logs.py keeps them coming after that.
+    op.execute(
+        "ALTER TABLE perf_logs ATTACH PARTITION perf_logs_legacy "
+        f"FOR VALUES FROM (MINVALUE) TO ('{legacy_upper.isoformat()}')"
+    )
+    op.execute("ALTER TABLE perf_logs_legacy DROP CONSTRAINT perf_logs_legacy_bound")
+    op.execute(f"""
+        DO $$
+        DECLARE
+            period_start timestamp := '{legacy_upper.isoformat()}';
+            period_end timestamp;
+        BEGIN
+            FOR i IN 1..3 LOOP
+                period_end := date_trunc('month', period_start) + interval '1 month';
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF perf_logs FOR VALUES FROM (%L) TO (%L)',
+                    'perf_logs_p' || to_char(period_start, 'YYYYMMDD'), period_start, period_end
+                );
+                period_start := period_end;
+            END LOOP;
+        END $$;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE TABLE perf_logs_plain (
+            id INTEGER NOT NULL DEFAULT nextval('perf_logs_id_seq'),
+            method VARCHAR NOT NULL,
+            url VARCHAR NOT NULL,
+            req_headers JSONB,
+            req_body JSONB,
+            resp_status SMALLINT,
+            duration FLOAT,
+            created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT timezone('Asia/Jakarta', now()),
+            CONSTRAINT perf_logs_plain_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("INSERT INTO perf_logs_plain SELECT * FROM perf_logs")
+    op.execute("ALTER SEQUENCE perf_logs_id_seq OWNED BY perf_logs_plain.id")
+    op.execute("DROP TABLE perf_logs")
+    op.execute("ALTER TABLE perf_logs_plain RENAME TO perf_logs")
+    op.execute("ALTER TABLE perf_logs RENAME CONSTRAINT perf_logs_plain_pkey TO perf_logs_pkey")
@@ -0,0 +1,25 @@
+"""Index revoked_tokens.revoked_at
+
+Revision ID: 5d2f8e3b7a61
+Revises: a91e4b6c0d17
+Create Date: 2026-10-18 13:05:27.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2f8e3b7a61'
+down_revision = 'a91e4b6c0d17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Incremental refresh of the in-process revoked token cache
+    op.create_index(op.f('ix_revoked_tokens_revoked_at'), 'revoked_tokens', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_revoked_tokens_revoked_at'), table_name='revoked_tokens')
@@ -0,0 +1,37 @@
+"""users, teams and guardians keyset pagination indexes
+
+Revision ID: 6e2b9d4f1a83
+Revises: e4a8c1f6b392
+Create Date: 2026-10-18 15:12:40.118230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2b9d4f1a83'
+down_revision = 'e4a8c1f6b392'
+branch_labels = None
+depends_on = None
+
+# Newest-first listings seek on (created_at, id); users and teams only ever
+# list live rows
+INDEXES = [
+    ("ix_users_live_created_at_id", "users", "(created_at, id) WHERE deleted_at IS NULL"),
+    ("ix_teams_live_created_at_id", "teams", "(created_at, id) WHERE deleted_at IS NULL"),
+    ("ix_guardians_created_at_id", "guardians", "(created_at, id)"),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently: the tables stay writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {columns}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
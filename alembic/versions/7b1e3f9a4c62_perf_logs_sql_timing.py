@@ -0,0 +1,32 @@
+"""perf_logs SQL timing columns
+
+Revision ID: 7b1e3f9a4c62
+Revises: 2a7f5c8e0d19
+Create Date: 2026-10-18 17:31:08.972614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b1e3f9a4c62'
+down_revision = '2a7f5c8e0d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without default: a catalog change only, the partitions get
+    # the columns too and existing rows are not rewritten
+    op.add_column('perf_logs', sa.Column('db_queries', sa.Integer(), nullable=True))
+    op.add_column('perf_logs', sa.Column('db_duration', sa.Float(), nullable=True))
+    op.add_column('perf_logs', sa.Column('db_slowest_duration', sa.Float(), nullable=True))
+    op.add_column('perf_logs', sa.Column('db_slowest_statement', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('perf_logs', 'db_slowest_statement')
+    op.drop_column('perf_logs', 'db_slowest_duration')
+    op.drop_column('perf_logs', 'db_duration')
+    op.drop_column('perf_logs', 'db_queries')
@@ -0,0 +1,49 @@
+"""pg_trgm and full-text name search indexes
+
+Revision ID: 9c4d7e1b2f56
+Revises: 6e2b9d4f1a83
+Create Date: 2026-10-18 16:03:27.504117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4d7e1b2f56'
+down_revision = '6e2b9d4f1a83'
+branch_labels = None
+depends_on = None
+
+# Name columns searched by app.utils.search. The trigram index serves
+# ILIKE '%q%' (contains) and word similarity (similar); the tsvector
+# expression index, whose expression must match name_tsvector(), serves
+# fulltext. Users and teams only ever search live rows.
+NAME_COLUMNS = [
+    ("users", "full_name", "WHERE deleted_at IS NULL"),
+    ("teams", "team_name", "WHERE deleted_at IS NULL"),
+    ("guardians", "name", ""),
+]
+
+
+def indexes():
+    for table, column, where in NAME_COLUMNS:
+        yield f"ix_{table}_{column}_trgm", table, f"USING gin ({column} gin_trgm_ops) {where}"
+        yield f"ix_{table}_{column}_fts", table, f"USING gin (to_tsvector('simple'::regconfig, {column})) {where}"
+
+
+def upgrade() -> None:
+    # Trusted extension since PostgreSQL 13: the database owner may create it
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Built concurrently: the tables stay writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, definition in indexes():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def downgrade() -> None:
+    # pg_trgm stays installed: other objects may use it
+    with op.get_context().autocommit_block():
+        for name, _, _ in indexes():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,52 @@
+"""perf_logs keyset pagination indexes
+
+Revision ID: a91e4b6c0d17
+Revises: 3f1c9a7d2e40
+Create Date: 2026-10-18 11:46:03.540921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a91e4b6c0d17'
+down_revision = '3f1c9a7d2e40'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_perf_logs_created_at_id", "(created_at, id)"),
+    ("ix_perf_logs_resp_status_created_at_id", "(resp_status, created_at, id)"),
+    ("ix_perf_logs_url_prefix", "(url text_pattern_ops)"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY is not available on a partitioned table.
+    # Create the parent index ON ONLY (invalid, instant), build each
+    # partition's index concurrently and attach it; the parent index becomes
+    # valid once every partition has one.
+    partitions = [
+        row[0] for row in op.get_bind().execute(sa.text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'perf_logs'"
+        ))
+    ]
+
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY perf_logs {columns}")
+
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            for name, columns in INDEXES:
+                partition_index = f"{partition}_{name[len('ix_perf_logs_'):]}_idx"
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} {columns}")
+                op.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
+
+
+def downgrade() -> None:
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
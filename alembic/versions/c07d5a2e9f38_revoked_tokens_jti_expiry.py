@@ -0,0 +1,43 @@
+"""Key revoked_tokens by jti and keep the token expiry
+
+Revision ID: c07d5a2e9f38
+Revises: 5d2f8e3b7a61
+Create Date: 2026-10-18 14:21:50.671380
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c07d5a2e9f38'
+down_revision = '5d2f8e3b7a61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('revoked_tokens', sa.Column('jti', sa.String(length=64), nullable=True))
+    op.add_column('revoked_tokens', sa.Column('expires_at', sa.DateTime(), nullable=True))
+
+    # Existing tokens carry no jti: key them by SHA-256 of the token, as
+    # token_key() does, and bound their expiry by the longest token lifetime.
+    op.execute("""
+        UPDATE revoked_tokens
+        SET jti = encode(sha256(convert_to(token, 'UTF8')), 'hex'),
+            expires_at = revoked_at + interval '43200 minutes'
+    """)
+
+    op.drop_constraint('revoked_tokens_pkey', 'revoked_tokens', type_='primary')
+    op.drop_column('revoked_tokens', 'token')
+    op.alter_column('revoked_tokens', 'jti', nullable=False)
+    op.alter_column('revoked_tokens', 'expires_at', nullable=False)
+    op.create_primary_key('revoked_tokens_pkey', 'revoked_tokens', ['jti'])
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    # The original token strings cannot be recovered; the keys are kept instead
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_column('revoked_tokens', 'expires_at')
+    op.alter_column('revoked_tokens', 'jti', new_column_name='token', type_=sa.String())
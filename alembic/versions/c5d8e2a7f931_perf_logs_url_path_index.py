@@ -0,0 +1,54 @@
+"""perf_logs url path prefix index
+
+Revision ID: c5d8e2a7f931
+Revises: 7b1e3f9a4c62
+Create Date: 2026-10-18 19:02:14.603218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5d8e2a7f931'
+down_revision = '7b1e3f9a4c62'
+branch_labels = None
+depends_on = None
+
+# url holds scheme and host; url_prefix filters match the path after them
+# (app.models.audit.URL_PATH_SQL), which the url index could not serve
+URL_PATH_INDEX = ("ix_perf_logs_url_path", "((regexp_replace(url, '^[^/]*//[^/]*', '')) text_pattern_ops)")
+URL_INDEX = ("ix_perf_logs_url_prefix", "(url text_pattern_ops)")
+
+
+def partitions() -> list:
+    return [
+        row[0] for row in op.get_bind().execute(sa.text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'perf_logs' AND c.relkind = 'r'"
+        ))
+    ]
+
+
+def create_partitioned_index(name: str, columns: str) -> None:
+    # As in a91e4b6c0d17: parent index ON ONLY, each partition's built
+    # concurrently and attached
+    tables = partitions()
+    op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY perf_logs {columns}")
+    with op.get_context().autocommit_block():
+        for partition in tables:
+            partition_index = f"{partition}_{name[len('ix_perf_logs_'):]}_idx"
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} {columns}")
+            op.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
+
+
+def upgrade() -> None:
+    create_partitioned_index(*URL_PATH_INDEX)
+    op.execute(f"DROP INDEX IF EXISTS {URL_INDEX[0]}")
+
+
+def downgrade() -> None:
+    create_partitioned_index(*URL_INDEX)
+    op.execute(f"DROP INDEX IF EXISTS {URL_PATH_INDEX[0]}")
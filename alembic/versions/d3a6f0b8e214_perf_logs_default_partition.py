@@ -0,0 +1,31 @@
+"""perf_logs DEFAULT partition
+
+Revision ID: d3a6f0b8e214
+Revises: c5d8e2a7f931
+Create Date: 2026-10-18 19:40:51.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a6f0b8e214'
+down_revision = 'c5d8e2a7f931'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Without it an insert past the last range partition fails ("no
+    # partition of relation found for row"), and the audit writer rejects
+    # the spooled batch. An empty new table: nothing is scanned. Creating a
+    # range partition later scans it, which stays cheap while maintenance
+    # keeps it empty (AuditPartitionRepository.create_partition moves rows
+    # out of it).
+    op.execute("CREATE TABLE IF NOT EXISTS perf_logs_default PARTITION OF perf_logs DEFAULT")
+
+
+def downgrade() -> None:
+    # Detached, not dropped: rows that landed in it are kept
+    op.execute("ALTER TABLE perf_logs DETACH PARTITION perf_logs_default")
@@ -1,68 +1,95 @@
-from datetime import datetime, timedelta
 import logging
 from fastapi import APIRouter, Depends, HTTPException, Form
-from app.middleware import jwt
+from app.core.constants.auth import (
+    JWT_API_TOKEN_EXPIRE_IN_MIN,
+    LOGOUT_SESSION_REVOKED,
+    LOGOUT_TOKEN_REVOKED,
+)
+from app.core.database import RequestSession, get_db
 from app.middleware.jwt import jwt_middleware, oauth2_bearer
-from app.repositories.token import RevokedToken
 from app.services.auth import AuthService
 from app.schemas.user_mgt import AuthUser
 from typing import Annotated
-from app.core.config import settings
-from jose import jwt 
-from pytz import timezone
-from datetime import datetime, timedelta
 
 router = APIRouter()
-auth_service = AuthService()
+
+
+def get_auth_service(db: Annotated[RequestSession, Depends(get_db)]) -> AuthService:
+    return AuthService(db)
+
 
 @router.post("/auth/login")
-def auth_get_access_token(
+async def auth_get_access_token(
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
     username: str = Form(...),  # Menggunakan 'username' agar sesuai dengan standar OAuth2
     password: str = Form(...)
 ):
-    access_token = auth_service.generate_token(username, password)
-    if not access_token:
+    tokens = await auth_service.generate_token(username, password)
+    if not tokens:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    return {"access_token": access_token, "type": "Bearer"}
+    return {**tokens, "type": "Bearer"}
+
+@router.post("/auth/refresh")
+async def auth_refresh_token(
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
+    refresh_token: str = Form(...),
+):
+    tokens = await auth_service.refresh_token(refresh_token)
+    return {**tokens, "type": "Bearer"}
 
 @router.get("/auth/me")
-def auth_get_me(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
-    user_data = auth_service.get_user_details(auth_user.id)
+async def auth_get_me(
+    auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
+):
+    user_data = await auth_service.get_user_details(auth_user.id)
     return user_data
 
-@router.post("/auth/logout")
-def logout(auth_user: Annotated[AuthUser, Depends(jwt_middleware)], token: str = Depends(oauth2_bearer)):
+LOGOUT_MESSAGES = {
+    LOGOUT_TOKEN_REVOKED: "Logout successful. Token has been revoked.",
+    LOGOUT_SESSION_REVOKED: (
+        "Logout successful. The session's refresh tokens have been revoked; "
+        "the access token stays valid until it expires."
+    ),
+}
+
+
+@router.post(
+    "/auth/logout",
+    description=(
+        "Revokes the refresh tokens of the session the access token belongs to; the access token itself "
+        f"stays valid until it expires. API tokens (/auth/api-token) cannot be revoked: they expire after "
+        f"{JWT_API_TOKEN_EXPIRE_IN_MIN} minutes."
+    ),
+)
+async def logout(
+    auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
+    token: str = Depends(oauth2_bearer),
+):
     if not auth_user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    RevokedToken.add(token)
-    return {"message": "Logout successful. Token has been revoked."}
+    revoked = await auth_service.revoke_token(token)
+    message = LOGOUT_MESSAGES.get(
+        revoked,
+        f"Nothing to revoke: API tokens cannot be revoked and expire within {JWT_API_TOKEN_EXPIRE_IN_MIN} minutes.",
+    )
+    return {"message": message}
 
 @router.post("/auth/api-token")
-def generate_api_token(auth_user: AuthUser = Depends(jwt_middleware)):
+async def generate_api_token(
+    auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    auth_service: Annotated[AuthService, Depends(get_auth_service)],
+):
     """
-    Generate a token for API usage with a short expiration time.
+    Generate a token for API usage with a short expiration time
+    (JWT_API_TOKEN_EXPIRE_IN_MIN). It has no session, so logout cannot
+    revoke it before it expires.
     """
     try:
-        # Gunakan zona waktu Indonesia
-        indonesia_tz = timezone("Asia/Jakarta")
-        current_time = datetime.now(indonesia_tz)
-        expire = current_time + timedelta(minutes=5)
-
-        # Generate payload menggunakan data dari `auth_user`
-        payload = {
-            "id": auth_user.id,
-            "full_name": auth_user.full_name,
-            "username": auth_user.username,
-            "email": auth_user.email,
-            "roles": auth_user.roles,
-            "exp": int(expire.timestamp()),  # Expiration as Unix timestamp
-            "expires": expire.isoformat()    # ISO format for human-readable expiration
-        }
-
-        # Encode token menggunakan jose.jwt
-        api_token = jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+        api_token = auth_service.generate_api_token(auth_user)
 
         return {"api_token": api_token, "type": "Bearer"}
     except Exception as e:
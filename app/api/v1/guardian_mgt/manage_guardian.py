@@ -1,19 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Optional, Annotated
 from app.schemas.guardian import GuardianCreate, GuardianUpdate
+from app.core.database import RequestSession, get_db
 from app.middleware.jwt import jwt_middleware, AuthUser
 from app.core.constants.auth import ROLE_GUARDIAN
+from app.core.constants.pagination import CountMode, DEFAULT_COUNT_MODE
+from app.core.constants.search import SearchMode, DEFAULT_SEARCH_MODE
 from app.services.guardian import GuardianService
 
 router = APIRouter()
-guardian_service = GuardianService()
+
+
+def get_guardian_service(db: Annotated[RequestSession, Depends(get_db)]) -> GuardianService:
+    return GuardianService(db)
 
 @router.get("/admin/guardians", description="List all guardians (ADMIN only)")
-def list_all_guardians(
+async def list_all_guardians(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    guardian_service: Annotated[GuardianService, Depends(get_guardian_service)],
     limit: int = 20,
     page: int = 1,
     q: Optional[str] = None,
+    count: CountMode = DEFAULT_COUNT_MODE,
+    cursor: Optional[str] = None,
+    search_mode: SearchMode = DEFAULT_SEARCH_MODE,
 ):
     # Check if the user has the 'ADMIN' role
     if not auth_user.roles or "ADMIN" not in auth_user.roles:
@@ -23,8 +33,9 @@ def list_all_guardians(
         )
 
     try:
-        guardians, total = guardian_service.list_all(limit=limit, page=page, search=q)
-        total_pages = (total + limit - 1) // limit  # Calculate total pages
+        result = await guardian_service.list_all(
+            limit=limit, page=page, search=q, count=count, cursor=cursor, search_mode=search_mode
+        )
 
         return {
             "data": [
@@ -36,21 +47,25 @@ def list_all_guardians(
                     "created_at": guardian.created_at,
                     "updated_at": guardian.updated_at,
                 }
-                for guardian in guardians
+                for guardian in result.rows
             ],
             "meta": {
                 "limit": limit,
                 "page": page,
-                "total_rows": total,
-                "total_pages": total_pages,
+                "total_rows": result.total_rows,
+                "total_pages": result.total_pages,
+                "has_next": result.has_next,
+                "count": result.count_mode,
+                "next_cursor": result.next_cursor,
             },
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/guardian", description="Create a guardian profile")
-def create_guardian(
+async def create_guardian(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    guardian_service: Annotated[GuardianService, Depends(get_guardian_service)],
     body: GuardianCreate,
 ):
     # Check if the user has the 'GUARDIAN' role
@@ -63,7 +78,7 @@ def create_guardian(
     try:
         payload = body.dict()
         payload["user_id"] = auth_user.id  # Associate the logged-in user
-        guardian = guardian_service.create(payload)
+        guardian = await guardian_service.create(payload)
         return {
             "data": {
                 "id": guardian.id,
@@ -79,7 +94,10 @@ def create_guardian(
 
 
 @router.get("/guardian-me", description="Get the logged-in guardian profile")
-def get_guardian(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
+async def get_guardian(
+    auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    guardian_service: Annotated[GuardianService, Depends(get_guardian_service)],
+):
     # Check if the user has the 'GUARDIAN' role
     if not auth_user.roles or ROLE_GUARDIAN not in auth_user.roles:
         raise HTTPException(
@@ -88,7 +106,7 @@ def get_guardian(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
         )
 
     try:
-        guardian = guardian_service.find_by_user_id(auth_user.id)
+        guardian = await guardian_service.find_by_user_id(auth_user.id)
         if not guardian:
             raise HTTPException(status_code=404, detail="Guardian profile not found.")
 
@@ -107,8 +125,9 @@ def get_guardian(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
 
 
 @router.put("/guardian", description="Update the logged-in guardian profile")
-def update_guardian(
+async def update_guardian(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    guardian_service: Annotated[GuardianService, Depends(get_guardian_service)],
     body: GuardianUpdate,
 ):
     # Check if the user has the 'GUARDIAN' role
@@ -120,7 +139,7 @@ def update_guardian(
 
     try:
         payload = body.dict(exclude_unset=True)  # Only include fields provided in the request
-        guardian = guardian_service.update(auth_user.id, payload)
+        guardian = await guardian_service.update(auth_user.id, payload)
         return {
             "data": {
                 "id": guardian.id,
@@ -136,7 +155,10 @@ def update_guardian(
 
 
 @router.delete("/guardian", description="Delete the logged-in guardian profile")
-def delete_guardian(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
+async def delete_guardian(
+    auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    guardian_service: Annotated[GuardianService, Depends(get_guardian_service)],
+):
     # Check if the user has the 'GUARDIAN' role
     if not auth_user.roles or ROLE_GUARDIAN not in auth_user.roles:
         raise HTTPException(
@@ -145,7 +167,7 @@ def delete_guardian(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
         )
 
     try:
-        guardian_service.delete(auth_user.id)
+        await guardian_service.delete(auth_user.id)
         return {"message": "Guardian profile deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
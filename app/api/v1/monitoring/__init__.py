@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+
+from app.api.v1.monitoring import manage_metrics, manage_perf_logs
+
+router = APIRouter(tags=["Monitoring"])
+
+router.include_router(manage_metrics.router)
+router.include_router(manage_perf_logs.router)
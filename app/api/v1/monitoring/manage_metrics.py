@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated
+from app.middleware.jwt import jwt_middleware, AuthUser
+from app.core.constants.auth import ROLE_ADMIN
+from app.core.config import settings
+from app.core.database import pool_metrics, pool_profile, replica_set
+from app.services.token import verified_token_cache
+from app.repositories.user import user_profile_cache
+from app.utils.metrics import latency_histograms
+
+router = APIRouter()
+
+
+@router.get("/admin/metrics/latency", description="Per-route latency percentiles over 1m/5m/15m windows (ADMIN only)")
+def get_latency_metrics(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
+    # Check if the user has the 'ADMIN' role
+    if not auth_user.roles or ROLE_ADMIN not in auth_user.roles:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied: Only ADMIN role can view metrics."
+        )
+
+    return {"data": latency_histograms.snapshot()}
+
+
+@router.get("/admin/metrics/caches", description="Size and hit/miss counters of the in-process caches (ADMIN only)")
+def get_cache_metrics(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
+    # Check if the user has the 'ADMIN' role
+    if not auth_user.roles or ROLE_ADMIN not in auth_user.roles:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied: Only ADMIN role can view metrics."
+        )
+
+    return {
+        "data": {
+            "user_profile": user_profile_cache.stats(),
+            "verified_token": verified_token_cache.stats(),
+        }
+    }
+
+
+@router.get("/admin/metrics/pools", description="Database connection pool gauges, counters and checkout latency (ADMIN only)")
+def get_pool_metrics(auth_user: Annotated[AuthUser, Depends(jwt_middleware)]):
+    # Check if the user has the 'ADMIN' role
+    if not auth_user.roles or ROLE_ADMIN not in auth_user.roles:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied: Only ADMIN role can view metrics."
+        )
+
+    return {
+        "data": {
+            "mode": settings.database_mode,
+            "profile": pool_profile(),
+            "pools": [metrics.snapshot() for metrics in pool_metrics.values()],
+            "replicas": replica_set.stats(),
+        }
+    }
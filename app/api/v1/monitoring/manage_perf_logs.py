@@ -0,0 +1,54 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional, Annotated
+from app.middleware.jwt import jwt_middleware, AuthUser
+from app.core.constants.audit import DEFAULT_PERF_LOGS_PAGE_LIMIT
+from app.core.constants.auth import ROLE_ADMIN
+from app.schemas.audit import ApiLogFilter
+from app.services.audit import ApiLogService
+
+router = APIRouter()
+log_service = ApiLogService()
+
+
+@router.get("/admin/perf-logs", description="Search the API audit log, newest first (ADMIN only)")
+def list_perf_logs(
+    auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    method: Optional[str] = None,
+    status: Optional[int] = None,
+    url_prefix: Optional[str] = Query(
+        None,
+        description="Prefix of the request path and query string, without scheme and host, e.g. /api/v1/team",
+    ),
+    min_duration_ms: Optional[float] = None,
+    limit: int = DEFAULT_PERF_LOGS_PAGE_LIMIT,
+    cursor: Optional[str] = None,
+):
+    # Check if the user has the 'ADMIN' role
+    if not auth_user.roles or ROLE_ADMIN not in auth_user.roles:
+        raise HTTPException(
+            status_code=403,
+            detail="Access denied: Only ADMIN role can view audit logs."
+        )
+
+    filter = ApiLogFilter(
+        start=start,
+        end=end,
+        method=method,
+        status=status,
+        url_prefix=url_prefix,
+        min_duration_ms=min_duration_ms,
+        limit=limit,
+        cursor=cursor,
+    )
+    logs, next_cursor = log_service.search(filter)
+
+    return {
+        "data": logs,
+        "meta": {
+            "limit": limit,
+            "next_cursor": next_cursor,
+        },
+    }
@@ -1,17 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import Optional, Annotated
 from app.schemas.team import TeamCreate, TeamUpdate
+from app.core.database import RequestSession, get_db
 from app.middleware.jwt import jwt_middleware, AuthUser
 from app.core.constants.auth import ROLE_ADMIN
+from app.core.constants.pagination import CountMode, DEFAULT_COUNT_MODE
+from app.core.constants.search import SearchMode, DEFAULT_SEARCH_MODE
 from app.services.team import TeamService
 
 router = APIRouter()
-team_service = TeamService()
+
+
+def get_team_service(db: Annotated[RequestSession, Depends(get_db)]) -> TeamService:
+    return TeamService(db)
 
 
 @router.post("/team", description="Create a new team")
-def create_team(
+async def create_team(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    team_service: Annotated[TeamService, Depends(get_team_service)],
     body: TeamCreate,
 ):
     # Check if the user has the 'ADMIN' role
@@ -22,7 +29,7 @@ def create_team(
         )
 
     try:
-        team = team_service.create(body.dict())
+        team = await team_service.create(body.dict())
         return {
             "data": {
                 "id": team.id,
@@ -39,8 +46,9 @@ def create_team(
 
 
 @router.get("/team/{id}", description="Get a team by ID")
-def get_team(
+async def get_team(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    team_service: Annotated[TeamService, Depends(get_team_service)],
     id: int,
 ):
     # Check if the user has the 'ADMIN' role
@@ -51,7 +59,7 @@ def get_team(
         )
 
     try:
-        team = team_service.find_by_id(id)
+        team = await team_service.find_by_id(id)
         return {
             "data": {
                 "id": team.id,
@@ -68,8 +76,9 @@ def get_team(
 
 
 @router.put("/team/{id}", description="Update a team")
-def update_team(
+async def update_team(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    team_service: Annotated[TeamService, Depends(get_team_service)],
     id: int,
     body: TeamUpdate,
 ):
@@ -81,7 +90,7 @@ def update_team(
         )
 
     try:
-        team = team_service.update(id, body.dict())
+        team = await team_service.update(id, body.dict())
         return {
             "data": {
                 "id": team.id,
@@ -98,8 +107,9 @@ def update_team(
 
 
 @router.delete("/team/{id}", description="Delete a team")
-def delete_team(
+async def delete_team(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    team_service: Annotated[TeamService, Depends(get_team_service)],
     id: int,
 ):
     # Check if the user has the 'ADMIN' role
@@ -110,18 +120,22 @@ def delete_team(
         )
 
     try:
-        team_service.delete(id)
+        await team_service.delete(id)
         return {"message": "Team deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/team", description="List all teams with pagination and search")
-def list_teams(
+async def list_teams(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    team_service: Annotated[TeamService, Depends(get_team_service)],
     limit: int = 20,
     page: int = 1,
     q: Optional[str] = None,
+    count: CountMode = DEFAULT_COUNT_MODE,
+    cursor: Optional[str] = None,
+    search_mode: SearchMode = DEFAULT_SEARCH_MODE,
 ):
     # Check if the user has the 'ADMIN' role
     if not auth_user.roles or ROLE_ADMIN not in auth_user.roles:
@@ -131,7 +145,7 @@ def list_teams(
         )
 
     try:
-        teams, total_rows, total_pages = team_service.list(limit, page, q)
+        result = await team_service.list(limit, page, q, count, cursor, search_mode)
         return {
             "data": [
                 {
@@ -143,13 +157,16 @@ def list_teams(
                     "created_at": team.created_at,
                     "updated_at": team.updated_at,
                 }
-                for team in teams
+                for team in result.rows
             ],
             "meta": {
                 "limit": limit,
                 "page": page,
-                "total_rows": total_rows,
-                "total_pages": total_pages,
+                "total_rows": result.total_rows,
+                "total_pages": result.total_pages,
+                "has_next": result.has_next,
+                "count": result.count_mode,
+                "next_cursor": result.next_cursor,
             },
         }
     except Exception as e:
@@ -3,29 +3,41 @@ from typing import Optional, Annotated
 
 from app.schemas.user_mgt import UserCreate, UserUpdate, RegisterUpdate, UserFilter
 
+from app.core.database import RequestSession, get_db
 from app.middleware.jwt import jwt_middleware, AuthUser
 from app.core.constants.auth import ROLE_ADMIN
+from app.core.constants.pagination import CountMode, DEFAULT_COUNT_MODE
+from app.core.constants.search import SearchMode, DEFAULT_SEARCH_MODE
 
 from app.services.auth import AuthService
 from app.services.user import UserService
 
 router = APIRouter()
 auth_service = AuthService()
-user_service = UserService()
+
+
+def get_user_service(db: Annotated[RequestSession, Depends(get_db)]) -> UserService:
+    return UserService(db)
 
 
 @router.get("/user", description="For user management")
-def user_list(
+async def user_list(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     limit: int = 20,  # Default limit jika tidak diberikan
     page: int = 1,  # Default page jika tidak diberikan
     q: Optional[str] = None,  # Query untuk pencarian full_name
+    count: CountMode = DEFAULT_COUNT_MODE,  # exact, estimated atau none
+    cursor: Optional[str] = None,  # Keyset: next_cursor dari halaman sebelumnya
+    search_mode: SearchMode = DEFAULT_SEARCH_MODE,  # contains, fulltext atau similar
 ):
     # Buat filter berdasarkan parameter
-    filter = UserFilter(limit=limit, page=page, search=q)
+    filter = UserFilter(
+        limit=limit, page=page, search=q, count=count, cursor=cursor, search_mode=search_mode
+    )
 
     # Ambil data user menggunakan filter
-    users, total_rows, total_pages = user_service.list(filter)
+    result = await user_service.list(filter)
 
     return {
         "data": [
@@ -37,20 +49,24 @@ def user_list(
                 "created_at": user.created_at,
                 "updated_at": user.updated_at,
             }
-            for user in users
+            for user in result.rows
         ],
         "meta": {
             "limit": limit,
             "page": page,
-            "total_rows": total_rows,
-            "total_pages": total_pages,
+            "total_rows": result.total_rows,
+            "total_pages": result.total_pages,
+            "has_next": result.has_next,
+            "count": result.count_mode,
+            "next_cursor": result.next_cursor,
         },
     }
 
 
 @router.post("/user")
-def user_create(
+async def user_create(
     # auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+        user_service: Annotated[UserService, Depends(get_user_service)],
         body: UserCreate
 ):
     # Check if the user has the 'ADMIN' role
@@ -60,7 +76,7 @@ def user_create(
     #         detail="Access denied: Only ADMIN role can create a new user."
     #     )
 
-    user = user_service.create(body)
+    user = await user_service.create(body)
 
     return {
         "data": {
@@ -74,8 +90,9 @@ def user_create(
     }
 
 @router.put("/user/{id}")
-def user_update(
+async def user_update(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
         id: int,
         body: UserUpdate
 ):
@@ -86,7 +103,7 @@ def user_update(
             detail="Access denied: Only ADMIN role can update user."
         )
 
-    user = user_service.update(id, body)
+    user = await user_service.update(id, body)
 
     return {
         "data": {
@@ -99,8 +116,9 @@ def user_update(
     }
 
 @router.delete("/user/{id}")
-def user_delete(
+async def user_delete(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     id: int
 ):
     # Check if the user has the 'ADMIN' role
@@ -110,7 +128,7 @@ def user_delete(
             detail="Access denied: Only ADMIN role can delete user"
         )
 
-    user_service.delete(id)
+    await user_service.delete(id)
     return {"message": "User deleted successfully"}
 
 # @router.put("/user/update_user_password")
@@ -122,8 +140,9 @@ def user_delete(
 #     return {"message": "Password updated successfully"}
 
 @router.put("/change_password/{id}")
-def user_update(
+async def user_update(
     auth_user: Annotated[AuthUser, Depends(jwt_middleware)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     id: int, body: RegisterUpdate
 ):
     # Check if the user has the 'ADMIN' role
@@ -133,7 +152,7 @@ def user_update(
             detail="Access denied: Only ADMIN role can change password"
         )
 
-    user = user_service.update_password(id, body)
+    user = await user_service.update_password(id, body)
 
     return {
         "data": {
@@ -3,6 +3,35 @@ from app.core.constants.app import (
     DEFAULT_APP_NAME,
     DEFAULT_APP_VERSION,
 )
+from app.core.constants.audit import (
+    DEFAULT_AUDIT_BATCH_SIZE,
+    DEFAULT_AUDIT_BLOCK_TIMEOUT_MS,
+    DEFAULT_AUDIT_DB_RETRY_INTERVAL_MS,
+    DEFAULT_AUDIT_FLUSH_INTERVAL_MS,
+    DEFAULT_AUDIT_MAX_BODY_BYTES,
+    DEFAULT_AUDIT_OVERFLOW_POLICY,
+    DEFAULT_AUDIT_OVERFLOW_SAMPLE_RATE,
+    DEFAULT_AUDIT_QUEUE_SIZE,
+    DEFAULT_AUDIT_SAMPLE_RATE,
+    DEFAULT_AUDIT_SAMPLING_RULES,
+    DEFAULT_AUDIT_SPOOL_DIR,
+    DEFAULT_AUDIT_SPOOL_SEGMENT_BYTES,
+    DEFAULT_PERF_LOGS_PARTITION_INTERVAL,
+    DEFAULT_PERF_LOGS_PARTITION_PREMAKE,
+    DEFAULT_PERF_LOGS_RETENTION_DAYS,
+)
+from app.core.constants.auth import (
+    DEFAULT_JWT_BACKEND,
+    DEFAULT_PASSWORD_HASH_MAX_PENDING,
+    DEFAULT_PASSWORD_HASH_MIN_ROUNDS,
+    DEFAULT_PASSWORD_HASH_TARGET_MS,
+    DEFAULT_PASSWORD_HASH_WORKERS,
+)
+from app.core.constants.database import (
+    DEFAULT_DB_MODE,
+    DEFAULT_DB_REPLICA_EJECT_SECONDS,
+    DEFAULT_DB_REPLICA_STICKY_SECONDS,
+)
 from typing import Any, Dict, Optional, Union, List
 from pydantic import PostgresDsn, validator, AnyUrl
 from pydantic_settings import BaseSettings
@@ -19,9 +48,30 @@ class Settings(BaseSettings):
     postgres_db: str
     postgres_port: str
     database_uri: Optional[PostgresDsn] = None
+    # asyncpg engine and async repositories; off = sync psycopg2 repositories
+    # run in the threadpool
+    database_async: bool = True
+    # direct or pgbouncer (transaction pooling)
+    database_mode: str = DEFAULT_DB_MODE
+    # Pool profile (api, worker, serverless, pgbouncer); defaults to api, or
+    # pgbouncer in PgBouncer mode. The options below override it.
+    database_pool_profile: Optional[str] = None
+    database_pool_size: Optional[int] = None
+    database_max_overflow: Optional[int] = None
+    database_pool_timeout: Optional[float] = None
+    database_pool_recycle: Optional[int] = None
+    database_pool_pre_ping: Optional[bool] = None
+    # Read replicas for list/count queries, e.g. ["postgresql://...", ...]
+    database_replica_uris: List[str] = []
+    database_replica_sticky_seconds: float = DEFAULT_DB_REPLICA_STICKY_SECONDS
+    database_replica_eject_seconds: float = DEFAULT_DB_REPLICA_EJECT_SECONDS
 
     jwt_secret: str
     jwt_algorithm: str
+    jwt_backend: str = DEFAULT_JWT_BACKEND
+    # PEM keys, only needed for asymmetric algorithms (ES256, EdDSA, RS256...)
+    jwt_private_key: Optional[str] = None
+    jwt_public_key: Optional[str] = None
 
     mailgun_key: str
     mailgun_url: str
@@ -32,7 +82,33 @@ class Settings(BaseSettings):
 
     allowed_origins: list[AnyUrl] = []
 
-    @validator("allowed_origins", pre=True)
+    audit_queue_size: int = DEFAULT_AUDIT_QUEUE_SIZE
+    audit_batch_size: int = DEFAULT_AUDIT_BATCH_SIZE
+    audit_flush_interval_ms: int = DEFAULT_AUDIT_FLUSH_INTERVAL_MS
+    audit_overflow_policy: str = DEFAULT_AUDIT_OVERFLOW_POLICY
+    audit_overflow_sample_rate: float = DEFAULT_AUDIT_OVERFLOW_SAMPLE_RATE
+    audit_block_timeout_ms: int = DEFAULT_AUDIT_BLOCK_TIMEOUT_MS
+    audit_max_body_bytes: int = DEFAULT_AUDIT_MAX_BODY_BYTES
+    audit_sampling_rules: List[Dict[str, Any]] = DEFAULT_AUDIT_SAMPLING_RULES
+    audit_default_sample_rate: float = DEFAULT_AUDIT_SAMPLE_RATE
+    audit_spool_dir: str = DEFAULT_AUDIT_SPOOL_DIR
+    audit_spool_segment_bytes: int = DEFAULT_AUDIT_SPOOL_SEGMENT_BYTES
+    audit_db_retry_interval_ms: int = DEFAULT_AUDIT_DB_RETRY_INTERVAL_MS
+
+    # Server-Timing response header with the request's DB and app time
+    server_timing: bool = True
+
+    perf_logs_partition_interval: str = DEFAULT_PERF_LOGS_PARTITION_INTERVAL
+    perf_logs_partition_premake: int = DEFAULT_PERF_LOGS_PARTITION_PREMAKE
+    perf_logs_retention_days: int = DEFAULT_PERF_LOGS_RETENTION_DAYS
+
+    password_hash_workers: int = DEFAULT_PASSWORD_HASH_WORKERS
+    password_hash_max_pending: int = DEFAULT_PASSWORD_HASH_MAX_PENDING
+    password_hash_rounds: Optional[int] = None
+    password_hash_min_rounds: int = DEFAULT_PASSWORD_HASH_MIN_ROUNDS
+    password_hash_target_ms: int = DEFAULT_PASSWORD_HASH_TARGET_MS
+
+    @validator("allowed_origins", "database_replica_uris", pre=True)
     def parse_allowed_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         if isinstance(v, str):
             v = v.strip()
@@ -0,0 +1,48 @@
+AUDIT_OVERFLOW_DROP = "drop"
+AUDIT_OVERFLOW_SAMPLE = "sample"
+AUDIT_OVERFLOW_BLOCK = "block"
+
+DEFAULT_AUDIT_QUEUE_SIZE = 10000
+DEFAULT_AUDIT_BATCH_SIZE = 500
+DEFAULT_AUDIT_FLUSH_INTERVAL_MS = 1000
+DEFAULT_AUDIT_OVERFLOW_POLICY = AUDIT_OVERFLOW_DROP
+DEFAULT_AUDIT_OVERFLOW_SAMPLE_RATE = 0.1
+DEFAULT_AUDIT_BLOCK_TIMEOUT_MS = 50
+
+# Queue fill ratio from which the "sample" overflow policy starts shedding records
+AUDIT_SAMPLE_HIGH_WATERMARK = 0.8
+
+# Only this much of a request body is kept for the audit record
+DEFAULT_AUDIT_MAX_BODY_BYTES = 16 * 1024
+
+PERF_LOGS_PARTITION_DAY = "day"
+PERF_LOGS_PARTITION_MONTH = "month"
+# Catches rows no range partition covers yet (maintenance fell behind);
+# maintenance moves them into the range partitions it creates
+PERF_LOGS_DEFAULT_PARTITION = "perf_logs_default"
+
+DEFAULT_PERF_LOGS_PARTITION_INTERVAL = PERF_LOGS_PARTITION_MONTH
+DEFAULT_PERF_LOGS_PARTITION_PREMAKE = 3
+DEFAULT_PERF_LOGS_RETENTION_DAYS = 90
+
+# Audit sampling rules, evaluated in order; the first rule whose conditions
+# all match decides the keep rate. Requests matching no rule use
+# DEFAULT_AUDIT_SAMPLE_RATE.
+DEFAULT_AUDIT_SAMPLING_RULES = [
+    {"status": ["5xx"], "rate": 1.0},
+    {"min_duration_ms": 500, "rate": 1.0},
+    {"path": "/api/v1/auth/*", "methods": ["POST", "PUT", "PATCH", "DELETE"], "rate": 1.0},
+    {"path": "/api/v1/team", "methods": ["GET"], "status": ["2xx"], "rate": 0.01},
+]
+DEFAULT_AUDIT_SAMPLE_RATE = 1.0
+
+# Local spool used while the database is unreachable; an empty dir disables it
+DEFAULT_AUDIT_SPOOL_DIR = "var/audit_spool"
+DEFAULT_AUDIT_SPOOL_SEGMENT_BYTES = 8 * 1024 * 1024
+DEFAULT_AUDIT_DB_RETRY_INTERVAL_MS = 5000
+
+# Slowest SQL statement of a request kept in perf_logs (statement text only)
+SQL_TIMING_STATEMENT_MAX_CHARS = 1000
+
+DEFAULT_PERF_LOGS_PAGE_LIMIT = 50
+MAX_PERF_LOGS_PAGE_LIMIT = 500
@@ -1,5 +1,24 @@
 #core/constants/auth.py
-JWT_TOKEN_EXPIRE_IN_MIN = 43200
+# Access tokens are verified statelessly, so they stay short-lived; sessions
+# are extended with rotating refresh tokens checked at /auth/refresh only
+JWT_TOKEN_EXPIRE_IN_MIN = 15
+JWT_API_TOKEN_EXPIRE_IN_MIN = 5
+REFRESH_TOKEN_EXPIRE_IN_MIN = 43200
+
+# Access tokens carry `type`; older 30-day tokens without it are still
+# checked against revoked_tokens until they expire
+TOKEN_TYPE_ACCESS = "access"
+
+# What /auth/logout ended (AuthService.revoke_token). Access tokens are never
+# revoked themselves: logout revokes the refresh tokens of their session.
+# API tokens have no session, so nothing is revoked; they only expire.
+LOGOUT_TOKEN_REVOKED = "token"
+LOGOUT_SESSION_REVOKED = "session"
+LOGOUT_NOTHING_REVOKED = "none"
+
+JWT_BACKEND_JOSE = "jose"
+JWT_BACKEND_PYJWT = "pyjwt"
+DEFAULT_JWT_BACKEND = JWT_BACKEND_PYJWT
 
 USER_ADMIN = "admins"
 PASS_ADMIN = "admin123"
@@ -7,4 +26,34 @@ PASS_ADMIN = "admin123"
 ROLE_ADMIN = "ADMIN"
 ROLE_GUARDIAN = "GUARDIAN"
 ROLE_PLAYER = "PLAYER"
-ROLE_OFFICIAL = "OFFICIAL"
\ No newline at end of file
+ROLE_OFFICIAL = "OFFICIAL"
+
+# Revoked-token cache: how often to pull new revocations made by other
+# workers, and how far back each incremental read overlaps the previous one
+REVOKED_TOKEN_REFRESH_SECONDS = 5
+REVOKED_TOKEN_REFRESH_OVERLAP_SECONDS = 60
+
+REVOKED_TOKEN_PURGE_BATCH_SIZE = 1000
+
+# Verified JWT claims cache: entries also expire at the token's `exp`
+VERIFIED_TOKEN_CACHE_SIZE = 10000
+VERIFIED_TOKEN_CACHE_TTL_SECONDS = 300
+
+# /auth/me profiles; writes invalidate them in this process, other workers
+# see the change after at most the TTL
+USER_PROFILE_CACHE_SIZE = 10000
+USER_PROFILE_CACHE_TTL_SECONDS = 60
+
+# Password hashing pool: bcrypt releases the GIL, so threads scale with cores.
+# Operations beyond max pending (running + queued) are refused with 503.
+DEFAULT_PASSWORD_HASH_WORKERS = 4
+DEFAULT_PASSWORD_HASH_MAX_PENDING = 64
+
+# bcrypt cost: unless PASSWORD_HASH_ROUNDS is set, rounds are calibrated at
+# startup so one hash takes about the target time, within these bounds.
+# Stored hashes are only rehashed when below PASSWORD_HASH_MIN_ROUNDS, so a
+# host calibrating a different cost does not upgrade every login.
+DEFAULT_PASSWORD_HASH_TARGET_MS = 250
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+DEFAULT_PASSWORD_HASH_MIN_ROUNDS = BCRYPT_MIN_ROUNDS
@@ -0,0 +1,65 @@
+DB_POOL_PROFILE_API = "api"
+DB_POOL_PROFILE_WORKER = "worker"
+DB_POOL_PROFILE_SERVERLESS = "serverless"
+DB_POOL_PROFILE_PGBOUNCER = "pgbouncer"
+
+DEFAULT_DB_POOL_PROFILE = DB_POOL_PROFILE_API
+
+# direct: the app talks to Postgres. pgbouncer: the app talks to PgBouncer in
+# transaction pooling mode, so no connection state may outlive a transaction.
+DB_MODE_DIRECT = "direct"
+DB_MODE_PGBOUNCER = "pgbouncer"
+
+DEFAULT_DB_MODE = DB_MODE_DIRECT
+
+# Engine pool options per deployment profile; DATABASE_POOL_* settings
+# override single values.
+#
+# api: fail fast on exhaustion instead of queueing requests, and no
+#   pre-ping round trip on every checkout (a local socket check replaces
+#   it). pool_recycle keeps connections younger than server/LB idle
+#   timeouts.
+# worker: few long-lived, mostly idle connections, so pre-ping is worth it.
+# serverless: no pooling in-process (NullPool), for short-lived processes.
+# pgbouncer: default in PgBouncer mode. A few client connections to
+#   PgBouncer, which are cheap to keep; PgBouncer shares the real ones.
+DB_POOL_PROFILES = {
+    DB_POOL_PROFILE_API: {
+        "null_pool": False,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": False,
+    },
+    DB_POOL_PROFILE_WORKER: {
+        "null_pool": False,
+        "pool_size": 2,
+        "max_overflow": 2,
+        "pool_timeout": 30,
+        "pool_recycle": 3600,
+        "pool_pre_ping": True,
+    },
+    DB_POOL_PROFILE_SERVERLESS: {
+        "null_pool": True,
+    },
+    DB_POOL_PROFILE_PGBOUNCER: {
+        "null_pool": False,
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 10,
+        "pool_recycle": 1800,
+        "pool_pre_ping": False,
+    },
+}
+
+# Read replicas: users who wrote less than this long ago read from the
+# primary (read-your-writes); keep it above the usual replication lag
+DEFAULT_DB_REPLICA_STICKY_SECONDS = 5.0
+# A replica whose connections fail is skipped for this long
+DEFAULT_DB_REPLICA_EJECT_SECONDS = 30.0
+# Handed to the client after a request that wrote: epoch seconds until
+# which its reads go to the primary, whichever worker serves them. The
+# header is for clients that do not keep cookies.
+DB_PRIMARY_UNTIL_COOKIE = "db_primary_until"
+DB_PRIMARY_UNTIL_HEADER = "X-DB-Primary-Until"
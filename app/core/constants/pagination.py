@@ -0,0 +1,8 @@
+from typing import Literal
+
+# Totals of list endpoints (`count` query parameter)
+COUNT_EXACT = "exact"  # window count, same round trip as the page
+COUNT_ESTIMATED = "estimated"  # planner row estimate when unfiltered, else exact
+COUNT_NONE = "none"  # no total, only has_next
+CountMode = Literal["exact", "estimated", "none"]
+DEFAULT_COUNT_MODE = COUNT_EXACT
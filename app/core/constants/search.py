@@ -0,0 +1,12 @@
+from typing import Literal
+
+# Name search of list endpoints (`search_mode` query parameter)
+SEARCH_CONTAINS = "contains"  # ILIKE '%q%', served by the pg_trgm GIN indexes; newest first
+SEARCH_FULLTEXT = "fulltext"  # whole words (websearch syntax), ranked with ts_rank
+SEARCH_SIMILAR = "similar"  # typo tolerant pg_trgm word similarity, best match first
+SearchMode = Literal["contains", "fulltext", "similar"]
+DEFAULT_SEARCH_MODE = SEARCH_CONTAINS
+
+# Text search configuration of the name tsvector indexes. Names are not
+# prose: no stemming or stop words.
+SEARCH_TEXT_CONFIG = "simple"
@@ -1,19 +1,310 @@
-from sqlalchemy import create_engine
+import select
+import time
+import psycopg2
+from uuid import uuid4
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError, DisconnectionError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
-from typing import Iterator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional, Type, Union
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
 from app.core.config import settings
+from app.core.constants.database import (
+    DB_MODE_PGBOUNCER,
+    DB_POOL_PROFILE_PGBOUNCER,
+    DB_POOL_PROFILES,
+    DB_PRIMARY_UNTIL_COOKIE,
+    DB_PRIMARY_UNTIL_HEADER,
+    DEFAULT_DB_POOL_PROFILE,
+)
+from app.core.replica import Replica, ReplicaSet
+from app.utils.pool_metrics import PoolMetrics
+from app.utils.sql_timing import instrument
+
+
+def pool_profile() -> str:
+    """Configured pool profile; PgBouncer mode defaults to the pgbouncer profile."""
+    if settings.database_pool_profile:
+        return settings.database_pool_profile
+    if settings.database_mode == DB_MODE_PGBOUNCER:
+        return DB_POOL_PROFILE_PGBOUNCER
+    return DEFAULT_DB_POOL_PROFILE
+
+
+def pool_options(profile: Optional[str] = None) -> dict:
+    """Pool options of a profile, with the DATABASE_POOL_* overrides applied."""
+    profile = profile or pool_profile()
+    if profile not in DB_POOL_PROFILES:
+        raise ValueError(f"unknown database pool profile: {profile}")
+
+    options = dict(DB_POOL_PROFILES[profile])
+    overrides = {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+    }
+    if not options["null_pool"]:
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        if settings.database_mode == DB_MODE_PGBOUNCER:
+            # A ping only reaches PgBouncer, not the server connection the
+            # next transaction gets; drop_closed_connection checks instead
+            options["pool_pre_ping"] = False
+    return options
+
+
+def async_connect_args() -> dict:
+    """asyncpg connect() arguments for the database mode."""
+    if settings.database_mode != DB_MODE_PGBOUNCER:
+        return {}
+
+    # Transaction pooling may run the next statement on another server
+    # connection: no statement cache, and unique names for the statements
+    # asyncpg still prepares, so they never collide on a shared connection
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4().hex}__",
+    }
+
+
+def drop_closed_connection(dbapi_connection, connection_record, connection_proxy) -> None:
+    """
+    Checkout hook used when pool_pre_ping is off: a local look at the socket
+    instead of a round trip. A connection the server (or PgBouncer) closed
+    is replaced by the pool before anyone uses it.
+    """
+    driver_connection = connection_record.driver_connection
+    if hasattr(driver_connection, "is_closed"):
+        # asyncpg notices the peer closing the socket on its own
+        closed = driver_connection.is_closed()
+    else:
+        closed = psycopg2_closed(driver_connection)
+
+    if closed:
+        raise DisconnectionError("connection closed by the server")
+
+
+def psycopg2_closed(driver_connection) -> bool:
+    """
+    An idle psycopg2 connection only has something to read when the server
+    sent a message on its own: a notice or notification, which poll()
+    consumes and leaves the connection usable, or a termination error and
+    EOF, which take two poll() calls to turn into a closed connection.
+    Whatever is still unread after that counts as closed.
+    """
+    for _ in range(3):
+        if driver_connection.closed or not psycopg2_readable(driver_connection):
+            break
+        try:
+            driver_connection.poll()
+        except psycopg2.Error:
+            break
+    else:
+        return bool(driver_connection.closed) or psycopg2_readable(driver_connection)
+    return bool(driver_connection.closed)
+
+
+def psycopg2_readable(driver_connection) -> bool:
+    # poll(), unlike select(), takes descriptors above FD_SETSIZE (1024)
+    poller = select.poll()
+    poller.register(driver_connection.fileno(), select.POLLIN | select.POLLHUP | select.POLLERR)
+    return bool(poller.poll(0))
+
+
+def watch_disconnects(engine, options: dict) -> None:
+    if not options["null_pool"] and not options["pool_pre_ping"]:
+        event.listen(engine, "checkout", drop_closed_connection)
+
+
+def engine_options(options: dict, queue_pool: Type[Pool], metrics: PoolMetrics) -> dict:
+    """create_engine() keyword arguments for the pool `options`."""
+    if options["null_pool"]:
+        return {"poolclass": metrics.pool_class(NullPool)}
+
+    return {
+        "poolclass": metrics.pool_class(queue_pool),
+        **{key: value for key, value in options.items() if key != "null_pool"},
+    }
+
+
+def create_pooled_engine(uri: str, name: str) -> Engine:
+    """Sync (psycopg2) engine with the configured pool, instrumented as `name`."""
+    options = pool_options()
+    pool_metrics[name] = PoolMetrics(name)
+    pooled_engine = create_engine(uri, **engine_options(options, QueuePool, pool_metrics[name]))
+    # Before the metrics listeners: a dropped checkout never counts as in use
+    watch_disconnects(pooled_engine, options)
+    pool_metrics[name].attach(pooled_engine, options)
+    instrument(pooled_engine)
+    return pooled_engine
+
+
+def create_pooled_async_engine(uri: str, name: str) -> AsyncEngine:
+    """asyncpg engine with the configured pool, instrumented as `name`."""
+    options = pool_options()
+    pool_metrics[name] = PoolMetrics(name)
+    pooled_engine = create_async_engine(
+        make_url(uri).set(drivername="postgresql+asyncpg"),
+        connect_args=async_connect_args(),
+        **engine_options(options, AsyncAdaptedQueuePool, pool_metrics[name]),
+    )
+    watch_disconnects(pooled_engine.sync_engine, options)
+    pool_metrics[name].attach(pooled_engine.sync_engine, options)
+    instrument(pooled_engine.sync_engine)
+    return pooled_engine
+
+
+# Pool telemetry per engine, served by /admin/metrics/pools
+pool_metrics: Dict[str, PoolMetrics] = {}
 
 # Create database engine
-engine = create_engine(
-    str(settings.database_uri),
-    pool_pre_ping=True,  # Checks connection health before each use
-    pool_recycle=3600,   # Avoid stale connections (1 hour)
-    max_overflow=20,     # Maximum additional connections beyond pool size
-)
+engine = create_pooled_engine(str(settings.database_uri), "sync")
+
+# Async engine (asyncpg), used by the async repositories when DATABASE_ASYNC
+# is on. The sync engine above stays for scripts, background workers and
+# the sync repositories during the migration.
+async_engine = None
+if settings.database_async:
+    async_engine = create_pooled_async_engine(str(settings.database_uri), "async")
+
+
+def watch_replica_health(replica: Replica, name: str, replica_engine: Engine) -> None:
+    """Eject the replica on failed connects and dropped connections; query errors do not count."""
+    def eject_on_disconnect(context) -> None:
+        if context.is_disconnect:
+            replica_set.eject(replica, context.original_exception)
+
+    event.listen(replica_engine, "handle_error", eject_on_disconnect)
+    pool_metrics[name].connect_error_listeners.append(lambda err: replica_set.eject(replica, err))
+
+
+replica_set = ReplicaSet(settings.database_replica_sticky_seconds, settings.database_replica_eject_seconds)
+for index, uri in enumerate(settings.database_replica_uris):
+    replica = Replica(
+        f"replica{index}",
+        create_pooled_engine(uri, f"replica{index}"),
+        create_pooled_async_engine(uri, f"replica{index}-async") if settings.database_async else None,
+    )
+    watch_replica_health(replica, f"replica{index}", replica.engine)
+    if replica.async_engine is not None:
+        watch_replica_health(replica, f"replica{index}-async", replica.async_engine.sync_engine)
+    replica_set.add(replica)
+
+
+# Session.info key: callbacks run once the session's transaction commits
+AFTER_COMMIT = "after_commit"
+
+
+def on_commit(session: Union[AsyncSession, Session], callback: Callable[[], None]) -> None:
+    """Run `callback` after the current transaction of `session` commits; dropped on rollback."""
+    session.info.setdefault(AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(AFTER_COMMIT, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def drop_after_commit(session: Session) -> None:
+    session.info.pop(AFTER_COMMIT, None)
+
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session.info keys of the replica routing
+READ_ONLY = "read_only"
+WROTE = "wrote"
+REPLICA = "replica"
+REQUEST = "request"
+
+
+def request_primary_until(session: Session) -> Optional[float]:
+    """Primary-read deadline the client of the session's request sent back, if any."""
+    request = session.info.get(REQUEST)
+    if request is None:
+        return None
+
+    value = request.cookies.get(DB_PRIMARY_UNTIL_COOKIE) or request.headers.get(DB_PRIMARY_UNTIL_HEADER)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class RoutingSession(Session):
+    """
+    Sends the SELECTs of read-only repository methods (read_session()) to a
+    read replica, everything else to the primary. A session sticks to the
+    replica it picked first. Once the session wrote, and while its client
+    holds a primary-read deadline from an earlier write (see get_db), reads
+    stay on the primary. A read whose replica cannot be connected to runs
+    on the primary instead.
+    """
+
+    async_engines = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[WROTE] = True
+        elif (
+            replica_set.replicas
+            and isinstance(clause, Select)
+            and self.info.get(READ_ONLY)
+            and not self.info.get(WROTE)
+        ):
+            replica = self._replica()
+            if replica is not None:
+                return self._replica_engine(replica)
+
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+    def _replica_engine(self, replica: Replica) -> Engine:
+        return replica.async_engine.sync_engine if self.async_engines else replica.engine
+
+    def _replica(self) -> Optional[Replica]:
+        replica = self.info.get(REPLICA)
+        if replica is not None and replica.ejected_until <= time.monotonic():
+            return replica
+
+        if replica_set.is_sticky(request_primary_until(self)):
+            return None
+
+        replica = replica_set.choose()
+        self.info[REPLICA] = replica
+        return replica
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        replica = self.info.get(REPLICA)
+        if replica is None or engine is not self._replica_engine(replica):
+            return super()._connection_for_bind(engine, execution_options, **kw)
+
+        try:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        except (DBAPIError, OSError):
+            # The failed connect ejected the replica (watch_replica_health);
+            # this read still gets its answer, from the primary
+            self.info[REPLICA] = None
+            return super()._connection_for_bind(self.bind, execution_options, **kw)
+
+
+class AsyncRoutingSession(RoutingSession):
+    """Sync side of the routing AsyncSession: binds to the asyncpg engines."""
+
+    async_engines = True
+
+
+# Session factory. Objects stay readable after commit: repositories return
+# them to callers after their session is closed.
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 @contextmanager
 def get_session() -> Iterator[Session]:
@@ -27,3 +318,61 @@ def get_session() -> Iterator[Session]:
         raise e
     finally:
         session.close()
+
+
+AsyncSessionLocal = None
+if settings.database_async:
+    # Objects stay readable after commit: nothing can lazy-load them later
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, sync_session_class=AsyncRoutingSession, autoflush=False, expire_on_commit=False
+    )
+
+@asynccontextmanager
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """Async database session generator."""
+    session = AsyncSessionLocal()
+    try:
+        yield session
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        raise e
+    finally:
+        await session.close()
+
+
+# Session type handed to repositories: AsyncSession when DATABASE_ASYNC is on
+RequestSession = Union[AsyncSession, Session]
+
+
+async def get_db(request: Request) -> AsyncIterator[RequestSession]:
+    """
+    FastAPI dependency: one unit-of-work session per request, shared by every
+    repository the request uses. Committed after the handler succeeds, rolled
+    back if it raises. A committed write hands the client a primary-read
+    deadline (request.state.primary_until, sent by ReadYourWritesMiddleware).
+    """
+    if settings.database_async:
+        async with get_async_session() as db:
+            # Lets replica routing read the client's primary-read deadline
+            db.info[REQUEST] = request
+            yield db
+        mark_primary_reads(request, db)
+        return
+
+    session = SessionLocal()
+    session.info[REQUEST] = request
+    try:
+        yield session
+        await run_in_threadpool(session.commit)
+    except Exception as e:
+        await run_in_threadpool(session.rollback)
+        raise e
+    finally:
+        await run_in_threadpool(session.close)
+    mark_primary_reads(request, session)
+
+
+def mark_primary_reads(request: Request, session: RequestSession) -> None:
+    if replica_set.replicas and session.info.get(WROTE):
+        request.state.primary_until = replica_set.primary_until()
@@ -0,0 +1,75 @@
+import itertools
+import time
+from typing import List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.logger import logger
+
+
+class Replica:
+    def __init__(self, name: str, engine: Engine, async_engine: Optional[AsyncEngine] = None) -> None:
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.reads = 0
+
+
+class ReplicaSet:
+    """
+    Read replicas for read-only repository methods.
+
+    Replicas are picked round-robin. One whose connections fail is ejected
+    for `eject_seconds`, then tried again; with every replica ejected reads
+    go to the primary. A client that wrote is told to read from the primary
+    for the next `sticky_seconds` (see `primary_until`), so replication lag
+    never hides its own writes, whichever worker or host serves it next.
+    """
+
+    def __init__(self, sticky_seconds: float, eject_seconds: float) -> None:
+        self.sticky_seconds = sticky_seconds
+        self.eject_seconds = eject_seconds
+        self.replicas: List[Replica] = []
+        self._next = itertools.count()
+
+    def add(self, replica: Replica) -> None:
+        self.replicas.append(replica)
+
+    def choose(self) -> Optional[Replica]:
+        now = time.monotonic()
+        healthy = [replica for replica in self.replicas if replica.ejected_until <= now]
+        if not healthy:
+            return None
+
+        replica = healthy[next(self._next) % len(healthy)]
+        replica.reads += 1
+        return replica
+
+    def eject(self, replica: Replica, reason: Exception) -> None:
+        if replica.ejected_until > time.monotonic():
+            return
+        replica.ejected_until = time.monotonic() + self.eject_seconds
+        replica.ejections += 1
+        logger.warning(f"read replica {replica.name} ejected for {self.eject_seconds}s: {reason}")
+
+    def primary_until(self) -> float:
+        """Deadline handed to a client that just wrote. Wall clock: workers and hosts share it."""
+        return time.time() + self.sticky_seconds
+
+    def is_sticky(self, primary_until: Optional[float]) -> bool:
+        return primary_until is not None and primary_until > time.time()
+
+    def stats(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.ejected_until <= now,
+                "reads": replica.reads,
+                "ejections": replica.ejections,
+            }
+            for replica in self.replicas
+        ]
@@ -1,9 +1,9 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError, ExpiredSignatureError
 from app.schemas.user_mgt import AuthUser
-from app.core.config import settings
-from app.repositories.token import TokenRepository
+from app.core.constants.auth import TOKEN_TYPE_ACCESS
+from app.utils.jwt_backend import jwt_backend, InvalidTokenError, TokenExpiredError
+from app.services.token import revoked_token_cache, token_digest, token_key, verified_token_cache
 from datetime import datetime, timezone
 import logging
 
@@ -13,21 +13,37 @@ oauth2_bearer = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
 class JwtMiddleware:
-    def __init__(self, secret_key=settings.jwt_secret, algorithm=settings.jwt_algorithm):
-        self.secret_key = secret_key
-        self.algorithm = algorithm
+    def __init__(self, backend=jwt_backend):
+        self.backend = backend
 
-    def __call__(self, token: str = Depends(oauth2_bearer)) -> AuthUser:
-        token_repo = TokenRepository()
-
-        # Check if the token is revoked
-        if token_repo.is_token_revoked(token):
-            raise HTTPException(status_code=401, detail="Token has been revoked")
+    async def __call__(self, request: Request, token: str = Depends(oauth2_bearer)) -> AuthUser:
+        # Repeat tokens skip signature verification and AuthUser construction;
+        # cache entries expire no later than the token itself
+        digest = token_digest(token)
+        cached = verified_token_cache.get(digest)
+        if cached is not None:
+            auth_user, key = cached
+            if key is not None and revoked_token_cache.is_revoked(key):
+                raise HTTPException(status_code=401, detail="Token has been revoked")
+            request.state.auth_user = auth_user
+            return auth_user
 
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            logging.info(f"Token payload: {payload}")
+            payload = self.backend.decode(token)
+        except TokenExpiredError:
+            raise HTTPException(status_code=401, detail="Token expired")
+        except InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Could not validate token")
+
+        # Access tokens are short-lived and verified statelessly; only legacy
+        # long-lived tokens are checked for revocation (answered from memory)
+        key = None
+        if payload.get("type") != TOKEN_TYPE_ACCESS:
+            key = token_key(token, payload)
+            if revoked_token_cache.is_revoked(key):
+                raise HTTPException(status_code=401, detail="Token has been revoked")
 
+        try:
             auth_user = AuthUser(
                 id=payload.get("id"),
                 full_name=payload.get("full_name"),
@@ -38,14 +54,13 @@ class JwtMiddleware:
                 deleted_at=payload.get("deleted_at"),
                 roles=payload.get("roles", [])
             )
-            return auth_user
-        except ExpiredSignatureError:
-            raise HTTPException(status_code=401, detail="Token expired")
-        except JWTError:
-            raise HTTPException(status_code=401, detail="Could not validate token")
         except Exception as e:
             logging.error(f"Error in JwtMiddleware: {e}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
+        verified_token_cache.set(digest, (auth_user, key), expires_at=payload.get("exp"))
+        # Read by the replica routing of the request session
+        request.state.auth_user = auth_user
+        return auth_user
 
 jwt_middleware = JwtMiddleware()
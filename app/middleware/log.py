@@ -1,41 +1,109 @@
 import time
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import URL, Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.repositories.audit import ApiLogRepository
+from app.core.config import settings
 from app.schemas.audit import ApiLogCreate
+from app.services.audit import audit_writer
+from app.services.audit_sampling import audit_sampling_policy
+from app.utils.date import get_naive_now
 from app.utils.logger import logger
+from app.utils.metrics import latency_histograms
+from app.utils.sql_timing import QueryStats, track_queries
 
+HEALTH_CHECK_PATHS = ("/api/health", "/api/health/")
 
-class LogMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        self.log_repo = ApiLogRepository()
 
-    async def dispatch(self, request: Request, call_next):
+class LogMiddleware:
+    """
+    Pure ASGI audit middleware.
+
+    The request stream is passed through untouched; only the first
+    `max_body_bytes` of the body are copied for the audit record, and only
+    when the sampling policy may still keep the request. Duration is measured
+    up to the `http.response.start` message, so streaming responses do not
+    inflate it. The SQL the request ran up to then (count, DB time, slowest
+    statement) goes into the record and the Server-Timing header.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int = settings.audit_max_body_bytes) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.audit_writer = audit_writer
+        self.latency_histograms = latency_histograms
+        self.sampling_policy = audit_sampling_policy
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Disable logging for health check and non-HTTP traffic
+        if scope["type"] != "http" or scope["path"] in HEALTH_CHECK_PATHS:
+            await self.app(scope, receive, send)
+            return
+
         start = time.time()
+        sampling = self.sampling_policy.begin(scope["method"], scope["path"])
+        req_body = bytearray()
+        response = {"status": None, "duration": None}
 
-        req_body = await request.body()
-        response: Response = await call_next(request)
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if sampling.capture_body and message["type"] == "http.request":
+                remaining = self.max_body_bytes - len(req_body)
+                if remaining > 0:
+                    req_body.extend(message.get("body", b"")[:remaining])
+            return message
 
-        # Disable logging for health check
-        path = str(request.url.path)
-        if path == "/api/health" or path == "/api/health/":
-            return response
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and response["status"] is None:
+                response["status"] = message["status"]
+                response["duration"] = time.time() - start
+                if settings.server_timing:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", query_stats.server_timing(response["duration"])
+                    )
+            await send(message)
 
+        with track_queries() as query_stats:
+            try:
+                await self.app(scope, receive_wrapper, send_wrapper)
+            except Exception:
+                if response["status"] is None:
+                    response["status"] = 500
+                    response["duration"] = time.time() - start
+                raise
+            finally:
+                if response["status"] is not None:
+                    self.record_latency(scope, response["status"], response["duration"])
+                    if sampling.keep(response["status"], response["duration"]):
+                        await self.log(scope, bytes(req_body), response["status"], response["duration"], query_stats)
+
+    def record_latency(self, scope: Scope, status: int, duration: float) -> None:
+        # Key by the route template so /team/1 and /team/2 share a histogram
+        route = scope.get("route")
+        template = getattr(route, "path", None) or "unmatched"
+        self.latency_histograms.record(template, scope["method"], status, duration)
+
+    async def log(self, scope: Scope, req_body: bytes, status: int, duration: float, query_stats: QueryStats) -> None:
         try:
-            self.log_repo.insert(
-                ApiLogCreate(
-                    method=request.method,
-                    url=str(request.url),
-                    req_headers=request.headers.items(),
-                    req_body=req_body,
-                    resp_status=str(response.status_code),
-                    duration=time.time() - start,
-                )
+            record = ApiLogCreate(
+                method=scope["method"],
+                url=str(URL(scope=scope)),
+                req_headers=Headers(scope=scope).items(),
+                req_body=req_body,
+                resp_status=str(status),
+                duration=duration,
+                db_queries=query_stats.queries,
+                db_duration=query_stats.duration,
+                db_slowest_duration=query_stats.slowest_duration,
+                db_slowest_statement=query_stats.slowest_statement,
+                created_at=get_naive_now(),
             )
+
+            # The writer persists records in the background; only the "block"
+            # overflow policy may wait, and that must not stall the event loop
+            if self.audit_writer.blocking:
+                await run_in_threadpool(self.audit_writer.submit, record)
+            else:
+                self.audit_writer.submit(record)
         except Exception as err:
             logger.warning(err)
-            pass
-
-        return response
@@ -0,0 +1,38 @@
+import math
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants.database import DB_PRIMARY_UNTIL_COOKIE, DB_PRIMARY_UNTIL_HEADER
+from app.core.database import replica_set
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware handing the client the primary-read deadline of a
+    request that wrote (request.state.primary_until, set by get_db after the
+    commit), as a short-lived cookie and a response header. Replica routing
+    honours either one on the client's next requests, on any worker.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not replica_set.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            primary_until = scope.get("state", {}).get("primary_until")
+            if message["type"] == "http.response.start" and primary_until is not None:
+                headers = MutableHeaders(scope=message)
+                headers.append(DB_PRIMARY_UNTIL_HEADER, f"{primary_until:.3f}")
+                headers.append(
+                    "Set-Cookie",
+                    f"{DB_PRIMARY_UNTIL_COOKIE}={primary_until:.3f}; "
+                    f"Max-Age={math.ceil(replica_set.sticky_seconds)}; Path=/; HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,16 +1,35 @@
 from .base import Base
-from sqlalchemy import Column, Integer, String, SmallInteger, DateTime, func, Float
+from sqlalchemy import Column, Integer, String, SmallInteger, DateTime, func, Float, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from app.core.constants.app import DEFAULT_TZ
 
+# Path (and query string) of perf_logs.url, which LogMiddleware stores with
+# scheme and host. url_prefix filters match it; indexed as is, so a query
+# must use the same expression to reach ix_perf_logs_url_path.
+URL_PATH_SQL = "regexp_replace(url, '^[^/]*//[^/]*', '')"
+
 
 class ApiLog(Base):
     __tablename__ = "perf_logs"
-    id = Column(Integer, primary_key=True)
+    # Range partitioned by created_at, see AuditPartitionService for maintenance
+    __table_args__ = (
+        # Keyset pagination and filters of ApiLogRepository.search
+        Index("ix_perf_logs_created_at_id", "created_at", "id"),
+        Index("ix_perf_logs_resp_status_created_at_id", "resp_status", "created_at", "id"),
+        Index("ix_perf_logs_url_path", text(f"({URL_PATH_SQL}) text_pattern_ops")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
     method = Column(String, nullable=False)
     url = Column(String, nullable=False)
-    req_headers = Column(JSONB, nullable=True)
-    req_body = Column(JSONB, nullable=True)
+    req_headers = Column(JSONB(none_as_null=True), nullable=True)
+    req_body = Column(JSONB(none_as_null=True), nullable=True)
     resp_status = Column(SmallInteger, default=200)
     duration = Column(Float, nullable=True)
-    created_at = Column(DateTime, server_default=func.timezone(DEFAULT_TZ, func.now()))
+    # SQL run for the request (app.utils.sql_timing); durations in seconds
+    db_queries = Column(Integer, nullable=True)
+    db_duration = Column(Float, nullable=True)
+    db_slowest_duration = Column(Float, nullable=True)
+    db_slowest_statement = Column(String, nullable=True)
+    created_at = Column(DateTime, primary_key=True, server_default=func.timezone(DEFAULT_TZ, func.now()))
@@ -1,11 +1,27 @@
 from .base import Base
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func, Text, Index, text
 from sqlalchemy.orm import relationship
 from app.core.constants.app import DEFAULT_TZ
 
 
 class Guardian(Base):
     __tablename__ = "guardians"
+    __table_args__ = (
+        # Newest-first listing and its keyset cursor
+        Index("ix_guardians_created_at_id", "created_at", "id"),
+        # Name search (app.utils.search): ILIKE '%q%' and similarity, full text
+        Index(
+            "ix_guardians_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_guardians_name_fts",
+            text("to_tsvector('simple'::regconfig, name)"),
+            postgresql_using="gin",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"),unique=True, nullable=False)  # Referensi ke tabel User
@@ -8,7 +8,7 @@ class GuardianPlayer(Base):
     __tablename__ = "guardian_players"
 
     id = Column(Integer, primary_key=True, index=True)
-    guardian_id = Column(Integer, ForeignKey("guardians.id"), nullable=False) 
+    guardian_id = Column(Integer, ForeignKey("guardians.id"), nullable=False, index=True)
     player_id = Column(Integer, ForeignKey("players.id"), nullable=False)  
     created_at = Column(DateTime, server_default=func.timezone(DEFAULT_TZ, func.now()))
     
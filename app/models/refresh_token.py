@@ -0,0 +1,17 @@
+from datetime import datetime
+from .base import Base
+
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    # SHA-256 hex of the opaque token; the token itself is never stored
+    token_hash = Column(String(64), primary_key=True, nullable=False)
+    # Every rotation of one login shares a family; reuse revokes the family
+    family_id = Column(String(32), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    used_at = Column(DateTime, nullable=True)
+    revoked_at = Column(DateTime, nullable=True)
@@ -6,5 +6,7 @@ from sqlalchemy import Column, String, DateTime
 class RevokedToken(Base):
     __tablename__ = "revoked_tokens"
 
-    token = Column(String, primary_key=True, nullable=False)
-    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # `jti` claim, or SHA-256 hex of the token for tokens issued without one
+    jti = Column(String(64), primary_key=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
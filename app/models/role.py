@@ -5,8 +5,9 @@ from sqlalchemy.orm import relationship
 user_role_association = Table(
     "user_roles",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id")),
-    Column("role_id", Integer, ForeignKey("roles.id")),
+    # Roles of a user (and role changes); users of a role
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
+    Column("role_id", Integer, ForeignKey("roles.id"), index=True),
 )
 
 
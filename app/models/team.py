@@ -1,10 +1,28 @@
 from .base import Base
-from sqlalchemy import UUID, ForeignKey, Column, Integer, String, DateTime, func
+from sqlalchemy import UUID, ForeignKey, Column, Integer, String, DateTime, func, Index, text
 from sqlalchemy.orm import relationship
 from app.core.constants.app import DEFAULT_TZ
 
 class Team(Base):
     __tablename__ = "teams"
+    __table_args__ = (
+        # Newest-first listing of live teams and its keyset cursor
+        Index("ix_teams_live_created_at_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        # Name search (app.utils.search): ILIKE '%q%' and similarity, full text
+        Index(
+            "ix_teams_team_name_trgm",
+            "team_name",
+            postgresql_using="gin",
+            postgresql_ops={"team_name": "gin_trgm_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_teams_team_name_fts",
+            text("to_tsvector('simple'::regconfig, team_name)"),
+            postgresql_using="gin",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team_name = Column(String, nullable=False)
@@ -8,7 +8,7 @@ class TeamOfficial(Base):
     __tablename__ = "team_officials"
 
     id = Column(Integer, primary_key=True, index=True)
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)  # Referensi ke tabel teams
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)  # Referensi ke tabel teams
     official_id = Column(Integer, ForeignKey("officials.id"), nullable=False, unique=True)  
     created_at = Column(DateTime, server_default=func.timezone(DEFAULT_TZ, func.now()))
 
@@ -8,7 +8,7 @@ class TeamPlayer(Base):
     __tablename__ = "team_players"
 
     id = Column(Integer, primary_key=True, index=True)
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)  # Referensi ke tabel teams
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False, index=True)  # Referensi ke tabel teams
     player_id = Column(Integer, ForeignKey("players.id"), nullable=False)  # Referensi ke tabel users sebagai player
     created_at = Column(DateTime, server_default=func.timezone(DEFAULT_TZ, func.now()))
 
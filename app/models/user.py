@@ -1,11 +1,29 @@
 from .base import Base
-from sqlalchemy import UUID, ForeignKey, Column, Integer, String, DateTime, func
+from sqlalchemy import UUID, ForeignKey, Column, Integer, String, DateTime, func, Index, text
 from sqlalchemy.orm import relationship
 from .role import user_role_association
 from app.core.constants.app import DEFAULT_TZ
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Newest-first listing of live users and its keyset cursor
+        Index("ix_users_live_created_at_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        # Name search (app.utils.search): ILIKE '%q%' and similarity, full text
+        Index(
+            "ix_users_full_name_trgm",
+            "full_name",
+            postgresql_using="gin",
+            postgresql_ops={"full_name": "gin_trgm_ops"},
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_users_full_name_fts",
+            text("to_tsvector('simple'::regconfig, full_name)"),
+            postgresql_using="gin",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String, nullable=False)
@@ -1,24 +1,42 @@
 import json
+from typing import List
+
+from sqlalchemy import String, insert, literal_column, tuple_
 
 from app.core.database import get_session
-from app.models.audit import ApiLog
-from app.schemas.audit import ApiLogCreate
+from app.models.audit import URL_PATH_SQL, ApiLog
+from app.schemas.audit import ApiLogCreate, ApiLogFilter, ApiLogRead
+from app.utils.date import get_naive_now
+from app.utils.pagination import decode_cursor
 
 
 class ApiLogRepository:
-    def insert(self, payload: ApiLogCreate) -> ApiLog:
-        log = ApiLog()
-
-        log.method = payload.method
-        log.url = payload.url
-        log.resp_status = payload.resp_status
-        log.duration = payload.duration
+    def build_row(self, payload: ApiLogCreate) -> dict:
+        row = {
+            "method": payload.method,
+            "url": payload.url,
+            "resp_status": payload.resp_status,
+            "duration": payload.duration,
+            "db_queries": payload.db_queries,
+            "db_duration": payload.db_duration,
+            "db_slowest_duration": payload.db_slowest_duration,
+            "db_slowest_statement": payload.db_slowest_statement,
+            "req_headers": None,
+            "req_body": None,
+            # Set explicitly so batched or replayed records keep their request time
+            "created_at": payload.created_at or get_naive_now(),
+        }
 
         if payload.req_headers is not None:
-            log.req_headers = payload.req_headers
+            row["req_headers"] = payload.req_headers
 
         if payload.req_body is not None and payload.req_body != b"":
-            log.req_body = json.loads(payload.req_body)
+            row["req_body"] = json.loads(payload.req_body)
+
+        return row
+
+    def insert(self, payload: ApiLogCreate) -> ApiLog:
+        log = ApiLog(**self.build_row(payload))
 
         with get_session() as db:
             db.add(log)
@@ -27,3 +45,63 @@ class ApiLogRepository:
             db.refresh(log)
 
         return log
+
+    def build_rows(self, payloads: List[ApiLogCreate]) -> List[dict]:
+        rows = []
+        for payload in payloads:
+            try:
+                rows.append(self.build_row(payload))
+            except ValueError:
+                # Body is not JSON, keep the rest of the record
+                row = self.build_row(payload.model_copy(update={"req_body": None}))
+                rows.append(row)
+
+        return rows
+
+    def insert_rows(self, rows: List[dict]) -> int:
+        """Write prepared rows with a single multi-row INSERT, in one transaction."""
+        if not rows:
+            return 0
+
+        with get_session() as db:
+            db.execute(insert(ApiLog), rows)
+
+        return len(rows)
+
+    def insert_many(self, payloads: List[ApiLogCreate]) -> int:
+        return self.insert_rows(self.build_rows(payloads))
+
+    def search(self, filter: ApiLogFilter) -> List[ApiLogRead]:
+        """
+        Newest-first page of perf_logs, seeking past `filter.cursor` on
+        (created_at, id) so deep pages cost the same as the first one.
+        Fetches one extra row so the caller can tell whether a next page exists.
+        """
+        with get_session() as db:
+            query = db.query(*ApiLog.__table__.columns)
+
+            if filter.start is not None:
+                query = query.filter(ApiLog.created_at >= filter.start)
+            if filter.end is not None:
+                query = query.filter(ApiLog.created_at < filter.end)
+            if filter.method:
+                query = query.filter(ApiLog.method == filter.method.upper())
+            if filter.status is not None:
+                query = query.filter(ApiLog.resp_status == filter.status)
+            if filter.url_prefix:
+                url_path = literal_column(URL_PATH_SQL, String)
+                query = query.filter(url_path.startswith(filter.url_prefix, autoescape=True))
+            if filter.min_duration_ms is not None:
+                query = query.filter(ApiLog.duration >= filter.min_duration_ms / 1000)
+
+            if filter.cursor:
+                created_at, id = decode_cursor(filter.cursor)
+                query = query.filter(tuple_(ApiLog.created_at, ApiLog.id) < tuple_(created_at, id))
+
+            rows = (
+                query.order_by(ApiLog.created_at.desc(), ApiLog.id.desc())
+                .limit(filter.limit + 1)
+                .all()
+            )
+
+        return [ApiLogRead(**row._mapping) for row in rows]
@@ -0,0 +1,102 @@
+import re
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from app.core.constants.audit import PERF_LOGS_DEFAULT_PARTITION
+from app.core.database import get_session
+from app.models.audit import ApiLog
+from app.schemas.audit import PerfLogPartition
+
+_BOUND_PATTERN = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+def _parse_bound(value: str) -> Optional[datetime]:
+    value = value.strip()
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(value.strip("'"))
+
+
+class AuditPartitionRepository:
+    table_name = ApiLog.__tablename__
+    default_partition = PERF_LOGS_DEFAULT_PARTITION
+
+    def list_partitions(self) -> List[PerfLogPartition]:
+        with get_session() as db:
+            rows = db.execute(
+                text(
+                    """
+                    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+                    FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    JOIN pg_class p ON p.oid = i.inhparent
+                    WHERE p.relname = :table_name
+                    """
+                ),
+                {"table_name": self.table_name},
+            ).all()
+
+        partitions = []
+        for name, bound in rows:
+            match = _BOUND_PATTERN.search(bound or "")
+            if match is None:
+                # DEFAULT partition, never managed here
+                continue
+            partitions.append(
+                PerfLogPartition(
+                    name=name,
+                    lower=_parse_bound(match.group(1)),
+                    upper=_parse_bound(match.group(2)),
+                )
+            )
+
+        return sorted(partitions, key=lambda p: p.lower or datetime.min)
+
+    def oldest_default_row(self) -> Optional[datetime]:
+        """created_at of the oldest row waiting in the DEFAULT partition, if any."""
+        with get_session() as db:
+            return db.scalar(text(f'SELECT min(created_at) FROM "{self.default_partition}"'))
+
+    def create_partition(self, name: str, lower: datetime, upper: datetime) -> None:
+        """
+        Create the range partition [lower, upper). Rows of that range already
+        in the DEFAULT partition are moved into it first: the new table is
+        filled standalone and attached, all in one transaction.
+        """
+        bound = f"FOR VALUES FROM ('{lower.isoformat(sep=' ')}') TO ('{upper.isoformat(sep=' ')}')"
+        in_range = {"lower": lower, "upper": upper}
+        with get_session() as db:
+            waiting = db.scalar(
+                text(
+                    f'SELECT EXISTS (SELECT 1 FROM "{self.default_partition}" '
+                    "WHERE created_at >= :lower AND created_at < :upper)"
+                ),
+                in_range,
+            )
+            if not waiting:
+                db.execute(text(f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{self.table_name}" {bound}'))
+                return
+
+            db.execute(text(f'LOCK TABLE "{self.default_partition}" IN ACCESS EXCLUSIVE MODE'))
+            db.execute(text(
+                f'CREATE TABLE "{name}" (LIKE "{self.table_name}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+            ))
+            db.execute(
+                text(
+                    f'WITH moved AS (DELETE FROM "{self.default_partition}" '
+                    "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+                    f'INSERT INTO "{name}" SELECT * FROM moved'
+                ),
+                in_range,
+            )
+            db.execute(text(f'ALTER TABLE "{self.table_name}" ATTACH PARTITION "{name}" {bound}'))
+
+    def detach_partition(self, name: str) -> None:
+        with get_session() as db:
+            db.execute(text(f'ALTER TABLE "{self.table_name}" DETACH PARTITION "{name}"'))
+
+    def drop_partition(self, name: str) -> None:
+        with get_session() as db:
+            db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
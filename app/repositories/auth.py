@@ -1,19 +1,16 @@
 from typing import List
-from passlib.context import CryptContext
-from sqlalchemy.orm import Query, joinedload
-from sqlalchemy import or_
+from sqlalchemy.orm import Query, joinedload, selectinload
+from sqlalchemy import func, or_, select, update
 
-from app.core.database import get_session
+from app.repositories.base import AsyncRepository, Repository
 from app.models.user import User
 from app.models.role import Role, user_role_association
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-
-class AuthRepository:
+class AuthRepository(Repository):
     def find_by_id(self, id: int) -> User | None:
         """Menemukan pengguna berdasarkan ID unik mereka, dengan eager loading pada `roles`."""
-        with get_session() as db:
+        with self.session() as db:
             return (
                 db.query(User)
                 .filter(User.id == id, User.deleted_at.is_(None))
@@ -22,7 +19,7 @@ class AuthRepository:
             )
 
     def find_by_username_or_email(self, identifier: str) -> User | None:
-        with get_session() as db:
+        with self.session() as db:
             return (
                 db.query(User)
                 .filter(
@@ -33,11 +30,18 @@ class AuthRepository:
                 .one_or_none()
             )
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt_context.verify(plain_password, hashed_password)
+    def replace_password_hash(self, id: int, old_hash: str, new_hash: str) -> bool:
+        """Swap in a rehashed password, unless the password changed in the meantime."""
+        with self.session() as db:
+            result = db.execute(
+                update(User)
+                .where(User.id == id, User.password == old_hash)
+                .values(password=new_hash)
+            )
+            return result.rowcount > 0
 
     def find_by_id_with_roles(self, id: int) -> User | None:
-        with get_session() as db:
+        with self.session() as db:
             return (
                 db.query(User)
                 .filter(User.id == id)
@@ -52,7 +56,7 @@ class AuthRepository:
         return any(role.name == role_name for role in user.roles)
 
     def is_username_or_email_used(self, username: str, email: str, except_id: int = 0) -> bool:
-        with get_session() as db:
+        with self.session() as db:
             username_or_email_count = (
                 db.query(User)
                 .filter(
@@ -62,3 +66,64 @@ class AuthRepository:
                 .count()
             )
         return username_or_email_count > 0
+
+
+class AsyncAuthRepository(AsyncRepository):
+    async def find_by_id(self, id: int) -> User | None:
+        """Menemukan pengguna berdasarkan ID unik mereka, dengan eager loading pada `roles`."""
+        async with self.session() as db:
+            result = await db.execute(
+                select(User)
+                .filter(User.id == id, User.deleted_at.is_(None))
+                .options(selectinload(User.roles))
+            )
+            return result.scalar_one_or_none()
+
+    async def find_by_username_or_email(self, identifier: str) -> User | None:
+        async with self.session() as db:
+            result = await db.execute(
+                select(User)
+                .filter(
+                    or_(User.username == identifier, User.email == identifier),
+                    User.deleted_at.is_(None)
+                )
+                .options(selectinload(User.roles))
+            )
+            return result.scalar_one_or_none()
+
+    async def replace_password_hash(self, id: int, old_hash: str, new_hash: str) -> bool:
+        """Swap in a rehashed password, unless the password changed in the meantime."""
+        async with self.session() as db:
+            result = await db.execute(
+                update(User)
+                .where(User.id == id, User.password == old_hash)
+                .values(password=new_hash)
+            )
+            return result.rowcount > 0
+
+    async def find_by_id_with_roles(self, id: int) -> User | None:
+        async with self.session() as db:
+            result = await db.execute(
+                select(User)
+                .filter(User.id == id)
+                .options(selectinload(User.roles))
+            )
+            return result.scalar_one_or_none()
+
+    async def has_role(self, id: int, role_name: str) -> bool:
+        user = await self.find_by_id_with_roles(id)
+        if user is None or not user.roles:
+            return False
+        return any(role.name == role_name for role in user.roles)
+
+    async def is_username_or_email_used(self, username: str, email: str, except_id: int = 0) -> bool:
+        async with self.session() as db:
+            username_or_email_count = await db.scalar(
+                select(func.count())
+                .select_from(User)
+                .filter(
+                    or_(User.username == username, User.email == email),
+                    User.id != except_id
+                )
+            )
+        return username_or_email_count > 0
@@ -0,0 +1,175 @@
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+from sqlalchemy import ColumnElement, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.constants.pagination import COUNT_ESTIMATED, COUNT_NONE, DEFAULT_COUNT_MODE
+from app.core.database import READ_ONLY, RequestSession, get_async_session, get_session
+from app.utils.pagination import (
+    Page,
+    count_statement,
+    counted_page,
+    explain_statement,
+    page_plan,
+    partial_page,
+    plan_rows,
+    with_total,
+)
+
+
+class Repository:
+    """
+    Base of the sync repositories. Bound to a request session (see get_db)
+    every call joins that unit of work and the request commits it; unbound,
+    each call runs in a transaction of its own.
+    """
+
+    def __init__(self, db: Optional[Session] = None) -> None:
+        self.db = db
+
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        if self.db is not None:
+            yield self.db
+            return
+
+        with get_session() as db:
+            yield db
+
+    @contextmanager
+    def read_session(self) -> Iterator[Session]:
+        """session() for read-only methods: their queries may go to a read replica."""
+        with self.session() as db:
+            previous = db.info.get(READ_ONLY)
+            db.info[READ_ONLY] = True
+            try:
+                yield db
+            finally:
+                db.info[READ_ONLY] = previous
+
+    def paginate(
+        self,
+        db: Session,
+        query: Select,
+        limit: int,
+        page: int,
+        count: str = DEFAULT_COUNT_MODE,
+        filtered: bool = False,
+        cursor: Optional[str] = None,
+        rank: Optional[ColumnElement] = None,
+    ) -> Page:
+        """
+        One page of the entity `query` (filtered, not ordered), newest first,
+        and its total per count mode: exact in the same round trip as the
+        rows (window count), the planner's estimate for unfiltered listings,
+        or none. Without an exact total, has_next comes from fetching one
+        extra row. With a cursor the page seeks past it instead of using
+        page/OFFSET. A search `rank` orders best match first instead, and
+        such pages have no next cursor.
+        """
+        offset, count, ordered = page_plan(query, limit, page, count, cursor, rank)
+        if count == COUNT_NONE or (count == COUNT_ESTIMATED and not filtered):
+            rows = db.execute(ordered.limit(limit + 1).offset(offset)).scalars().all()
+            estimate = None
+            if count == COUNT_ESTIMATED:
+                estimate = plan_rows(db.scalar(explain_statement(query, db.get_bind().dialect)))
+            return partial_page(rows, limit, offset, estimate, rank is None)
+
+        result = db.execute(with_total(ordered).limit(limit).offset(offset)).all()
+        if result:
+            total = result[0][-1]
+        else:
+            total = db.scalar(count_statement(query)) if offset else 0
+        return counted_page(result, total, limit, offset, rank is None)
+
+
+class AsyncRepository:
+    """Async counterpart of Repository."""
+
+    def __init__(self, db: Optional[AsyncSession] = None) -> None:
+        self.db = db
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        if self.db is not None:
+            yield self.db
+            return
+
+        async with get_async_session() as db:
+            yield db
+
+    @asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        """session() for read-only methods: their queries may go to a read replica."""
+        async with self.session() as db:
+            previous = db.info.get(READ_ONLY)
+            db.info[READ_ONLY] = True
+            try:
+                yield db
+            finally:
+                db.info[READ_ONLY] = previous
+
+    async def paginate(
+        self,
+        db: AsyncSession,
+        query: Select,
+        limit: int,
+        page: int,
+        count: str = DEFAULT_COUNT_MODE,
+        filtered: bool = False,
+        cursor: Optional[str] = None,
+        rank: Optional[ColumnElement] = None,
+    ) -> Page:
+        """Async counterpart of Repository.paginate."""
+        offset, count, ordered = page_plan(query, limit, page, count, cursor, rank)
+        if count == COUNT_NONE or (count == COUNT_ESTIMATED and not filtered):
+            rows = (await db.execute(ordered.limit(limit + 1).offset(offset))).scalars().all()
+            estimate = None
+            if count == COUNT_ESTIMATED:
+                estimate = plan_rows(await db.scalar(explain_statement(query, db.get_bind().dialect)))
+            return partial_page(rows, limit, offset, estimate, rank is None)
+
+        result = (await db.execute(with_total(ordered).limit(limit).offset(offset))).all()
+        if result:
+            total = result[0][-1]
+        else:
+            total = await db.scalar(count_statement(query)) if offset else 0
+        return counted_page(result, total, limit, offset, rank is None)
+
+
+class ThreadedRepository:
+    """
+    Awaitable facade over a sync repository: every method call runs in the
+    AnyIO threadpool, so services can await either kind of repository.
+    """
+
+    def __init__(self, repo: Any) -> None:
+        self._repo = repo
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._repo, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(attr, *args, **kwargs)
+
+        return call
+
+
+def select_repository(
+    async_factory: Callable[[Optional[RequestSession]], Any],
+    sync_factory: Callable[[Optional[RequestSession]], Any],
+    db: Optional[RequestSession] = None,
+) -> Any:
+    """
+    The async repository, or the sync one behind a ThreadedRepository when
+    DATABASE_ASYNC is off, bound to `db` if given.
+    """
+    if settings.database_async:
+        return async_factory(db)
+    return ThreadedRepository(sync_factory(db))
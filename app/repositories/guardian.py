@@ -1,24 +1,29 @@
-from typing import Optional, List
+from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Query
-from app.core.database import get_session
+from app.core.constants.pagination import DEFAULT_COUNT_MODE
+from app.core.constants.search import DEFAULT_SEARCH_MODE
+from app.repositories.base import AsyncRepository, Repository
 from app.models.guardian import Guardian
-from app.utils.date import get_now
+from app.utils.date import get_naive_now, get_now
+from app.utils.pagination import Page
+from app.utils.search import name_search
 
-class GuardianRepository:
+class GuardianRepository(Repository):
     def create(self, payload: dict) -> Guardian:
-        with get_session() as db:
+        with self.session() as db:
             guardian = Guardian(**payload)
             db.add(guardian)
-            db.commit()
+            db.flush()
             db.refresh(guardian)
             return guardian
 
     def find_by_user_id(self, user_id: int) -> Optional[Guardian]:
-        with get_session() as db:
+        with self.session() as db:
             return db.query(Guardian).filter(Guardian.user_id == user_id).one_or_none()
 
     def update(self, user_id: int, payload: dict) -> Optional[Guardian]:
-        with get_session() as db:
+        with self.session() as db:
             guardian = db.query(Guardian).filter(Guardian.user_id == user_id).first()
             if not guardian:
                 return None
@@ -28,35 +33,107 @@ class GuardianRepository:
                     setattr(guardian, key, value)
 
             guardian.updated_at = get_now()
-            db.commit()
+            db.flush()
             db.refresh(guardian)
             return guardian
 
     def delete(self, user_id: int) -> bool:
-        with get_session() as db:
+        with self.session() as db:
             guardian = db.query(Guardian).filter(Guardian.user_id == user_id).first()
             if not guardian:
                 return False
 
             db.delete(guardian)
-            db.commit()
+            db.flush()
             return True
 
-    def list(self, limit: int, offset: int) -> List[Guardian]:
-        with get_session() as db:
-            return db.query(Guardian).offset(offset).limit(limit).all()
-
-    def count(self) -> int:
-        with get_session() as db:
-            return db.query(Guardian).count()
-        
-    def list_all(self, limit: int, offset: int, search: Optional[str] = None) -> List[Guardian]:
-        with get_session() as db:
-            query = db.query(Guardian)
-            
+    def list(self, limit: int, page: int, count: str = DEFAULT_COUNT_MODE, cursor: Optional[str] = None) -> Page:
+        with self.read_session() as db:
+            return self.paginate(db, select(Guardian), limit, page, count, cursor=cursor)
+
+    def list_all(
+        self,
+        limit: int,
+        page: int,
+        search: Optional[str] = None,
+        count: str = DEFAULT_COUNT_MODE,
+        cursor: Optional[str] = None,
+        search_mode: str = DEFAULT_SEARCH_MODE,
+    ) -> Page:
+        with self.read_session() as db:
+            query = select(Guardian)
+
+            # Apply search filter
+            rank = None
+            if search:
+                clause, rank = name_search(Guardian.name, search, search_mode)
+                query = query.filter(clause)
+
+            return self.paginate(db, query, limit, page, count, filtered=bool(search), cursor=cursor, rank=rank)
+
+
+
+class AsyncGuardianRepository(AsyncRepository):
+    async def create(self, payload: dict) -> Guardian:
+        async with self.session() as db:
+            guardian = Guardian(**payload)
+            db.add(guardian)
+            await db.flush()
+            await db.refresh(guardian)
+            return guardian
+
+    async def find_by_user_id(self, user_id: int) -> Optional[Guardian]:
+        async with self.session() as db:
+            result = await db.execute(select(Guardian).filter(Guardian.user_id == user_id))
+            return result.scalar_one_or_none()
+
+    async def update(self, user_id: int, payload: dict) -> Optional[Guardian]:
+        async with self.session() as db:
+            result = await db.execute(select(Guardian).filter(Guardian.user_id == user_id).limit(1))
+            guardian = result.scalar_one_or_none()
+            if not guardian:
+                return None
+
+            for key, value in payload.items():
+                if value is not None:
+                    setattr(guardian, key, value)
+
+            guardian.updated_at = get_naive_now()
+            await db.flush()
+            await db.refresh(guardian)
+            return guardian
+
+    async def delete(self, user_id: int) -> bool:
+        async with self.session() as db:
+            result = await db.execute(select(Guardian).filter(Guardian.user_id == user_id).limit(1))
+            guardian = result.scalar_one_or_none()
+            if not guardian:
+                return False
+
+            await db.delete(guardian)
+            await db.flush()
+            return True
+
+    async def list(self, limit: int, page: int, count: str = DEFAULT_COUNT_MODE, cursor: Optional[str] = None) -> Page:
+        async with self.read_session() as db:
+            return await self.paginate(db, select(Guardian), limit, page, count, cursor=cursor)
+
+    async def list_all(
+        self,
+        limit: int,
+        page: int,
+        search: Optional[str] = None,
+        count: str = DEFAULT_COUNT_MODE,
+        cursor: Optional[str] = None,
+        search_mode: str = DEFAULT_SEARCH_MODE,
+    ) -> Page:
+        async with self.read_session() as db:
+            query = select(Guardian)
+
             # Apply search filter
+            rank = None
             if search:
-                query = query.filter(Guardian.name.ilike(f"%{search}%"))
-            
-            return query.offset(offset).limit(limit).all()
+                clause, rank = name_search(Guardian.name, search, search_mode)
+                query = query.filter(clause)
 
+            return await self.paginate(db, query, limit, page, count, filtered=bool(search), cursor=cursor, rank=rank)
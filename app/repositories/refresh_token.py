@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import delete, select, update
+from app.models.refresh_token import RefreshToken
+from app.core.database import get_session
+from app.repositories.base import AsyncRepository, Repository
+
+
+class RefreshTokenRepository(Repository):
+    def insert(self, token_hash: str, family_id: str, user_id: int, expires_at: datetime) -> None:
+        with self.session() as db:
+            db.add(RefreshToken(token_hash=token_hash, family_id=family_id, user_id=user_id, expires_at=expires_at))
+
+    def rotate(self, old_hash: str, new_hash: str, expires_at: datetime) -> Optional[Tuple[int, str]]:
+        """
+        Menandai refresh token lama sebagai terpakai dan menyimpan penggantinya
+        dalam family yang sama, dalam satu transaksi. Mengembalikan
+        (user_id, family_id), atau None jika token tidak valid lagi.
+        """
+        now = datetime.utcnow()
+        with self.session() as db:
+            consumed = db.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.token_hash == old_hash,
+                    RefreshToken.used_at.is_(None),
+                    RefreshToken.revoked_at.is_(None),
+                    RefreshToken.expires_at > now,
+                )
+                .values(used_at=now)
+                .returning(RefreshToken.user_id, RefreshToken.family_id)
+            ).first()
+            if consumed is None:
+                return None
+
+            user_id, family_id = consumed
+            db.add(RefreshToken(token_hash=new_hash, family_id=family_id, user_id=user_id, expires_at=expires_at))
+
+        return user_id, family_id
+
+    def find_reused_family(self, token_hash: str) -> Optional[str]:
+        """
+        Family dari token yang sudah pernah dipakai dan family-nya belum di-revoke.
+        """
+        with self.session() as db:
+            return db.execute(
+                select(RefreshToken.family_id).where(
+                    RefreshToken.token_hash == token_hash,
+                    RefreshToken.used_at.is_not(None),
+                    RefreshToken.revoked_at.is_(None),
+                )
+            ).scalar_one_or_none()
+
+    def revoke_family(self, family_id: str) -> int:
+        with self.session() as db:
+            return db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=datetime.utcnow())
+            ).rowcount
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """
+        Menghapus refresh token yang sudah expired, per batch agar lock tetap singkat.
+        """
+        purged = 0
+        while True:
+            with get_session() as db:
+                expired = (
+                    select(RefreshToken.token_hash)
+                    .where(RefreshToken.expires_at < datetime.utcnow())
+                    .limit(batch_size)
+                    .scalar_subquery()
+                )
+                deleted = db.execute(delete(RefreshToken).where(RefreshToken.token_hash.in_(expired))).rowcount
+
+            purged += deleted
+            if deleted < batch_size:
+                return purged
+
+
+class AsyncRefreshTokenRepository(AsyncRepository):
+    async def insert(self, token_hash: str, family_id: str, user_id: int, expires_at: datetime) -> None:
+        async with self.session() as db:
+            db.add(RefreshToken(token_hash=token_hash, family_id=family_id, user_id=user_id, expires_at=expires_at))
+
+    async def rotate(self, old_hash: str, new_hash: str, expires_at: datetime) -> Optional[Tuple[int, str]]:
+        """
+        Menandai refresh token lama sebagai terpakai dan menyimpan penggantinya
+        dalam family yang sama, dalam satu transaksi. Mengembalikan
+        (user_id, family_id), atau None jika token tidak valid lagi.
+        """
+        now = datetime.utcnow()
+        async with self.session() as db:
+            result = await db.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.token_hash == old_hash,
+                    RefreshToken.used_at.is_(None),
+                    RefreshToken.revoked_at.is_(None),
+                    RefreshToken.expires_at > now,
+                )
+                .values(used_at=now)
+                .returning(RefreshToken.user_id, RefreshToken.family_id)
+            )
+            consumed = result.first()
+            if consumed is None:
+                return None
+
+            user_id, family_id = consumed
+            db.add(RefreshToken(token_hash=new_hash, family_id=family_id, user_id=user_id, expires_at=expires_at))
+
+        return user_id, family_id
+
+    async def find_reused_family(self, token_hash: str) -> Optional[str]:
+        """
+        Family dari token yang sudah pernah dipakai dan family-nya belum di-revoke.
+        """
+        async with self.session() as db:
+            return await db.scalar(
+                select(RefreshToken.family_id).where(
+                    RefreshToken.token_hash == token_hash,
+                    RefreshToken.used_at.is_not(None),
+                    RefreshToken.revoked_at.is_(None),
+                )
+            )
+
+    async def revoke_family(self, family_id: str) -> int:
+        async with self.session() as db:
+            result = await db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=datetime.utcnow())
+            )
+            return result.rowcount
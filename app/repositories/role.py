@@ -1,25 +1,58 @@
 from typing import List
-from app.core.database import get_session
-from app.models.role import Role
+from sqlalchemy import func, select
+from app.repositories.base import AsyncRepository, Repository
+from app.models.role import Role, user_role_association
 
 
-class RoleRepository:
+class RoleRepository(Repository):
     def get_by_user_id(self, user_id: int) -> List[Role]:
-        with get_session() as db:
+        with self.session() as db:
             return (
-                db.query(Role).join(Role.users).filter(Role.users.any(id=user_id)).all()
+                db.query(Role)
+                .join(user_role_association, user_role_association.c.role_id == Role.id)
+                .filter(user_role_association.c.user_id == user_id)
+                .all()
             )
 
     def find_by_name(self, name: str) -> Role | None:
-        with get_session() as db:
+        with self.session() as db:
             return db.query(Role).filter(Role.name == name).one_or_none()
 
     def is_name_exists(self, name: str) -> bool:
-        with get_session() as db:
+        with self.session() as db:
             name_count = db.query(Role).filter(Role.name == name).count()
 
         return name_count > 0
 
     def get_all(self) -> List[Role]:
-        with get_session() as db:
+        with self.session() as db:
             return db.query(Role).order_by(Role.name.asc()).all()
+
+
+class AsyncRoleRepository(AsyncRepository):
+    async def get_by_user_id(self, user_id: int) -> List[Role]:
+        async with self.session() as db:
+            result = await db.execute(
+                select(Role)
+                .join(user_role_association, user_role_association.c.role_id == Role.id)
+                .filter(user_role_association.c.user_id == user_id)
+            )
+            return result.scalars().all()
+
+    async def find_by_name(self, name: str) -> Role | None:
+        async with self.session() as db:
+            result = await db.execute(select(Role).filter(Role.name == name))
+            return result.scalar_one_or_none()
+
+    async def is_name_exists(self, name: str) -> bool:
+        async with self.session() as db:
+            name_count = await db.scalar(
+                select(func.count()).select_from(Role).filter(Role.name == name)
+            )
+
+        return name_count > 0
+
+    async def get_all(self) -> List[Role]:
+        async with self.session() as db:
+            result = await db.execute(select(Role).order_by(Role.name.asc()))
+            return result.scalars().all()
@@ -1,24 +1,29 @@
-from typing import List, Optional
+from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Query
-from app.core.database import get_session
+from app.core.constants.pagination import DEFAULT_COUNT_MODE
+from app.core.constants.search import DEFAULT_SEARCH_MODE
+from app.repositories.base import AsyncRepository, Repository
 from app.models.team import Team
-from app.utils.date import get_now
+from app.utils.date import get_naive_now, get_now
+from app.utils.pagination import Page
+from app.utils.search import name_search
 
-class TeamRepository:
+class TeamRepository(Repository):
     def create(self, payload: dict) -> Team:
-        with get_session() as db:
+        with self.session() as db:
             team = Team(**payload)
             db.add(team)
-            db.commit()
+            db.flush()
             db.refresh(team)
             return team
 
     def find_by_id(self, team_id: int) -> Optional[Team]:
-        with get_session() as db:
+        with self.session() as db:
             return db.query(Team).filter(Team.id == team_id, Team.deleted_at.is_(None)).one_or_none()
 
     def update(self, team_id: int, payload: dict) -> Optional[Team]:
-        with get_session() as db:
+        with self.session() as db:
             team = db.query(Team).filter(Team.id == team_id, Team.deleted_at.is_(None)).first()
             if not team:
                 return None
@@ -29,35 +34,104 @@ class TeamRepository:
                     setattr(team, key, value)
 
             team.updated_at = get_now()  # Set waktu update terakhir
-            db.commit()
+            db.flush()
             db.refresh(team)
             return team
 
 
     def delete(self, team_id: int) -> bool:
-        with get_session() as db:
+        with self.session() as db:
             team = db.query(Team).filter(Team.id == team_id, Team.deleted_at.is_(None)).first()
             if not team:
                 return False
 
             team.deleted_at = get_now()
-            db.commit()
+            db.flush()
             return True
 
-    def list(self, limit: int = 20, page: int = 1, search: Optional[str] = None) -> List[Team]:
-        with get_session() as db:
-            query = db.query(Team).filter(Team.deleted_at.is_(None))
+    def list(
+        self,
+        limit: int = 20,
+        page: int = 1,
+        search: Optional[str] = None,
+        count: str = DEFAULT_COUNT_MODE,
+        cursor: Optional[str] = None,
+        search_mode: str = DEFAULT_SEARCH_MODE,
+    ) -> Page:
+        with self.read_session() as db:
+            query = select(Team).filter(Team.deleted_at.is_(None))
 
+            rank = None
             if search:
-                query = query.filter(Team.team_name.ilike(f"%{search}%"))
+                clause, rank = name_search(Team.team_name, search, search_mode)
+                query = query.filter(clause)
 
-            query = query.order_by(Team.created_at.desc())
-            offset = (page - 1) * limit
-            return query.limit(limit).offset(offset).all()
+            return self.paginate(db, query, limit, page, count, filtered=bool(search), cursor=cursor, rank=rank)
 
-    def count(self, search: Optional[str] = None) -> int:
-        with get_session() as db:
-            query = db.query(Team).filter(Team.deleted_at.is_(None))
+
+class AsyncTeamRepository(AsyncRepository):
+    async def create(self, payload: dict) -> Team:
+        async with self.session() as db:
+            team = Team(**payload)
+            db.add(team)
+            await db.flush()
+            await db.refresh(team)
+            return team
+
+    async def find_by_id(self, team_id: int) -> Optional[Team]:
+        async with self.session() as db:
+            result = await db.execute(
+                select(Team).filter(Team.id == team_id, Team.deleted_at.is_(None))
+            )
+            return result.scalar_one_or_none()
+
+    async def update(self, team_id: int, payload: dict) -> Optional[Team]:
+        async with self.session() as db:
+            result = await db.execute(
+                select(Team).filter(Team.id == team_id, Team.deleted_at.is_(None)).limit(1)
+            )
+            team = result.scalar_one_or_none()
+            if not team:
+                return None
+
+            # Update hanya kolom yang ada dalam payload
+            for key, value in payload.items():
+                if value is not None:  # Hanya update kolom dengan nilai bukan None
+                    setattr(team, key, value)
+
+            team.updated_at = get_naive_now()  # Set waktu update terakhir
+            await db.flush()
+            await db.refresh(team)
+            return team
+
+    async def delete(self, team_id: int) -> bool:
+        async with self.session() as db:
+            result = await db.execute(
+                select(Team).filter(Team.id == team_id, Team.deleted_at.is_(None)).limit(1)
+            )
+            team = result.scalar_one_or_none()
+            if not team:
+                return False
+
+            team.deleted_at = get_naive_now()
+            await db.flush()
+            return True
+
+    async def list(
+        self,
+        limit: int = 20,
+        page: int = 1,
+        search: Optional[str] = None,
+        count: str = DEFAULT_COUNT_MODE,
+        cursor: Optional[str] = None,
+        search_mode: str = DEFAULT_SEARCH_MODE,
+    ) -> Page:
+        async with self.read_session() as db:
+            query = select(Team).filter(Team.deleted_at.is_(None))
+
+            rank = None
             if search:
-                query = query.filter(Team.team_name.ilike(f"%{search}%"))
-            return query.count()
+                clause, rank = name_search(Team.team_name, search, search_mode)
+                query = query.filter(clause)
+
+            return await self.paginate(db, query, limit, page, count, filtered=bool(search), cursor=cursor, rank=rank)
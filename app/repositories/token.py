@@ -1,21 +1,86 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, select
 from app.models.revoked_token import RevokedToken
 from app.core.database import get_session
+from app.repositories.base import AsyncRepository, Repository
 
 
-class TokenRepository:
-    def add_revoked_token(self, token: str):
+class TokenRepository(Repository):
+    def add_revoked_token(self, jti: str, expires_at: datetime):
         """
         Menambahkan token ke daftar revoked.
         """
-        revoked_token = RevokedToken(token=token)
-        with get_session() as db:
-            db.add(revoked_token)
-            db.commit()
+        revoked_token = RevokedToken(jti=jti, expires_at=expires_at)
+        with self.session() as db:
+            db.merge(revoked_token)
+            db.flush()
 
-    def is_token_revoked(self, token: str) -> bool:
+    def is_token_revoked(self, jti: str) -> bool:
         """
         Memeriksa apakah token telah di-revoke.
         """
-        with get_session() as db:
-            return db.query(RevokedToken).filter(RevokedToken.token == token).first() is not None
+        with self.session() as db:
+            return db.query(RevokedToken.jti).filter(RevokedToken.jti == jti).first() is not None
+
+    def list_revoked_since(self, since: Optional[datetime] = None) -> List[Tuple[str, datetime, datetime]]:
+        """
+        Mengambil token yang di-revoke sejak `since` (semua jika None) dan belum expired.
+        """
+        with self.session() as db:
+            query = db.query(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).filter(
+                RevokedToken.expires_at > datetime.utcnow()
+            )
+            if since is not None:
+                query = query.filter(RevokedToken.revoked_at >= since)
+            return [(jti, expires_at, revoked_at) for jti, expires_at, revoked_at in query.all()]
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        """
+        Menghapus token yang sudah expired, per batch agar lock tetap singkat.
+        """
+        purged = 0
+        while True:
+            with get_session() as db:
+                expired = (
+                    select(RevokedToken.jti)
+                    .where(RevokedToken.expires_at < datetime.utcnow())
+                    .limit(batch_size)
+                    .scalar_subquery()
+                )
+                deleted = db.execute(delete(RevokedToken).where(RevokedToken.jti.in_(expired))).rowcount
+
+            purged += deleted
+            if deleted < batch_size:
+                return purged
+
+
+class AsyncTokenRepository(AsyncRepository):
+    async def add_revoked_token(self, jti: str, expires_at: datetime):
+        """
+        Menambahkan token ke daftar revoked.
+        """
+        async with self.session() as db:
+            await db.merge(RevokedToken(jti=jti, expires_at=expires_at))
+            await db.flush()
+
+    async def is_token_revoked(self, jti: str) -> bool:
+        """
+        Memeriksa apakah token telah di-revoke.
+        """
+        async with self.session() as db:
+            result = await db.execute(select(RevokedToken.jti).filter(RevokedToken.jti == jti).limit(1))
+            return result.first() is not None
+
+    async def list_revoked_since(self, since: Optional[datetime] = None) -> List[Tuple[str, datetime, datetime]]:
+        """
+        Mengambil token yang di-revoke sejak `since` (semua jika None) dan belum expired.
+        """
+        async with self.session() as db:
+            query = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).filter(
+                RevokedToken.expires_at > datetime.utcnow()
+            )
+            if since is not None:
+                query = query.filter(RevokedToken.revoked_at >= since)
+            result = await db.execute(query)
+            return [(jti, expires_at, revoked_at) for jti, expires_at, revoked_at in result.all()]
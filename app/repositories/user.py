@@ -1,27 +1,42 @@
 import logging
-from typing import List, Optional, Tuple
-from passlib.context import CryptContext
-from sqlalchemy.orm import Query, joinedload
-from sqlalchemy import insert, delete
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import ColumnElement, Select, delete, func, insert, select
 
-from app.core.database import get_session
+from app.core.constants.auth import USER_PROFILE_CACHE_SIZE, USER_PROFILE_CACHE_TTL_SECONDS
+from app.core.database import RequestSession, on_commit
+from app.repositories.base import AsyncRepository, Repository
 from app.models.user import User
 from app.repositories.role import RoleRepository
-from app.utils.date import get_now
+from app.utils.cache import TTLCache
+from app.utils.date import get_naive_now, get_now
+from app.utils.pagination import Page
+from app.utils.search import name_search
 from app.models.role import Role, user_role_association
 
 from app.schemas.user_mgt import UserCreate, UserUpdate, UserFilter, RegisterUpdate,PasswordUpdate
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# user id -> AuthUser served by /auth/me; the user repositories' writes invalidate it
+user_profile_cache = TTLCache(USER_PROFILE_CACHE_SIZE, USER_PROFILE_CACHE_TTL_SECONDS)
 
-class UserRepository:
-    def __init__(self, user_repo: 'UserRepository', role_repo: 'RoleRepository') -> None:
+
+def invalidate_profile(db: RequestSession, user_id: int) -> None:
+    """
+    Drop the cached profile once `db` commits. Dropping it at flush would let
+    a concurrent /auth/me cache the old, still committed row again.
+    """
+    on_commit(db, lambda: user_profile_cache.delete(user_id))
+
+
+class UserRepository(Repository):
+    def __init__(self, user_repo: 'UserRepository', role_repo: 'RoleRepository', db: Optional[Session] = None) -> None:
+        super().__init__(db)
         self.user_repo = user_repo
         self.role_repo = role_repo
 
     def find_by_id(self, id: int) -> User | None:
-        with get_session() as db:
+        with self.session() as db:
             return (
                 db.query(User)
                 .filter(User.id == id, User.deleted_at.is_(None))
@@ -29,19 +44,15 @@ class UserRepository:
             )
 
     def find_by_username(self, username: str) -> User | None:
-        with get_session() as db:
+        with self.session() as db:
             return (
                 db.query(User)
                 .filter(User.username == username, User.deleted_at.is_(None))
                 .one_or_none()
             )
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt_context.verify(plain_password, hashed_password)
-
-
     def find_by_id_with_roles(self, id: int) -> User | None:
-        with get_session() as db:
+        with self.session() as db:
             return (
                 db.query(User)
                 .filter(User.id == id)
@@ -63,72 +74,48 @@ class UserRepository:
 
         return False
 
-    def filtered(self, query: Query, filter: UserFilter) -> Query:
-    # Filter pencarian berdasarkan full_name (query string `q`)
+    def filtered(self, query: Select, filter: UserFilter) -> Tuple[Select, Optional[ColumnElement]]:
+    # Filter pencarian berdasarkan full_name (query string `q`), dengan rank untuk mode fulltext/similar
+        rank = None
         if filter.search:
-            query = query.filter(User.full_name.ilike(f"%{filter.search}%"))  
+            clause, rank = name_search(User.full_name, filter.search, filter.search_mode)
+            query = query.filter(clause)
             logging.info(f"Filtered query applied with search: {filter.search}")
-        return query
-
-
-    def get_all_filtered(self, filter: Optional[UserFilter] = None) -> List[User]:
-        with get_session() as db:
-            query = db.query(User)
-
-            # Include users with null deleted_at
-            query = query.filter(User.deleted_at.is_(None))
-
-            # Order by creation date
-            query = query.order_by(User.created_at.desc())
-
-            # Default pagination settings
-            default_limit = 20
-            default_page = 1
-
-            # Apply limit and offset based on filter or default values
-            limit = default_limit
-            page = default_page
-
-            if filter is not None:
-                limit = filter.limit if filter.limit is not None else default_limit
-                page = filter.page if filter.page is not None else default_page
-
-            query = query.limit(limit)
-            offset = (page - 1) * limit
-            query = query.offset(offset)
+        return query, rank
 
-            return query.options(joinedload(User.roles)).all()
 
+    def get_all_filtered(self, filter: Optional[UserFilter] = None) -> Page:
+        if filter is None:
+            filter = UserFilter()
 
+        # Default pagination settings
+        limit = filter.limit if filter.limit is not None else 20
+        page = filter.page if filter.page is not None else 1
 
-
-    def count_by_filter(self, filter: UserFilter) -> int:
-        with get_session() as db:
-            query = db.query(User)
-
-            # Filter based on the provided filters
-            query = self.filtered(query, filter)
-
+        with self.read_session() as db:
             # Include users with null deleted_at
-            query = query.filter(User.deleted_at.is_(None))
+            query = select(User).filter(User.deleted_at.is_(None))
+            query, rank = self.filtered(query, filter)
 
-            return query.count()
+            # Newest first (paginate); roles load in one extra query for the page
+            query = query.options(selectinload(User.roles))
 
-    def password_hash(self, password: str) -> str:
-        return bcrypt_context.hash(password)
+            return self.paginate(
+                db, query, limit, page, filter.count, filtered=bool(filter.search), cursor=filter.cursor, rank=rank
+            )
 
-    def insert(self, payload: UserCreate) -> User:
+    def insert(self, payload: UserCreate, password_hash: str) -> User:
         user = User()
         user.username = payload.username
 
         user.full_name = payload.full_name
         user.email = payload.email
 
-        hash_password = self.password_hash(payload.password)
-        user.password = hash_password
+        # Hashed by the caller on the password-hashing pool
+        user.password = password_hash
 
 
-        with get_session() as db:
+        with self.session() as db:
             db.add(user)
             db.flush()
 
@@ -145,13 +132,12 @@ class UserRepository:
 
 
 
-            db.commit()
             db.refresh(user)
 
         return user
 
-    def update(self, user_id: int, payload: UserUpdate) -> User | None:
-        with get_session() as db:
+    def update(self, user_id: int, payload: UserUpdate, password_hash: Optional[str] = None) -> User | None:
+        with self.session() as db:
             user = db.query(User).filter(User.id == user_id).first()
             if not user:
                 return None
@@ -163,8 +149,8 @@ class UserRepository:
                 user.full_name = payload.full_name
             if payload.email:
                 user.email = payload.email
-            if payload.password:
-                user.password = self.password_hash(payload.password)
+            if password_hash:
+                user.password = password_hash
 
             user.updated_at = get_now()
 
@@ -185,12 +171,13 @@ class UserRepository:
                         )
                     )
 
-            db.commit()
+            db.flush()
             db.refresh(user)
-            return user
+            invalidate_profile(db, user_id)
+        return user
 
     def is_username_used(self, username: str, except_id: int = 0) -> bool:
-        with get_session() as db:
+        with self.session() as db:
             username_count = (
                 db.query(User)
                 .filter(User.username == username, User.id != except_id)
@@ -200,7 +187,7 @@ class UserRepository:
         return username_count > 0
 
     def delete(self, user_id: int) -> bool:
-        with get_session() as db:
+        with self.session() as db:
             user = db.query(User).filter(User.id == user_id).first()
             if not user:
                 return False
@@ -215,11 +202,12 @@ class UserRepository:
                 )
             )
 
-            db.commit()
-            return True
+            db.flush()
+            invalidate_profile(db, user_id)
+        return True
 
     def is_email_used(self, email: str, except_id: int = 0) -> bool:
-        with get_session() as db:
+        with self.session() as db:
             email_count = (
                 db.query(User)
                 .filter(User.email == email, User.id != except_id)
@@ -227,43 +215,211 @@ class UserRepository:
             )
             return email_count > 0
 
-    def update_password(self, id: int, payload: RegisterUpdate) -> User | None:
+    def update_password(self, id: int, password_hash: str) -> User | None:
         user = self.find_by_id(id)
         if user is None:
             return user
 
-
-        if payload.password is not None:
-            hash_password = self.password_hash(payload.password)
-            user.password = hash_password
+        user.password = password_hash
 
 
         user.updated_at = get_now()
 
-        with get_session() as db:
+        with self.session() as db:
             db.add(user)
-            db.commit()
+            db.flush()
             db.refresh(user)
-
+            invalidate_profile(db, id)
         return user
     
-    def update_user_password(self, id: int, payload: PasswordUpdate) -> User | None:
+    def update_user_password(self, id: int, password_hash: str) -> User | None:
         user = self.find_by_id(id)
         if user is None:
             return user
 
-
-        if payload.new_password is not None:
-            hash_password = self.password_hash(payload.new_password)
-            user.password = hash_password
+        user.password = password_hash
 
 
         user.updated_at = get_now()
 
-        with get_session() as db:
+        with self.session() as db:
             db.add(user)
-            db.commit()
+            db.flush()
             db.refresh(user)
+            invalidate_profile(db, id)
+        return user
+
+
+
+class AsyncUserRepository(AsyncRepository):
+    async def find_by_id(self, id: int) -> User | None:
+        async with self.session() as db:
+            result = await db.execute(
+                select(User).filter(User.id == id, User.deleted_at.is_(None))
+            )
+            return result.scalar_one_or_none()
+
+    async def find_by_username(self, username: str) -> User | None:
+        async with self.session() as db:
+            result = await db.execute(
+                select(User).filter(User.username == username, User.deleted_at.is_(None))
+            )
+            return result.scalar_one_or_none()
+
+    async def find_by_id_with_roles(self, id: int) -> User | None:
+        async with self.session() as db:
+            result = await db.execute(
+                select(User).filter(User.id == id).options(selectinload(User.roles))
+            )
+            return result.scalar_one_or_none()
+
+    async def has_role(self, id: int, role_name: str) -> bool:
+        user = await self.find_by_id_with_roles(id)
+        if user is None or not user.roles:
+            return False
+        return any(role.name == role_name for role in user.roles)
+
+    def filtered(self, query: Select, filter: UserFilter) -> Tuple[Select, Optional[ColumnElement]]:
+        # Filter pencarian berdasarkan full_name (query string `q`), dengan rank untuk mode fulltext/similar
+        rank = None
+        if filter.search:
+            clause, rank = name_search(User.full_name, filter.search, filter.search_mode)
+            query = query.filter(clause)
+        return query, rank
+
+    async def get_all_filtered(self, filter: Optional[UserFilter] = None) -> Page:
+        if filter is None:
+            filter = UserFilter()
+
+        limit = filter.limit if filter.limit is not None else 20
+        page = filter.page if filter.page is not None else 1
+
+        async with self.read_session() as db:
+            query = select(User).filter(User.deleted_at.is_(None))
+            query, rank = self.filtered(query, filter)
+            query = query.options(selectinload(User.roles))
+            return await self.paginate(
+                db, query, limit, page, filter.count, filtered=bool(filter.search), cursor=filter.cursor, rank=rank
+            )
+
+    async def insert(self, payload: UserCreate, password_hash: str) -> User:
+        user = User()
+        user.username = payload.username
+        user.full_name = payload.full_name
+        user.email = payload.email
+        # Hashed by the caller on the password-hashing pool
+        user.password = password_hash
+
+        async with self.session() as db:
+            db.add(user)
+            await db.flush()
+
+            if payload.role is not None:
+                role_id = await db.scalar(select(Role.id).filter(Role.name == payload.role))
+                await db.execute(
+                    insert(user_role_association).values(user_id=user.id, role_id=role_id)
+                )
+
+            await db.refresh(user)
 
         return user
 
+    async def update(self, user_id: int, payload: UserUpdate, password_hash: Optional[str] = None) -> User | None:
+        async with self.session() as db:
+            user = await db.get(User, user_id)
+            if not user:
+                return None
+
+            # Update basic user information
+            if payload.username:
+                user.username = payload.username
+            if payload.full_name:
+                user.full_name = payload.full_name
+            if payload.email:
+                user.email = payload.email
+            if password_hash:
+                user.password = password_hash
+
+            user.updated_at = get_naive_now()
+
+            # Handle role update if provided
+            if payload.role:
+                role = await db.scalar(select(Role).filter(Role.name == payload.role).limit(1))
+                if role:
+                    await db.execute(
+                        delete(user_role_association).where(
+                            user_role_association.c.user_id == user_id
+                        )
+                    )
+                    await db.execute(
+                        user_role_association.insert().values(
+                            user_id=user_id, role_id=role.id
+                        )
+                    )
+
+            await db.flush()
+            await db.refresh(user)
+            invalidate_profile(db, user_id)
+        return user
+
+    async def is_username_used(self, username: str, except_id: int = 0) -> bool:
+        async with self.session() as db:
+            username_count = await db.scalar(
+                select(func.count())
+                .select_from(User)
+                .filter(User.username == username, User.id != except_id)
+            )
+
+        return username_count > 0
+
+    async def delete(self, user_id: int) -> bool:
+        async with self.session() as db:
+            user = await db.get(User, user_id)
+            if not user:
+                return False
+
+            # Soft delete - update deleted_at timestamp
+            user.deleted_at = get_naive_now()
+
+            # Remove role associations
+            await db.execute(
+                delete(user_role_association).where(
+                    user_role_association.c.user_id == user_id
+                )
+            )
+
+            await db.flush()
+            invalidate_profile(db, user_id)
+        return True
+
+    async def is_email_used(self, email: str, except_id: int = 0) -> bool:
+        async with self.session() as db:
+            email_count = await db.scalar(
+                select(func.count())
+                .select_from(User)
+                .filter(User.email == email, User.id != except_id)
+            )
+            return email_count > 0
+
+    async def _set_password(self, id: int, password_hash: str) -> User | None:
+        async with self.session() as db:
+            result = await db.execute(
+                select(User).filter(User.id == id, User.deleted_at.is_(None))
+            )
+            user = result.scalar_one_or_none()
+            if user is None:
+                return user
+
+            user.password = password_hash
+            user.updated_at = get_naive_now()
+
+            await db.flush()
+            await db.refresh(user)
+            invalidate_profile(db, id)
+        return user
+
+    async def update_password(self, id: int, password_hash: str) -> User | None:
+        return await self._set_password(id, password_hash)
+
+    async def update_user_password(self, id: int, password_hash: str) -> User | None:
+        return await self._set_password(id, password_hash)
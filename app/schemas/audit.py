@@ -1,5 +1,8 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional, List, Tuple
+from typing import Any, Optional, List, Tuple
+
+from app.core.constants.audit import DEFAULT_PERF_LOGS_PAGE_LIMIT
 
 
 class ApiLogCreate(BaseModel):
@@ -9,3 +12,48 @@ class ApiLogCreate(BaseModel):
     req_body: Optional[bytes] = None
     resp_status: str
     duration: float
+    db_queries: Optional[int] = None
+    db_duration: Optional[float] = None
+    db_slowest_duration: Optional[float] = None
+    db_slowest_statement: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class PerfLogPartition(BaseModel):
+    name: str
+    lower: Optional[datetime] = None  # None for MINVALUE
+    upper: Optional[datetime] = None  # None for MAXVALUE
+
+
+class AuditSamplingRule(BaseModel):
+    path: str = "*"  # fnmatch pattern on the request path
+    methods: Optional[List[str]] = None
+    status: Optional[List[str]] = None  # exact codes ("404") or classes ("5xx")
+    min_duration_ms: Optional[float] = None
+    rate: float = 1.0
+
+
+class ApiLogFilter(BaseModel):
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    method: Optional[str] = None
+    status: Optional[int] = None
+    url_prefix: Optional[str] = None
+    min_duration_ms: Optional[float] = None
+    limit: int = DEFAULT_PERF_LOGS_PAGE_LIMIT
+    cursor: Optional[str] = None
+
+
+class ApiLogRead(BaseModel):
+    id: int
+    method: str
+    url: str
+    req_headers: Optional[Any] = None
+    req_body: Optional[Any] = None
+    resp_status: Optional[int] = None
+    duration: Optional[float] = None
+    db_queries: Optional[int] = None
+    db_duration: Optional[float] = None
+    db_slowest_duration: Optional[float] = None
+    db_slowest_statement: Optional[str] = None
+    created_at: datetime
@@ -3,11 +3,16 @@ from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 from typing import List, Optional  # Pastikan List diimpor dari typing
+from app.core.constants.pagination import CountMode, DEFAULT_COUNT_MODE
+from app.core.constants.search import SearchMode, DEFAULT_SEARCH_MODE
 
 class UserFilter(BaseModel):
     limit: Optional[int] = 20  # Default limit
     page: Optional[int] = 1  # Default page
     search: Optional[str] = None  # Query pencarian full_name
+    count: CountMode = DEFAULT_COUNT_MODE  # Mode total_rows
+    cursor: Optional[str] = None  # next_cursor halaman sebelumnya, menggantikan page
+    search_mode: SearchMode = DEFAULT_SEARCH_MODE  # contains, fulltext atau similar
 
 class UserCreate(BaseModel):
     full_name: str
@@ -0,0 +1,270 @@
+import json
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.core.config import settings
+from app.core.constants.audit import (
+    AUDIT_OVERFLOW_BLOCK,
+    AUDIT_OVERFLOW_DROP,
+    AUDIT_OVERFLOW_SAMPLE,
+    AUDIT_SAMPLE_HIGH_WATERMARK,
+    MAX_PERF_LOGS_PAGE_LIMIT,
+)
+from app.repositories.audit import ApiLogRepository
+from app.schemas.audit import ApiLogCreate, ApiLogFilter, ApiLogRead
+from app.utils.exception import UnprocessableException
+from app.utils.logger import logger
+from app.utils.pagination import encode_cursor
+from app.utils.spool import SegmentedSpool
+
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Background writer for the perf_logs audit trail.
+
+    Requests only enqueue their record; a worker thread drains the bounded
+    queue into multi-row INSERTs every `batch_size` records or
+    `flush_interval_ms`, whichever comes first.
+
+    When an INSERT fails the batch goes to a local SegmentedSpool and the
+    database is left alone for `db_retry_interval_ms`. Once it accepts writes
+    again, sealed spool segments are replayed one per worker iteration,
+    including those of worker processes that exited before draining theirs.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = settings.audit_queue_size,
+        batch_size: int = settings.audit_batch_size,
+        flush_interval_ms: int = settings.audit_flush_interval_ms,
+        overflow_policy: str = settings.audit_overflow_policy,
+        sample_rate: float = settings.audit_overflow_sample_rate,
+        block_timeout_ms: int = settings.audit_block_timeout_ms,
+        spool_dir: str = settings.audit_spool_dir,
+        spool_segment_bytes: int = settings.audit_spool_segment_bytes,
+        db_retry_interval_ms: int = settings.audit_db_retry_interval_ms,
+    ) -> None:
+        if overflow_policy not in (AUDIT_OVERFLOW_DROP, AUDIT_OVERFLOW_SAMPLE, AUDIT_OVERFLOW_BLOCK):
+            raise ValueError(f"unknown audit overflow policy: {overflow_policy}")
+
+        self.log_repo = ApiLogRepository()
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.block_timeout = block_timeout_ms / 1000
+        self.spool_dir = spool_dir
+        self.spool_segment_bytes = spool_segment_bytes
+        self.db_retry_interval = db_retry_interval_ms / 1000
+
+        self.dropped = 0
+        self.written = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.spool: Optional[SegmentedSpool] = None
+        self._spool_pending = False
+        self._db_down_until = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def blocking(self) -> bool:
+        """Whether `submit` may wait for queue space and must stay off the event loop."""
+        return self.overflow_policy == AUDIT_OVERFLOW_BLOCK
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        if self.spool_dir and self.spool is None:
+            self.spool = SegmentedSpool(self.spool_dir, self.spool_segment_bytes)
+            # Segments left behind by processes that are gone
+            self._spool_pending = self.spool.has_pending()
+
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush everything still queued and stop the worker."""
+        if self._thread is None:
+            return
+
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+
+    def submit(self, payload: ApiLogCreate) -> bool:
+        """Enqueue a record, applying the overflow policy. Returns False when it was shed."""
+        if self.overflow_policy == AUDIT_OVERFLOW_SAMPLE:
+            if self.queue.qsize() >= self.queue_size * AUDIT_SAMPLE_HIGH_WATERMARK:
+                if random.random() >= self.sample_rate:
+                    self.dropped += 1
+                    return False
+
+        try:
+            if self.overflow_policy == AUDIT_OVERFLOW_BLOCK:
+                self.queue.put(payload, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(payload)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        return True
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            batch: List[ApiLogCreate] = []
+
+            # Wait for the first record, then keep collecting until the batch
+            # is full or the flush interval has elapsed. Idle time is used to
+            # replay the spool.
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._replay()
+                continue
+
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    running = False
+                    break
+
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if not running:
+                batch.extend(self._drain())
+
+            self._flush(batch)
+            self._replay()
+
+    def _drain(self) -> List[ApiLogCreate]:
+        items = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return items
+
+            if item is not _STOP:
+                items.append(item)
+
+    def _db_available(self) -> bool:
+        return time.monotonic() >= self._db_down_until
+
+    def _mark_db_down(self, err: Exception) -> None:
+        logger.warning(f"audit writer: database unavailable, spooling records: {err}")
+        self._db_down_until = time.monotonic() + self.db_retry_interval
+
+    def _flush(self, batch: List[ApiLogCreate]) -> None:
+        rows = self.log_repo.build_rows(batch)
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            if self._db_available():
+                try:
+                    self.written += self.log_repo.insert_rows(chunk)
+                    continue
+                except Exception as err:
+                    self._mark_db_down(err)
+
+            self._spool_rows(chunk)
+
+    @staticmethod
+    def _encode_row(row: dict) -> bytes:
+        return json.dumps({**row, "created_at": row["created_at"].isoformat()}).encode()
+
+    @staticmethod
+    def _decode_row(record: bytes) -> dict:
+        row = json.loads(record)
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+        # Spooled before perf_logs had the SQL timing columns
+        for key in ("db_queries", "db_duration", "db_slowest_duration", "db_slowest_statement"):
+            row.setdefault(key, None)
+        return row
+
+    def _spool_rows(self, rows: List[dict]) -> None:
+        if self.spool is None:
+            self.dropped += len(rows)
+            return
+
+        try:
+            self.spool.append([self._encode_row(row) for row in rows])
+            self.spooled += len(rows)
+            self._spool_pending = True
+        except OSError as err:
+            self.dropped += len(rows)
+            logger.error(f"audit writer: cannot write spool: {err}")
+
+    def _replay(self) -> None:
+        """Load one spooled segment into perf_logs, if the database is back."""
+        if not self._spool_pending or not self._db_available():
+            return
+
+        self.spool.seal()
+        segments = self.spool.sealed_segments()
+        if not segments:
+            self._spool_pending = False
+            return
+
+        path = segments[0]
+        try:
+            rows = [self._decode_row(record) for record in self.spool.read(path)]
+            self.replayed += self.log_repo.insert_rows(rows)
+        except (OperationalError, InterfaceError) as err:
+            self._mark_db_down(err)
+            return
+        except Exception as err:
+            # Not a connectivity problem, retrying will not help
+            logger.error(f"audit writer: rejecting spool segment {path}: {err}")
+            self.spool.reject(path)
+            return
+
+        self.spool.remove(path)
+        logger.info(f"audit writer: replayed {len(rows)} records from {path}")
+
+
+class ApiLogService:
+    def __init__(self) -> None:
+        self.log_repo = ApiLogRepository()
+
+    def search(self, filter: ApiLogFilter) -> Tuple[List[ApiLogRead], Optional[str]]:
+        if not 0 < filter.limit <= MAX_PERF_LOGS_PAGE_LIMIT:
+            raise UnprocessableException(f"limit must be between 1 and {MAX_PERF_LOGS_PAGE_LIMIT}")
+
+        logs = self.log_repo.search(filter)
+
+        next_cursor = None
+        if len(logs) > filter.limit:
+            logs = logs[:filter.limit]
+            next_cursor = encode_cursor(logs[-1].created_at, logs[-1].id)
+
+        return logs, next_cursor
+
+
+audit_writer = AuditWriter()
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from dateutil.relativedelta import relativedelta
+
+from app.core.config import settings
+from app.core.constants.audit import PERF_LOGS_PARTITION_DAY, PERF_LOGS_PARTITION_MONTH
+from app.repositories.audit_partition import AuditPartitionRepository
+from app.utils.date import get_naive_now
+from app.utils.logger import logger
+
+
+class AuditPartitionService:
+    """
+    Keeps the range partitions of perf_logs ahead of the clock and drops the
+    expired ones. Retention is a DETACH + DROP of whole partitions, so it
+    costs a catalog update instead of a DELETE over the table.
+    """
+
+    def __init__(
+        self,
+        interval: str = settings.perf_logs_partition_interval,
+        premake: int = settings.perf_logs_partition_premake,
+        retention_days: int = settings.perf_logs_retention_days,
+    ) -> None:
+        if interval not in (PERF_LOGS_PARTITION_DAY, PERF_LOGS_PARTITION_MONTH):
+            raise ValueError(f"unknown perf_logs partition interval: {interval}")
+
+        self.partition_repo = AuditPartitionRepository()
+        self.interval = interval
+        self.premake = premake
+        self.retention_days = retention_days
+
+    def period_bounds(self, moment: datetime) -> Tuple[datetime, datetime]:
+        start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.interval == PERF_LOGS_PARTITION_DAY:
+            return start, start + timedelta(days=1)
+
+        start = start.replace(day=1)
+        return start, start + relativedelta(months=1)
+
+    def partition_name(self, lower: datetime) -> str:
+        return f"{self.partition_repo.table_name}_p{lower:%Y%m%d}"
+
+    def ensure_future_partitions(self, now: Optional[datetime] = None) -> List[str]:
+        """
+        Create partitions for the current period and the next `premake` ones,
+        and for past periods whose rows ended up in the DEFAULT partition.
+        """
+        now = now or get_naive_now()
+        partitions = self.partition_repo.list_partitions()
+        created = []
+
+        first = now
+        oldest = self.partition_repo.oldest_default_row()
+        if oldest is not None and oldest < first:
+            first = oldest
+            logger.warning(f"perf_logs rows since {oldest} are in the DEFAULT partition, moving them")
+
+        _, horizon = self.period_bounds(now)
+        for _ in range(self.premake):
+            _, horizon = self.period_bounds(horizon)
+
+        start, end = self.period_bounds(first)
+        while start < horizon:
+            lower, upper = start, end
+
+            # Clip against existing partitions, e.g. the converted legacy table
+            # or monthly partitions left over after switching to daily
+            for partition in partitions:
+                p_lower = partition.lower or datetime.min
+                p_upper = partition.upper or datetime.max
+                if p_lower <= lower < p_upper:
+                    lower = p_upper
+                elif lower < p_lower < upper:
+                    upper = p_lower
+
+            if lower < upper:
+                name = self.partition_name(lower)
+                self.partition_repo.create_partition(name, lower, upper)
+                created.append(name)
+                logger.info(f"created partition {name} [{lower}, {upper})")
+
+            start, end = self.period_bounds(end)
+
+        return created
+
+    def drop_expired_partitions(self, now: Optional[datetime] = None, detach_only: bool = False) -> List[str]:
+        """Detach (and unless `detach_only`, drop) partitions past the retention window."""
+        now = now or get_naive_now()
+        cutoff = now - timedelta(days=self.retention_days)
+        expired = []
+
+        for partition in self.partition_repo.list_partitions():
+            if partition.upper is None or partition.upper > cutoff:
+                continue
+
+            self.partition_repo.detach_partition(partition.name)
+            if not detach_only:
+                self.partition_repo.drop_partition(partition.name)
+
+            expired.append(partition.name)
+            logger.info(f"{'detached' if detach_only else 'dropped'} partition {partition.name}")
+
+        return expired
+
+    def maintain(self, now: Optional[datetime] = None, detach_only: bool = False) -> Tuple[List[str], List[str]]:
+        created = self.ensure_future_partitions(now)
+        expired = self.drop_expired_partitions(now, detach_only)
+        return created, expired
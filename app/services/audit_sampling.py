@@ -0,0 +1,76 @@
+import random
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.audit import AuditSamplingRule
+
+
+class SamplingDecision:
+    """
+    Sampling state for one request.
+
+    A single random draw is made up front. The request is kept if the first
+    rule whose conditions all match has `rate > draw`, so the body only needs
+    capturing when at least one candidate rule could still keep it.
+    """
+
+    __slots__ = ("candidates", "draw", "default_rate", "capture_body")
+
+    def __init__(self, candidates: Tuple[AuditSamplingRule, ...], draw: float, default_rate: float) -> None:
+        self.candidates = candidates
+        self.draw = draw
+        self.default_rate = default_rate
+        self.capture_body = self._may_keep()
+
+    def _may_keep(self) -> bool:
+        for rule in self.candidates:
+            if self.draw < rule.rate:
+                return True
+            if rule.status is None and rule.min_duration_ms is None:
+                # Unconditional rule: nothing after it can ever be reached
+                return False
+        return self.draw < self.default_rate
+
+    def keep(self, status: int, duration: float) -> bool:
+        if not self.capture_body:
+            return False
+
+        duration_ms = duration * 1000
+        status_code = str(status)
+        status_class = f"{status // 100}xx"
+
+        for rule in self.candidates:
+            if rule.status is not None and status_code not in rule.status and status_class not in rule.status:
+                continue
+            if rule.min_duration_ms is not None and duration_ms < rule.min_duration_ms:
+                continue
+            return self.draw < rule.rate
+
+        return self.draw < self.default_rate
+
+
+class AuditSamplingPolicy:
+    def __init__(
+        self,
+        rules: Optional[List[dict]] = None,
+        default_rate: float = settings.audit_default_sample_rate,
+    ) -> None:
+        rules = settings.audit_sampling_rules if rules is None else rules
+        self.rules = [AuditSamplingRule(**rule) for rule in rules]
+        self.default_rate = default_rate
+        self._candidates = lru_cache(maxsize=4096)(self._match)
+
+    def _match(self, method: str, path: str) -> Tuple[AuditSamplingRule, ...]:
+        """Rules whose path and method conditions match; status and latency are checked later."""
+        return tuple(
+            rule for rule in self.rules
+            if (rule.methods is None or method in rule.methods) and fnmatchcase(path, rule.path)
+        )
+
+    def begin(self, method: str, path: str) -> SamplingDecision:
+        return SamplingDecision(self._candidates(method, path), random.random(), self.default_rate)
+
+
+audit_sampling_policy = AuditSamplingPolicy()
@@ -1,36 +1,176 @@
+import asyncio
+import secrets
 from datetime import datetime, timedelta
-from jose import jwt
-from app.repositories.auth import AuthRepository
+from uuid import uuid4
+from typing import Optional
+from pytz import timezone
+from app.core.database import RequestSession
+from app.repositories.auth import AsyncAuthRepository, AuthRepository
+from app.repositories.base import select_repository
+from app.repositories.refresh_token import AsyncRefreshTokenRepository, RefreshTokenRepository
+from app.repositories.user import user_profile_cache
+from app.services.token import (
+    revoked_token_cache,
+    token_digest,
+    token_expires_at,
+    token_key,
+    verified_token_cache,
+)
 from app.utils.exception import UnauthorizedException
-from app.core.constants.auth import JWT_TOKEN_EXPIRE_IN_MIN
-from app.core.config import settings
+from app.utils.jwt_backend import jwt_backend
+from app.utils.password import password_hasher
+from app.core.constants.app import DEFAULT_TZ
+from app.core.constants.auth import (
+    JWT_API_TOKEN_EXPIRE_IN_MIN,
+    JWT_TOKEN_EXPIRE_IN_MIN,
+    LOGOUT_NOTHING_REVOKED,
+    LOGOUT_SESSION_REVOKED,
+    LOGOUT_TOKEN_REVOKED,
+    REFRESH_TOKEN_EXPIRE_IN_MIN,
+    TOKEN_TYPE_ACCESS,
+)
 from app.schemas.user_mgt import AuthUser
 import logging
 from sqlalchemy.orm import joinedload
 
 
 class AuthService:
-    def __init__(self) -> None:
-        self.auth_repo = AuthRepository()
+    # Strong references to in-flight rehash tasks, which outlive the request
+    _rehash_tasks = set()
 
-    def generate_token(self, identifier: str, password: str) -> str:
-        user = self.auth_repo.find_by_username_or_email(identifier)
-        if user is None or not self.auth_repo.verify_password(password, user.password):
+    def __init__(self, db: Optional[RequestSession] = None) -> None:
+        self.auth_repo = select_repository(AsyncAuthRepository, AuthRepository, db)
+        self.refresh_repo = select_repository(AsyncRefreshTokenRepository, RefreshTokenRepository, db)
+
+    async def generate_token(self, identifier: str, password: str) -> dict:
+        user = await self.auth_repo.find_by_username_or_email(identifier)
+        if user is None or not await password_hasher.verify(password, user.password):
             raise UnauthorizedException("Invalid credentials")
 
+        # Upgrade hashes below the current cost policy without delaying the login
+        if password_hasher.needs_update(user.password):
+            task = asyncio.create_task(self._rehash_password(user.id, user.password, password))
+            self._rehash_tasks.add(task)
+            task.add_done_callback(self._rehash_tasks.discard)
+
+        family_id = uuid4().hex
+        refresh_token = await self._new_refresh_token(user.id, family_id)
+        return self._token_pair(user, family_id, refresh_token)
+
+    async def refresh_token(self, refresh_token: str) -> dict:
+        """
+        Exchange a refresh token for a new access/refresh pair. Each refresh
+        token works once; presenting an already used one means it leaked, so
+        its whole family (every token descended from the login) is revoked.
+        """
+        old_hash = token_digest(refresh_token)
+        new_token = secrets.token_urlsafe(32)
+        expire = datetime.utcnow() + timedelta(minutes=REFRESH_TOKEN_EXPIRE_IN_MIN)
+
+        rotated = await self.refresh_repo.rotate(old_hash, token_digest(new_token), expire)
+        if rotated is None:
+            family_id = await self.refresh_repo.find_reused_family(old_hash)
+            if family_id is not None:
+                logging.warning(f"Refresh token reuse detected, revoking family {family_id}")
+                await self._revoke_family_now(family_id)
+            raise UnauthorizedException("Invalid refresh token")
+
+        user_id, family_id = rotated
+        user = await self.auth_repo.find_by_id(user_id)
+        if user is None:
+            await self._revoke_family_now(family_id)
+            raise UnauthorizedException("User not found")
+
+        return self._token_pair(user, family_id, new_token)
+
+    async def _revoke_family_now(self, family_id: str) -> None:
+        # Own transaction: the 401 that follows rolls back the request session
+        repo = select_repository(AsyncRefreshTokenRepository, RefreshTokenRepository)
+        await repo.revoke_family(family_id)
+
+    async def _new_refresh_token(self, user_id: int, family_id: str) -> str:
+        token = secrets.token_urlsafe(32)
+        expire = datetime.utcnow() + timedelta(minutes=REFRESH_TOKEN_EXPIRE_IN_MIN)
+        await self.refresh_repo.insert(token_digest(token), family_id, user_id, expire)
+        return token
+
+    def _token_pair(self, user, family_id: str, refresh_token: str) -> dict:
         expire = datetime.utcnow() + timedelta(minutes=JWT_TOKEN_EXPIRE_IN_MIN)
         encode = {
             "id": user.id,
             "full_name": user.full_name,
             "roles": [role.name for role in user.roles],
-            "exp": expire
+            "exp": expire,
+            "jti": uuid4().hex,
+            "type": TOKEN_TYPE_ACCESS,
+            # Lets logout revoke the session's refresh tokens
+            "fam": family_id,
+        }
+        return {
+            "access_token": jwt_backend.encode(encode),
+            "refresh_token": refresh_token,
+            "expires_in": JWT_TOKEN_EXPIRE_IN_MIN * 60,
         }
-        return jwt.encode(encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
-    def get_user_details(self, user_id: int) -> AuthUser:
+    async def _rehash_password(self, user_id: int, old_hash: str, password: str) -> None:
+        try:
+            new_hash = await password_hasher.hash(password)
+            # Runs after the response, so not on the (closed) request session
+            auth_repo = select_repository(AsyncAuthRepository, AuthRepository)
+            await auth_repo.replace_password_hash(user_id, old_hash, new_hash)
+        except Exception as e:
+            # Retried on the next login
+            logging.warning(f"Password rehash for user {user_id} failed: {e}")
+
+    def generate_api_token(self, auth_user: AuthUser) -> str:
+        # Gunakan zona waktu Indonesia
+        current_time = datetime.now(timezone(DEFAULT_TZ))
+        expire = current_time + timedelta(minutes=JWT_API_TOKEN_EXPIRE_IN_MIN)
+
+        # Generate payload menggunakan data dari `auth_user`
+        payload = {
+            "id": auth_user.id,
+            "full_name": auth_user.full_name,
+            "username": auth_user.username,
+            "email": auth_user.email,
+            "roles": auth_user.roles,
+            "exp": int(expire.timestamp()),  # Expiration as Unix timestamp
+            "expires": expire.isoformat(),   # ISO format for human-readable expiration
+            "jti": uuid4().hex,
+            "type": TOKEN_TYPE_ACCESS,
+        }
+
+        return jwt_backend.encode(payload)
+
+    async def revoke_token(self, token: str) -> str:
+        """
+        End what `token` grants; returns which LOGOUT_* outcome applied.
+        Access tokens stay valid until they expire (JWT_TOKEN_EXPIRE_IN_MIN),
+        API tokens as well (JWT_API_TOKEN_EXPIRE_IN_MIN): they cannot be
+        revoked earlier.
+        """
+        # Token sudah diverifikasi oleh JwtMiddleware
+        claims = jwt_backend.get_unverified_claims(token)
+        verified_token_cache.delete(token_digest(token))
+        if claims.get("type") != TOKEN_TYPE_ACCESS:
+            await revoked_token_cache.revoke(token_key(token, claims), token_expires_at(claims))
+            return LOGOUT_TOKEN_REVOKED
+
+        # Short-lived and never looked up: end the session by revoking its
+        # refresh tokens, the access token simply runs out
+        if claims.get("fam"):
+            await self.refresh_repo.revoke_family(claims["fam"])
+            return LOGOUT_SESSION_REVOKED
+        return LOGOUT_NOTHING_REVOKED
+
+    async def get_user_details(self, user_id: int) -> AuthUser:
+        cached = user_profile_cache.get(user_id)
+        if cached is not None:
+            return cached
+
         try:
             # Panggil find_by_id tanpa .options(joinedload(User.roles))
-            user = self.auth_repo.find_by_id(user_id)
+            user = await self.auth_repo.find_by_id(user_id)
 
             if user is None:
                 raise UnauthorizedException("User not found")
@@ -46,6 +186,7 @@ class AuthService:
                 roles=[role.name for role in user.roles]  # Dapatkan nama roles
             )
             logging.info(f"User details: {user_data}")
+            user_profile_cache.set(user_id, user_data)
             return user_data
         except Exception as e:
             logging.error(f"Error in get_user_details: {e}")
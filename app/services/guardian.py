@@ -1,39 +1,49 @@
-from typing import List, Optional, Tuple
-from app.repositories.guardian import GuardianRepository
+from typing import Optional
+from app.core.constants.pagination import DEFAULT_COUNT_MODE
+from app.core.constants.search import DEFAULT_SEARCH_MODE
+from app.core.database import RequestSession
+from app.repositories.base import select_repository
+from app.repositories.guardian import AsyncGuardianRepository, GuardianRepository
 from app.models.guardian import Guardian
+from app.utils.pagination import Page
 
 class GuardianService:
-    def __init__(self) -> None:
-        self.guardian_repo = GuardianRepository()
+    def __init__(self, db: Optional[RequestSession] = None) -> None:
+        self.guardian_repo = select_repository(AsyncGuardianRepository, GuardianRepository, db)
 
-    def create(self, payload: dict) -> Guardian:
-        return self.guardian_repo.create(payload)
+    async def create(self, payload: dict) -> Guardian:
+        return await self.guardian_repo.create(payload)
 
-    def find_by_user_id(self, user_id: int) -> Guardian:
-        guardian = self.guardian_repo.find_by_user_id(user_id)
+    async def find_by_user_id(self, user_id: int) -> Guardian:
+        guardian = await self.guardian_repo.find_by_user_id(user_id)
         if not guardian:
             raise Exception("Guardian profile not found")
         return guardian
 
-    def update(self, user_id: int, payload: dict) -> Guardian:
-        guardian = self.guardian_repo.update(user_id, payload)
+    async def update(self, user_id: int, payload: dict) -> Guardian:
+        guardian = await self.guardian_repo.update(user_id, payload)
         if not guardian:
             raise Exception("Failed to update guardian profile")
         return guardian
 
-    def delete(self, user_id: int) -> bool:
-        if not self.guardian_repo.delete(user_id):
+    async def delete(self, user_id: int) -> bool:
+        if not await self.guardian_repo.delete(user_id):
             raise Exception("Failed to delete guardian profile")
         return True
 
-    def list(self, limit: int, page: int) -> Tuple[List[Guardian], int]:
-        offset = (page - 1) * limit
-        guardians = self.guardian_repo.list(limit, offset)
-        total = self.guardian_repo.count()
-        return guardians, total
-    
-    def list_all(self, limit: int, page: int, search: Optional[str] = None) -> Tuple[List[Guardian], int]:
-        offset = (page - 1) * limit
-        guardians = self.guardian_repo.list_all(limit, offset, search)
-        total = self.guardian_repo.count()  # Total tanpa filter, jika ingin total filtered tambahkan logika di repository
-        return guardians, total
+    async def list(
+        self, limit: int, page: int, count: str = DEFAULT_COUNT_MODE, cursor: Optional[str] = None
+    ) -> Page:
+        return await self.guardian_repo.list(limit, page, count, cursor)
+
+    async def list_all(
+        self,
+        limit: int,
+        page: int,
+        search: Optional[str] = None,
+        count: str = DEFAULT_COUNT_MODE,
+        cursor: Optional[str] = None,
+        search_mode: str = DEFAULT_SEARCH_MODE,
+    ) -> Page:
+        # Total of the filtered listing when searching
+        return await self.guardian_repo.list_all(limit, page, search, count, cursor, search_mode)
@@ -1,36 +1,43 @@
-from typing import List, Optional, Tuple
+from typing import Optional
+from app.core.constants.pagination import DEFAULT_COUNT_MODE
+from app.core.constants.search import DEFAULT_SEARCH_MODE
+from app.core.database import RequestSession
 from app.models.team import Team
-from app.repositories.team import TeamRepository
+from app.repositories.base import select_repository
+from app.repositories.team import AsyncTeamRepository, TeamRepository
+from app.utils.pagination import Page
 
 class TeamService:
-    def __init__(self) -> None:
-        self.team_repo = TeamRepository()
+    def __init__(self, db: Optional[RequestSession] = None) -> None:
+        self.team_repo = select_repository(AsyncTeamRepository, TeamRepository, db)
 
-    def create(self, payload: dict) -> Team:
-        return self.team_repo.create(payload)
+    async def create(self, payload: dict) -> Team:
+        return await self.team_repo.create(payload)
 
-    def find_by_id(self, team_id: int) -> Team:
-        team = self.team_repo.find_by_id(team_id)
+    async def find_by_id(self, team_id: int) -> Team:
+        team = await self.team_repo.find_by_id(team_id)
         if not team:
             raise Exception("Team not found")
         return team
 
-    def update(self, team_id: int, payload: dict) -> Team:
-        team = self.team_repo.update(team_id, payload)
+    async def update(self, team_id: int, payload: dict) -> Team:
+        team = await self.team_repo.update(team_id, payload)
         if not team:
             raise Exception("Failed to update team or team not found")
         return team
 
-    def delete(self, team_id: int) -> bool:
-        if not self.team_repo.delete(team_id):
+    async def delete(self, team_id: int) -> bool:
+        if not await self.team_repo.delete(team_id):
             raise Exception("Failed to delete team or team not found")
         return True
 
-    def list(self, limit: int = 20, page: int = 1, search: Optional[str] = None) -> Tuple[List[Team], int, int]:
-        teams = self.team_repo.list(limit, page, search)
-        total_rows = self.team_repo.count(search)
-        total_pages = (total_rows + limit - 1) // limit
-        return teams, total_rows, total_pages
-    
-
-
+    async def list(
+        self,
+        limit: int = 20,
+        page: int = 1,
+        search: Optional[str] = None,
+        count: str = DEFAULT_COUNT_MODE,
+        cursor: Optional[str] = None,
+        search_mode: str = DEFAULT_SEARCH_MODE,
+    ) -> Page:
+        return await self.team_repo.list(limit, page, search, count, cursor, search_mode)
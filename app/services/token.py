@@ -0,0 +1,130 @@
+import asyncio
+import contextlib
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.core.constants.auth import (
+    REVOKED_TOKEN_REFRESH_OVERLAP_SECONDS,
+    REVOKED_TOKEN_REFRESH_SECONDS,
+    VERIFIED_TOKEN_CACHE_SIZE,
+    VERIFIED_TOKEN_CACHE_TTL_SECONDS,
+)
+from app.repositories.base import select_repository
+from app.repositories.token import AsyncTokenRepository, TokenRepository
+from app.utils.cache import TTLCache
+from app.utils.exception import ServiceUnavailableException
+from app.utils.logger import logger
+
+
+def token_key(token: str, claims: dict) -> str:
+    """Revocation key of a token: its `jti`, or a SHA-256 of tokens issued without one."""
+    jti = claims.get("jti")
+    if jti:
+        return jti
+    return token_digest(token)
+
+
+def token_digest(token: str) -> str:
+    """Key of a raw bearer token in the verified-token cache."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_expires_at(claims: dict) -> datetime:
+    """`exp` claim as a naive UTC datetime, like RevokedToken.revoked_at."""
+    return datetime.utcfromtimestamp(claims["exp"])
+
+
+class RevokedTokenCache:
+    """
+    In-process map of revoked token keys to their expiry, so authentication
+    does not hit the database at all.
+
+    The map is loaded in full at startup and then refreshed incrementally by
+    a background task every `refresh_seconds`, reading revocations newer
+    than the last one seen (with some overlap for clock skew between
+    workers); expired entries are pruned at the same time. A failed load is
+    retried by the same task. Revocations made by this process are visible
+    immediately, those made by other workers after at most `refresh_seconds`.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = REVOKED_TOKEN_REFRESH_SECONDS,
+        overlap_seconds: float = REVOKED_TOKEN_REFRESH_OVERLAP_SECONDS,
+    ) -> None:
+        self.token_repo = select_repository(AsyncTokenRepository, TokenRepository)
+        self.refresh_seconds = refresh_seconds
+        self.overlap = timedelta(seconds=overlap_seconds)
+
+        self._revoked: Dict[str, datetime] = {}
+        self._last_seen: Optional[datetime] = None
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def _pull(self, since: Optional[datetime], revoked: Dict[str, datetime]) -> None:
+        for jti, expires_at, revoked_at in await self.token_repo.list_revoked_since(since):
+            revoked[jti] = expires_at
+            if self._last_seen is None or revoked_at > self._last_seen:
+                self._last_seen = revoked_at
+
+    def _prune(self) -> None:
+        now = datetime.utcnow()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+
+    async def load(self) -> None:
+        """Full load; raises if the database is unreachable."""
+        revoked: Dict[str, datetime] = {}
+        self._last_seen = None
+        await self._pull(None, revoked)
+        # Swapped in at once, so lookups never see a half-loaded map; keeps
+        # what this process revoked meanwhile
+        self._revoked = {**self._revoked, **revoked}
+        self._loaded = True
+
+    async def refresh(self) -> None:
+        """Incremental refresh; raises if the database is unreachable."""
+        since = self._last_seen - self.overlap if self._last_seen is not None else None
+        await self._pull(since, self._revoked)
+        self._prune()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                if self._loaded:
+                    await self.refresh()
+                else:
+                    await self.load()
+            except Exception as err:
+                logger.warning(f"revoked token cache refresh failed, serving stale data: {err}")
+
+    def start(self) -> None:
+        """Start the background refresh on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="revoked-token-refresh")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def is_revoked(self, jti: str) -> bool:
+        """Answered from memory only. Until the first load succeeded the answer is unknown: 503."""
+        if not self._loaded:
+            raise ServiceUnavailableException("Token revocation list is not loaded yet, please retry")
+        return jti in self._revoked
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        await self.token_repo.add_revoked_token(jti, expires_at)
+        self._revoked[jti] = expires_at
+
+
+revoked_token_cache = RevokedTokenCache()
+
+# token_digest -> (AuthUser, token_key) of tokens whose signature was checked
+verified_token_cache = TTLCache(VERIFIED_TOKEN_CACHE_SIZE, VERIFIED_TOKEN_CACHE_TTL_SECONDS)
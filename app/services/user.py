@@ -1,8 +1,10 @@
 from typing import List, Optional, Tuple
+from app.core.database import RequestSession
 from app.models.role import Role
 from app.models.user import User
-from app.repositories.role import RoleRepository
-from app.repositories.user import UserRepository
+from app.repositories.base import select_repository
+from app.repositories.role import AsyncRoleRepository, RoleRepository
+from app.repositories.user import AsyncUserRepository, UserRepository
 from app.schemas.user_mgt import UserCreate, UserUpdate, UserFilter, RegisterUpdate, PasswordUpdate
 
 from app.utils.exception import (
@@ -11,47 +13,52 @@ from app.utils.exception import (
     InternalErrorException,
 )
 from app.utils.logger import logger
+from app.utils.pagination import Page
+from app.utils.password import password_hasher
 
 class UserService:
-    def __init__(self) -> None:
-        self.role_repo = RoleRepository()
-        self.user_repo = UserRepository(user_repo=self, role_repo=self.role_repo)
+    def __init__(self, db: Optional[RequestSession] = None) -> None:
+        self.role_repo = select_repository(AsyncRoleRepository, RoleRepository, db)
+        self.user_repo = select_repository(
+            AsyncUserRepository,
+            lambda db: UserRepository(user_repo=self, role_repo=self.role_repo, db=db),
+            db,
+        )
 
 
-    def list(self, filter: Optional[UserFilter] = None) -> Tuple[List[User], int, int]:
+    async def list(self, filter: Optional[UserFilter] = None) -> Page:
         if filter is None:
             filter = UserFilter(limit=20, page=1)  # Default values if filter is not provided
 
-        # Get filtered users
-        users = self.user_repo.get_all_filtered(filter)
+        # Filtered users and their total, in one query
+        return await self.user_repo.get_all_filtered(filter)
 
-        # Count total rows
-        total_rows = self.user_repo.count_by_filter(filter)
 
-        # Calculate total pages
-        total_pages = (total_rows + filter.limit - 1) // filter.limit
 
-        return users, total_rows, total_pages
+    async def create(self, payload: UserCreate) -> User:
+        # Validate first so rejected requests never spend a bcrypt round
+        await self._check_create(payload)
+        password_hash = await password_hasher.hash(payload.password)
+        return await self._insert(payload, password_hash)
 
-
-
-    def create(self, payload: UserCreate) -> User:
-        is_username_exists = self.user_repo.is_username_used(payload.username)
+    async def _check_create(self, payload: UserCreate) -> None:
+        is_username_exists = await self.user_repo.is_username_used(payload.username)
         if is_username_exists:
             raise UnprocessableException("username already used")
 
 
         if payload.email is not None:
-            is_email_exists = self.user_repo.is_username_used(payload.email)
+            is_email_exists = await self.user_repo.is_username_used(payload.email)
             if is_email_exists:
                 raise UnprocessableException("email already used")
 
-        is_role_exists = self.role_repo.find_by_name(payload.role)
+        is_role_exists = await self.role_repo.find_by_name(payload.role)
         if not is_role_exists:
             raise NotFoundException("role does not exists")
 
+    async def _insert(self, payload: UserCreate, password_hash: str) -> User:
         try:
-            user = self.user_repo.insert(payload)
+            user = await self.user_repo.insert(payload, password_hash)
         except Exception as err:
             err_msg = str(err)
             logger.error(err_msg)
@@ -59,30 +66,40 @@ class UserService:
 
         return user
 
-    def update(self, user_id: int, payload: UserUpdate) -> User:
+    async def update(self, user_id: int, payload: UserUpdate) -> User:
+        await self._check_update(user_id, payload)
+
+        password_hash = None
+        if payload.password:
+            password_hash = await password_hasher.hash(payload.password)
+
+        return await self._update(user_id, payload, password_hash)
+
+    async def _check_update(self, user_id: int, payload: UserUpdate) -> None:
         # Check if user exists
-        user = self.user_repo.find_by_id(user_id)
+        user = await self.user_repo.find_by_id(user_id)
         if not user:
             raise NotFoundException("User not found")
 
         # Check username uniqueness if being updated
         if payload.username and payload.username != user.username:
-            if self.user_repo.is_username_used(payload.username, except_id=user_id):
+            if await self.user_repo.is_username_used(payload.username, except_id=user_id):
                 raise UnprocessableException("Username already used")
 
         # Check email uniqueness if being updated
         if payload.email and payload.email != user.email:
-            if self.user_repo.is_email_used(payload.email, except_id=user_id):
+            if await self.user_repo.is_email_used(payload.email, except_id=user_id):
                 raise UnprocessableException("Email already used")
 
         # Check role exists if being updated
         if payload.role:
-            role = self.role_repo.find_by_name(payload.role)
+            role = await self.role_repo.find_by_name(payload.role)
             if not role:
                 raise NotFoundException("Role does not exist")
 
+    async def _update(self, user_id: int, payload: UserUpdate, password_hash: Optional[str]) -> User:
         try:
-            updated_user = self.user_repo.update(user_id, payload)
+            updated_user = await self.user_repo.update(user_id, payload, password_hash)
             if not updated_user:
                 raise NotFoundException("Failed to update user")
             return updated_user
@@ -90,50 +107,29 @@ class UserService:
             logger.error(f"Error updating user: {str(err)}")
             raise InternalErrorException(f"Error updating user: {str(err)}")
 
-    def update_password(self, user_id: int, payload: PasswordUpdate) -> User:
-        user = self.user_repo.find_by_id(user_id)
-        if not user:
-            raise NotFoundException("User not found")
-
-        # Verify password confirmation
-        if payload.new_password != payload.confirm_password:
-            raise UnprocessableException("New password and confirmation do not match")
-
-        # Check if new password is same as current
-        if self.user_repo.verify_password(payload.new_password, user.password):
-            raise UnprocessableException("New password must be different from current password")
-
-        try:
-            updated_user = self.user_repo.update_password(user_id, payload.new_password)
-            if not updated_user:
-                raise NotFoundException("Failed to update password")
-            return updated_user
-        except Exception as err:
-            logger.error(f"Error updating password: {str(err)}")
-            raise InternalErrorException(f"Error updating password: {str(err)}")
-
-    def delete(self, user_id: int) -> bool:
-        user = self.user_repo.find_by_id(user_id)
+    async def delete(self, user_id: int) -> bool:
+        user = await self.user_repo.find_by_id(user_id)
         if not user:
             raise NotFoundException("User not found")
 
         try:
-            return self.user_repo.delete(user_id)
+            return await self.user_repo.delete(user_id)
         except Exception as err:
             logger.error(f"Error deleting user: {str(err)}")
             raise InternalErrorException(f"Error deleting user: {str(err)}")
 
-    def update_password(self, id: int, payload: RegisterUpdate) -> User:
-        userdetil = self.user_repo.find_by_id(id)
+    async def update_password(self, id: int, payload: RegisterUpdate) -> User:
+        userdetil = await self.user_repo.find_by_id(id)
         if not userdetil:
             raise UnprocessableException("username not found")
 
-        pass_is_same = self.user_repo.verify_password(payload.password, userdetil.password)
+        pass_is_same = await password_hasher.verify(payload.password, userdetil.password)
         if pass_is_same:
             raise UnprocessableException("Find another password")
 
+        password_hash = await password_hasher.hash(payload.password)
         try:
-            user = self.user_repo.update_password(id, payload)
+            user = await self.user_repo.update_password(id, password_hash)
         except Exception as err:
             err_msg = str(err)
             logger.error(err_msg)
@@ -144,20 +140,21 @@ class UserService:
 
         return user
     
-    def update_user_password(self, id: int, payload: PasswordUpdate) -> User:
-        userdetil = self.user_repo.find_by_id(id)
+    async def update_user_password(self, id: int, payload: PasswordUpdate) -> User:
+        userdetil = await self.user_repo.find_by_id(id)
         if not userdetil:
             raise UnprocessableException("username not found")
 
-        pass_is_same = self.user_repo.verify_password(payload.new_password, userdetil.password)
+        pass_is_same = await password_hasher.verify(payload.new_password, userdetil.password)
         if pass_is_same:
             raise UnprocessableException("Find another password")
 
         if payload.new_password != payload.confirm_password:
             raise UnprocessableException("password not same")   
          
+        password_hash = await password_hasher.hash(payload.new_password)
         try:
-            user = self.user_repo.update_user_password(id, payload)
+            user = await self.user_repo.update_user_password(id, password_hash)
         except Exception as err:
             err_msg = str(err)
             logger.error(err_msg)
@@ -10,6 +10,10 @@ def get_now() -> datetime:
     tz = pytz.timezone(DEFAULT_TZ)
     return datetime.now().replace(tzinfo=tz)
 
+def get_naive_now() -> datetime:
+    """Local wall-clock time without tzinfo, as stored by the DB server defaults."""
+    return datetime.now(pytz.timezone(DEFAULT_TZ)).replace(tzinfo=None)
+
 def get_age(b):
     tz = pytz.timezone(DEFAULT_TZ)
     return relativedelta(get_now(), b.replace(tzinfo=tz)).years
@@ -26,3 +26,8 @@ class InternalErrorException(CustomException):
 class UnauthorizedException(CustomException):
     def __init__(self, message):
         super().__init__(message, status.HTTP_401_UNAUTHORIZED)
+
+
+class ServiceUnavailableException(CustomException):
+    def __init__(self, message):
+        super().__init__(message, status.HTTP_503_SERVICE_UNAVAILABLE)
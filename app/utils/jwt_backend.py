@@ -0,0 +1,118 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import jwt as pyjwt
+from jose import jwt as jose_jwt, ExpiredSignatureError, JWTError
+
+from app.core.config import settings
+from app.core.constants.auth import JWT_BACKEND_JOSE, JWT_BACKEND_PYJWT
+
+ASYMMETRIC_ALGORITHM_PREFIXES = ("RS", "PS", "ES", "EdDSA")
+
+
+class InvalidTokenError(Exception):
+    """Token is malformed or its signature does not verify."""
+
+
+class TokenExpiredError(InvalidTokenError):
+    pass
+
+
+class JwtBackend(ABC):
+    """
+    Signs and verifies tokens with one algorithm. HMAC algorithms use the
+    shared secret; asymmetric ones sign with the private key and verify
+    with the public key (PEM).
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret: Optional[str] = None,
+        private_key: Optional[str] = None,
+        public_key: Optional[str] = None,
+    ) -> None:
+        self.algorithm = algorithm
+        if algorithm.startswith(ASYMMETRIC_ALGORITHM_PREFIXES):
+            if not private_key or not public_key:
+                raise ValueError(f"{algorithm} needs JWT_PRIVATE_KEY and JWT_PUBLIC_KEY")
+            self.signing_key = private_key
+            self.verifying_key = public_key
+        else:
+            self.signing_key = secret
+            self.verifying_key = secret
+
+    @abstractmethod
+    def encode(self, claims: dict) -> str:
+        ...
+
+    @abstractmethod
+    def decode(self, token: str) -> dict:
+        """Verified claims; raises TokenExpiredError or InvalidTokenError."""
+
+    @abstractmethod
+    def get_unverified_claims(self, token: str) -> dict:
+        ...
+
+
+class JoseBackend(JwtBackend):
+    def encode(self, claims: dict) -> str:
+        return jose_jwt.encode(claims, self.signing_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return jose_jwt.decode(token, self.verifying_key, algorithms=[self.algorithm])
+        except ExpiredSignatureError as err:
+            raise TokenExpiredError(str(err)) from err
+        except JWTError as err:
+            raise InvalidTokenError(str(err)) from err
+
+    def get_unverified_claims(self, token: str) -> dict:
+        return jose_jwt.get_unverified_claims(token)
+
+
+class PyJwtBackend(JwtBackend):
+    """PyJWT on top of `cryptography`; much faster than jose for EC keys."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Parse PEM keys once instead of on every call
+        if self.signing_key != self.verifying_key:
+            algorithm = pyjwt.get_algorithm_by_name(self.algorithm)
+            self.signing_key = algorithm.prepare_key(self.signing_key)
+            self.verifying_key = algorithm.prepare_key(self.verifying_key)
+
+    def encode(self, claims: dict) -> str:
+        return pyjwt.encode(claims, self.signing_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        try:
+            return pyjwt.decode(token, self.verifying_key, algorithms=[self.algorithm])
+        except pyjwt.ExpiredSignatureError as err:
+            raise TokenExpiredError(str(err)) from err
+        except pyjwt.InvalidTokenError as err:
+            raise InvalidTokenError(str(err)) from err
+
+    def get_unverified_claims(self, token: str) -> dict:
+        return pyjwt.decode(token, options={"verify_signature": False})
+
+
+JWT_BACKENDS = {
+    JWT_BACKEND_JOSE: JoseBackend,
+    JWT_BACKEND_PYJWT: PyJwtBackend,
+}
+
+
+def create_jwt_backend(
+    name: str = settings.jwt_backend,
+    algorithm: str = settings.jwt_algorithm,
+    secret: Optional[str] = settings.jwt_secret,
+    private_key: Optional[str] = settings.jwt_private_key,
+    public_key: Optional[str] = settings.jwt_public_key,
+) -> JwtBackend:
+    if name not in JWT_BACKENDS:
+        raise ValueError(f"unknown JWT backend: {name}")
+    return JWT_BACKENDS[name](algorithm, secret=secret, private_key=private_key, public_key=public_key)
+
+
+jwt_backend = create_jwt_backend()
@@ -0,0 +1,138 @@
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Log-linear buckets: every power of two is split into SUB_BUCKETS linear
+# steps, which keeps the relative error of a percentile under ~6%.
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+SLOT_SECONDS = 10
+WINDOWS = {"1m": 60, "5m": 300, "15m": 900}
+PERCENTILES = (50, 90, 95, 99)
+
+HistogramKey = Tuple[str, str, str]
+
+
+def bucket_index(value_us: int) -> int:
+    """Map a latency in microseconds to its log-linear bucket."""
+    if value_us < SUB_BUCKETS:
+        return max(value_us, 0)
+
+    exponent = value_us.bit_length() - 1 - SUB_BUCKET_BITS
+    sub = value_us >> exponent
+    return (exponent + 1) * SUB_BUCKETS + (sub - SUB_BUCKETS)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Largest microsecond value that falls into bucket `index`."""
+    if index < SUB_BUCKETS:
+        return index
+
+    exponent = index // SUB_BUCKETS - 1
+    sub = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((sub + 1) << exponent) - 1
+
+
+class _Slot:
+    __slots__ = ("epoch", "histograms")
+
+    def __init__(self, epoch: int) -> None:
+        self.epoch = epoch
+        self.histograms: Dict[HistogramKey, Dict[int, int]] = {}
+
+
+class LatencyHistogramStore:
+    """
+    Per-route latency histograms over sliding windows.
+
+    Time is split into SLOT_SECONDS slots held in a ring that covers the
+    largest window. Recording only increments a counter in the current slot;
+    the lock is taken when a slot is recycled or a new key appears.
+    """
+
+    def __init__(self, slot_seconds: int = SLOT_SECONDS, horizon_seconds: int = max(WINDOWS.values())) -> None:
+        self.slot_seconds = slot_seconds
+        self.size = math.ceil(horizon_seconds / slot_seconds)
+        self.slots: List[_Slot] = [_Slot(-1) for _ in range(self.size)]
+        self.lock = threading.Lock()
+
+    def _slot(self, epoch: int) -> _Slot:
+        slot = self.slots[epoch % self.size]
+        if slot.epoch != epoch:
+            with self.lock:
+                slot = self.slots[epoch % self.size]
+                if slot.epoch != epoch:
+                    slot = _Slot(epoch)
+                    self.slots[epoch % self.size] = slot
+        return slot
+
+    def record(self, route: str, method: str, status: int, duration: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        slot = self._slot(int(now // self.slot_seconds))
+        key = (route, method, f"{status // 100}xx")
+
+        histogram = slot.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = slot.histograms.setdefault(key, {})
+
+        index = bucket_index(int(duration * 1_000_000))
+        histogram[index] = histogram.get(index, 0) + 1
+
+    def merged(self, window_seconds: int, now: Optional[float] = None) -> Dict[HistogramKey, Dict[int, int]]:
+        now = time.time() if now is None else now
+        current = int(now // self.slot_seconds)
+        oldest = current - math.ceil(window_seconds / self.slot_seconds) + 1
+
+        merged: Dict[HistogramKey, Dict[int, int]] = {}
+        for slot in list(self.slots):
+            if not oldest <= slot.epoch <= current:
+                continue
+            for key, histogram in list(slot.histograms.items()):
+                target = merged.setdefault(key, {})
+                for index, count in list(histogram.items()):
+                    target[index] = target.get(index, 0) + count
+
+        return merged
+
+    @staticmethod
+    def summarize(histogram: Dict[int, int]) -> dict:
+        """Count, percentiles and max of a histogram, in milliseconds."""
+        total = sum(histogram.values())
+        summary = {"count": total}
+        indexes = sorted(histogram)
+
+        for percentile in PERCENTILES:
+            threshold = math.ceil(total * percentile / 100)
+            seen = 0
+            for index in indexes:
+                seen += histogram[index]
+                if seen >= threshold:
+                    summary[f"p{percentile}"] = bucket_upper_bound(index) / 1000
+                    break
+
+        summary["max"] = bucket_upper_bound(indexes[-1]) / 1000 if indexes else None
+        return summary
+
+    def snapshot(self, now: Optional[float] = None) -> List[dict]:
+        now = time.time() if now is None else now
+        per_window = {name: self.merged(seconds, now) for name, seconds in WINDOWS.items()}
+
+        keys = set()
+        for histograms in per_window.values():
+            keys.update(histograms)
+
+        result = []
+        for route, method, status in sorted(keys):
+            windows = {}
+            for name, histograms in per_window.items():
+                histogram = histograms.get((route, method, status))
+                windows[name] = self.summarize(histogram) if histogram else {"count": 0}
+            result.append({"route": route, "method": method, "status": status, "windows": windows})
+
+        return result
+
+
+latency_histograms = LatencyHistogramStore()
@@ -0,0 +1,134 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import ColumnElement, Select, TextClause, func, select, text, tuple_
+from sqlalchemy.engine import Dialect
+
+from app.core.constants.pagination import COUNT_ESTIMATED, COUNT_EXACT, COUNT_NONE
+from app.utils.exception import UnprocessableException
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque keyset cursor for the last row of a page ordered by (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise UnprocessableException("invalid cursor")
+
+
+class Page(NamedTuple):
+    """One page of a listing. total_rows is None when the count was skipped."""
+
+    rows: List[Any]
+    total_rows: Optional[int]
+    has_next: bool
+    limit: int
+    estimated: bool = False
+    next_cursor: Optional[str] = None
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        if self.total_rows is None:
+            return None
+        return (self.total_rows + self.limit - 1) // self.limit
+
+    @property
+    def count_mode(self) -> str:
+        """How total_rows was obtained; estimated falls back to exact for filtered listings."""
+        if self.estimated:
+            return COUNT_ESTIMATED
+        return COUNT_NONE if self.total_rows is None else COUNT_EXACT
+
+
+def newest_first(query: Select, cursor: Optional[str] = None) -> Select:
+    """
+    Order the entity `query` newest first on (created_at, id); with a cursor,
+    seek past it with a row-value comparison, which the (created_at, id)
+    indexes serve without reading the skipped rows.
+    """
+    entity = query.column_descriptions[0]["entity"]
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.filter(tuple_(entity.created_at, entity.id) < tuple_(created_at, id))
+    return query.order_by(entity.created_at.desc(), entity.id.desc())
+
+
+def next_cursor(rows: List[Any], has_next: bool) -> Optional[str]:
+    """Cursor of the page after `rows`, if there is one."""
+    if not has_next or not rows:
+        return None
+    return encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def with_total(query: Select) -> Select:
+    """
+    `query` with the number of rows it matches as an extra last column.
+    Window functions run before LIMIT/OFFSET, so every row of a page carries
+    the total of the whole listing: rows and total in one round trip.
+    """
+    return query.add_columns(func.count().over().label("total_rows"))
+
+
+def count_statement(query: Select) -> Select:
+    """Plain COUNT(*) of `query`, for pages past the end (no row to carry the total)."""
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+def explain_statement(query: Select, dialect: Dialect) -> TextClause:
+    """
+    EXPLAIN of `query` for the planner's row estimate. Bound values are
+    rendered inline, so only use it on queries without user input.
+    """
+    compiled = query.order_by(None).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    return text(f"EXPLAIN (FORMAT JSON) {compiled}")
+
+
+def plan_rows(plan: Any) -> int:
+    """Estimated row count of the top node of an EXPLAIN (FORMAT JSON) result."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def page_plan(
+    query: Select, limit: int, page: int, count: str, cursor: Optional[str], rank: Optional[ColumnElement] = None
+) -> Tuple[int, str, Select]:
+    """OFFSET, effective count mode and ordered statement of a paginate() call."""
+    if rank is not None:
+        # Best match first: a (created_at, id) cursor cannot seek in this order
+        if cursor:
+            raise UnprocessableException("cursor pagination is not available for ranked searches")
+        entity = query.column_descriptions[0]["entity"]
+        return (page - 1) * limit, count, query.order_by(rank.desc(), entity.id.desc())
+    if cursor:
+        # A window count past the cursor would only cover the rest of the
+        # listing: clients keep the total of their first page
+        return 0, COUNT_NONE if count == COUNT_EXACT else count, newest_first(query, cursor)
+    return (page - 1) * limit, count, newest_first(query)
+
+
+def partial_page(rows: list, limit: int, offset: int, estimate: Optional[int], keyset: bool = True) -> Page:
+    """Page of `rows` fetched with one extra row, with the planner's estimate if any."""
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    total = estimate
+    if estimate is not None and rows:
+        # Never below what this page proves exists (stale statistics)
+        total = max(estimate, offset + len(rows))
+    return Page(rows, total, has_next, limit, estimate is not None, next_cursor(rows, has_next and keyset))
+
+
+def counted_page(result: list, total: int, limit: int, offset: int, keyset: bool = True) -> Page:
+    """Page of (entity, window count) rows; `keyset` pages (newest first) get a next cursor."""
+    rows = [row[0] for row in result]
+    has_next = offset + len(rows) < total
+    return Page(rows, total, has_next, limit, next_cursor=next_cursor(rows, has_next and keyset))
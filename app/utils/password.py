@@ -0,0 +1,110 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from passlib.context import CryptContext
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+from app.core.constants.auth import BCRYPT_MAX_ROUNDS, BCRYPT_MIN_ROUNDS
+from app.utils.exception import ServiceUnavailableException
+from app.utils.logger import logger
+
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def calibrate_bcrypt_rounds(target_ms: float, samples: int = 3) -> int:
+    """Highest bcrypt cost whose hash takes at most `target_ms` on this host."""
+    handler = bcrypt.using(rounds=BCRYPT_MIN_ROUNDS)
+    elapsed_ms = math.inf
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration")
+        elapsed_ms = min(elapsed_ms, (time.perf_counter() - start) * 1000)
+
+    # Every extra round doubles the work
+    extra = math.floor(math.log2(target_ms / elapsed_ms)) if elapsed_ms < target_ms else 0
+    return max(BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, BCRYPT_MIN_ROUNDS + extra))
+
+
+def configure_password_hashing(
+    rounds: Optional[int] = settings.password_hash_rounds,
+    target_ms: int = settings.password_hash_target_ms,
+    min_rounds: int = settings.password_hash_min_rounds,
+) -> int:
+    """
+    Apply the bcrypt cost policy: new hashes use the configured rounds, or a
+    cost calibrated to `target_ms` per hash, never below `min_rounds`. Only
+    stored hashes below `min_rounds` report `needs_update` and are upgraded
+    on the user's next login.
+    """
+    if rounds is None:
+        rounds = calibrate_bcrypt_rounds(target_ms)
+    rounds = max(rounds, min_rounds)
+
+    bcrypt_context.update(bcrypt__rounds=rounds, bcrypt__min_rounds=min_rounds)
+    logger.info(f"password hashing: bcrypt rounds set to {rounds}, minimum {min_rounds}")
+    return rounds
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated thread pool so password work never occupies
+    the shared AnyIO threadpool that serves sync endpoints.
+
+    At most `max_pending` operations may be running or waiting at once; past
+    that callers get a ServiceUnavailableException (503) straight away
+    instead of queueing behind a login storm.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.password_hash_workers,
+        max_pending: int = settings.password_hash_max_pending,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.rejected = 0
+
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def _run(self, fn: Callable, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise ServiceUnavailableException("Too many concurrent password operations, please retry")
+            self._pending += 1
+
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(bcrypt_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(bcrypt_context.verify, plain_password, hashed_password)
+
+    def needs_update(self, hashed_password: str) -> bool:
+        """Whether a stored hash is weaker than the current policy (cheap, no hashing)."""
+        return bcrypt_context.needs_update(hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
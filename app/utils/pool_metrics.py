@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from app.utils.metrics import WINDOWS, LatencyHistogramStore
+
+
+class PoolMetrics:
+    """
+    Checkout latency and connection counters of one engine's pool.
+
+    Checkout latency is the time spent in Pool.connect(): waiting for a free
+    connection, opening a new one and the pre-ping, if enabled. Timeouts are
+    checkouts that gave up after pool_timeout, connect errors checkouts that
+    failed to open a connection (reported to `connect_error_listeners`).
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self.options: dict = {}
+        self.lock = threading.Lock()
+        self.latency = LatencyHistogramStore()
+
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connect_errors = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.connect_error_listeners: List[Callable[[Exception], None]] = []
+
+    def pool_class(self, base: Type[Pool]) -> Type[Pool]:
+        """Subclass of `base` that times every checkout."""
+        metrics = self
+
+        class InstrumentedPool(base):
+            def connect(self):
+                start = time.perf_counter()
+                try:
+                    return super().connect()
+                except exc.TimeoutError:
+                    with metrics.lock:
+                        metrics.timeouts += 1
+                    raise
+                except Exception as err:
+                    with metrics.lock:
+                        metrics.connect_errors += 1
+                    for listener in metrics.connect_error_listeners:
+                        listener(err)
+                    raise
+                finally:
+                    metrics.latency.record(metrics.name, "checkout", 200, time.perf_counter() - start)
+
+        InstrumentedPool.__name__ = InstrumentedPool.__qualname__ = f"Instrumented{base.__name__}"
+        return InstrumentedPool
+
+    def attach(self, engine: Engine, options: dict) -> None:
+        """Listen to the pool events of `engine` (the sync engine of an AsyncEngine)."""
+        self.engine = engine
+        self.options = options
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self.lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self.lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self.lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool if self.engine is not None else None
+        gauges = {"in_use": self.in_use, "peak_in_use": self.peak_in_use}
+        # QueuePool gauges; NullPool keeps no connections around
+        if pool is not None and hasattr(pool, "overflow"):
+            gauges.update(
+                size=pool.size(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+
+        latency: Dict[str, dict] = {}
+        for window, seconds in WINDOWS.items():
+            histogram = self.latency.merged(seconds).get((self.name, "checkout", "2xx"))
+            latency[window] = self.latency.summarize(histogram) if histogram else {"count": 0}
+
+        return {
+            "name": self.name,
+            "pool": type(pool).__name__ if pool is not None else None,
+            "options": self.options,
+            "gauges": gauges,
+            "counters": {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connect_errors": self.connect_errors,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            },
+            "checkout_latency_ms": latency,
+        }
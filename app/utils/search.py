@@ -0,0 +1,31 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import ColumnElement, String, func, literal, literal_column
+
+from app.core.constants.search import SEARCH_FULLTEXT, SEARCH_SIMILAR, SEARCH_TEXT_CONFIG
+
+
+def name_tsvector(column) -> ColumnElement:
+    """
+    to_tsvector() of a name column, exactly as the full-text indexes are
+    built: the configuration is inlined, a bound parameter would keep the
+    planner from matching the index expression.
+    """
+    return func.to_tsvector(literal_column(f"'{SEARCH_TEXT_CONFIG}'::regconfig"), column)
+
+
+def name_search(column, search: str, mode: str) -> Tuple[ColumnElement, Optional[ColumnElement]]:
+    """
+    WHERE clause matching `search` against the name `column`, and the rank
+    to order by, best match first (None: keep the listing order).
+    """
+    if mode == SEARCH_FULLTEXT:
+        tsquery = func.websearch_to_tsquery(literal_column(f"'{SEARCH_TEXT_CONFIG}'::regconfig"), search)
+        vector = name_tsvector(column)
+        return vector.op("@@")(tsquery), func.ts_rank(vector, tsquery)
+
+    if mode == SEARCH_SIMILAR:
+        # `q <% name`: some word of the name is similar to q
+        return literal(search, String).op("<%")(column), func.word_similarity(search, column)
+
+    return column.ilike(f"%{search}%"), None
@@ -0,0 +1,198 @@
+import fcntl
+import os
+import struct
+import uuid
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+_LENGTH = struct.Struct(">I")
+_SEGMENT_SUFFIX = ".seg"
+_REJECTED_SUFFIX = ".rejected"
+_LOCK_NAME = "owner.lock"
+
+
+def _try_lock(path: str, create: bool = False) -> Optional[int]:
+    """Open `path` and take an exclusive flock on it without waiting; None when another process holds it."""
+    fd = os.open(path, os.O_RDWR | (os.O_CREAT if create else 0), 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+class SegmentedSpool:
+    """
+    Append-only, segmented local spool of length-prefixed records.
+
+    Records are appended to the active segment and fsync'ed once per
+    `append` call, so a whole batch costs a single fsync. Segments are
+    rotated at `segment_bytes`; sealed segments are read back in order and
+    removed once their records are safely stored elsewhere. A torn record at
+    the end of a segment (crash mid-write) is ignored on read.
+
+    Every process writes to its own directory under `root`, owned through an
+    flock on its lock file for the lifetime of the process. Directories
+    whose lock can be taken belong to a process that is gone: they are
+    adopted and their segments replayed along with ours. The active segment
+    is flocked too, so a segment another process is still writing is never
+    read or removed.
+
+    Not thread-safe: it is meant to be owned by a single writer thread.
+    """
+
+    def __init__(self, root: str, segment_bytes: int) -> None:
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.directory = os.path.join(root, f"{os.getpid()}-{uuid.uuid4().hex[:12]}")
+        os.makedirs(self.directory)
+
+        self._lock = _try_lock(os.path.join(self.directory, _LOCK_NAME), create=True)
+        # Directories of dead processes we hold the lock of, with their lock fd
+        self._adopted: Dict[str, int] = {}
+        self._next_seq = self._claim_legacy()
+        self._active: Optional[BinaryIO] = None
+        self._active_path: Optional[str] = None
+
+    @staticmethod
+    def _segment_paths(directory: str) -> List[str]:
+        try:
+            names = sorted(n for n in os.listdir(directory) if n.endswith(_SEGMENT_SUFFIX))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(directory, n) for n in names]
+
+    def _claim_legacy(self) -> int:
+        """Move segments written straight into `root` (single-directory layout) into ours."""
+        seq = 0
+        for path in self._segment_paths(self.root):
+            try:
+                os.replace(path, os.path.join(self.directory, f"{seq:020d}{_SEGMENT_SUFFIX}"))
+                seq += 1
+            except FileNotFoundError:
+                # Claimed by another process starting at the same time
+                pass
+        return seq
+
+    @staticmethod
+    def _is_locked(path: str) -> bool:
+        """Whether another open file (normally a writer's active segment) holds the flock on `path`."""
+        try:
+            fd = _try_lock(path)
+        except FileNotFoundError:
+            return True
+        if fd is None:
+            return True
+        os.close(fd)
+        return False
+
+    def _adopt(self) -> None:
+        """Take over the directories of processes that exited without draining their spool."""
+        for name in os.listdir(self.root):
+            directory = os.path.join(self.root, name)
+            if directory == self.directory or directory in self._adopted or not os.path.isdir(directory):
+                continue
+
+            lock_path = os.path.join(directory, _LOCK_NAME)
+            try:
+                fd = _try_lock(lock_path)
+            except FileNotFoundError:
+                # Removed while we looked at it
+                continue
+            if fd is None:
+                continue
+            # The previous adopter may have released and unlinked it meanwhile
+            try:
+                unlinked = os.stat(lock_path).st_ino != os.fstat(fd).st_ino
+            except FileNotFoundError:
+                unlinked = True
+            if unlinked:
+                os.close(fd)
+                continue
+            self._adopted[directory] = fd
+
+    def _release(self, directory: str) -> None:
+        """Drop an adopted directory once its segments are gone; rejected ones keep it around."""
+        fd = self._adopted.pop(directory)
+        if not self._segment_paths(directory):
+            try:
+                os.remove(os.path.join(directory, _LOCK_NAME))
+                os.rmdir(directory)
+            except OSError:
+                pass
+        os.close(fd)
+
+    def _open_active(self) -> BinaryIO:
+        if self._active is None:
+            self._active_path = os.path.join(self.directory, f"{self._next_seq:020d}{_SEGMENT_SUFFIX}")
+            self._next_seq += 1
+            self._active = open(self._active_path, "ab")
+            fcntl.flock(self._active.fileno(), fcntl.LOCK_EX)
+        return self._active
+
+    def append(self, records: List[bytes]) -> None:
+        if not records:
+            return
+
+        active = self._open_active()
+        active.write(b"".join(_LENGTH.pack(len(record)) + record for record in records))
+        active.flush()
+        os.fsync(active.fileno())
+
+        if active.tell() >= self.segment_bytes:
+            self.seal()
+
+    def seal(self) -> None:
+        """Close the active segment so it becomes available for replay."""
+        if self._active is not None:
+            self._active.close()
+            self._active = None
+            self._active_path = None
+
+    def close(self) -> None:
+        """Seal, give up our directory (removed when empty) and the adopted ones."""
+        self.seal()
+        for directory in list(self._adopted):
+            self._release(directory)
+        if self._lock is not None:
+            if not self._segment_paths(self.directory):
+                try:
+                    os.remove(os.path.join(self.directory, _LOCK_NAME))
+                    os.rmdir(self.directory)
+                except OSError:
+                    pass
+            os.close(self._lock)
+            self._lock = None
+
+    def sealed_segments(self) -> List[str]:
+        """Sealed segments of our directory, then of adopted ones; locked segments are skipped."""
+        self._adopt()
+        for directory in [d for d in self._adopted if not self._segment_paths(d)]:
+            self._release(directory)
+
+        paths = self._segment_paths(self.directory)
+        for directory in self._adopted:
+            paths.extend(self._segment_paths(directory))
+        return [path for path in paths if path != self._active_path and not self._is_locked(path)]
+
+    def has_pending(self) -> bool:
+        return bool(self.sealed_segments()) or self._active is not None
+
+    def read(self, path: str) -> Iterator[bytes]:
+        with open(path, "rb") as segment:
+            while True:
+                header = segment.read(_LENGTH.size)
+                if len(header) < _LENGTH.size:
+                    return
+                (length,) = _LENGTH.unpack(header)
+                record = segment.read(length)
+                if len(record) < length:
+                    return
+                yield record
+
+    def remove(self, path: str) -> None:
+        os.remove(path)
+
+    def reject(self, path: str) -> None:
+        """Keep a segment that cannot be replayed out of the replay queue, for manual inspection."""
+        os.replace(path, path + _REJECTED_SUFFIX)
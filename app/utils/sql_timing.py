@@ -0,0 +1,77 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.constants.audit import SQL_TIMING_STATEMENT_MAX_CHARS
+
+
+class QueryStats:
+    """
+    SQL statements run on behalf of one request: count, total time and the
+    slowest one. Sync handlers run their queries on threadpool threads,
+    which see the same object through the copied context, hence the lock.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, duration: float) -> None:
+        with self.lock:
+            self.queries += 1
+            self.duration += duration
+            if duration > self.slowest_duration:
+                self.slowest_duration = duration
+                self.slowest_statement = statement
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value: DB time, slowest statement and the rest (app)."""
+        with self.lock:
+            return (
+                f'db;dur={self.duration * 1000:.2f};desc="{self.queries} queries", '
+                f"db-slowest;dur={self.slowest_duration * 1000:.2f}, "
+                f"app;dur={max(total - self.duration, 0) * 1000:.2f}"
+            )
+
+
+# Stats of the request being served; None outside requests (scripts,
+# background workers), where statements are not tracked
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements run in this context (and the threads it hands work to)."""
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and current_query_stats.get() is not None:
+        context._sql_timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = current_query_stats.get()
+    start = getattr(context, "_sql_timing_start", None)
+    if stats is not None and start is not None:
+        # The statement text only, never its parameters
+        stats.record(statement[:SQL_TIMING_STATEMENT_MAX_CHARS], time.perf_counter() - start)
+
+
+def instrument(engine: Engine) -> None:
+    """Time every statement of `engine` (the sync engine of an AsyncEngine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -4,7 +4,12 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.middleware.log import LogMiddleware
+from app.middleware.replica import ReadYourWritesMiddleware
+from app.services.audit import audit_writer
+from app.services.token import revoked_token_cache
 from app.utils.exception import CustomException
+from app.utils.logger import logger
+from app.utils.password import configure_password_hashing, password_hasher
 
 from app.api.test import router as router_health
 from app.api.v1 import router as v1_router
@@ -17,6 +22,43 @@ app = FastAPI(
 )
 
 
+@app.on_event("startup")
+def start_audit_writer():
+    audit_writer.start()
+
+
+@app.on_event("startup")
+def calibrate_password_hashing():
+    configure_password_hashing()
+
+
+@app.on_event("startup")
+async def start_revoked_tokens():
+    # Load before serving; on failure the refresh task keeps retrying and
+    # revocation checks answer 503 until it succeeds
+    try:
+        await revoked_token_cache.load()
+    except Exception as err:
+        logger.warning(f"could not load revoked tokens: {err}")
+    revoked_token_cache.start()
+
+
+@app.on_event("shutdown")
+def stop_audit_writer():
+    # Flush queued audit records before the worker process exits
+    audit_writer.stop()
+
+
+@app.on_event("shutdown")
+async def stop_revoked_tokens():
+    await revoked_token_cache.stop()
+
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    password_hasher.shutdown()
+
+
 @app.exception_handler(CustomException)
 def custom_exception_handler(request: Request, exc: CustomException):
     return JSONResponse(status_code=exc.status, content={"detail": exc.message})
@@ -32,5 +74,7 @@ app.add_middleware(
 
 app.add_middleware(LogMiddleware)
 
+app.add_middleware(ReadYourWritesMiddleware)
+
 app.include_router(router_health, prefix="/api")
 app.include_router(v1_router, prefix="/api")
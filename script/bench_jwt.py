@@ -0,0 +1,68 @@
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+sys.path.append('')
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+parser = argparse.ArgumentParser(description='Compare JWT encode/decode throughput of the available backends.')
+parser.add_argument('--seconds', type=float, default=1.0, help='Time spent on each measurement.')
+args = parser.parse_args()
+
+from app.utils.jwt_backend import JWT_BACKENDS
+
+
+def pem_pair(private_key):
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+def ops_per_second(fn, seconds):
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        fn()
+        count += 1
+    return count / seconds
+
+
+claims = {
+    'id': 1,
+    'full_name': 'Benchmark User',
+    'roles': ['ADMIN'],
+    'exp': datetime.utcnow() + timedelta(hours=1),
+    'jti': uuid4().hex,
+}
+
+keys = {
+    'HS256': {'secret': uuid4().hex},
+    'ES256': dict(zip(('private_key', 'public_key'), pem_pair(ec.generate_private_key(ec.SECP256R1())))),
+    'EdDSA': dict(zip(('private_key', 'public_key'), pem_pair(ed25519.Ed25519PrivateKey.generate()))),
+}
+
+print(f"{'algorithm':<10}{'backend':<8}{'encode/s':>12}{'decode/s':>12}")
+for algorithm, key in keys.items():
+    for name, backend_class in JWT_BACKENDS.items():
+        try:
+            backend = backend_class(algorithm, **key)
+            token = backend.encode(claims)
+            backend.decode(token)
+        except Exception as err:
+            print(f"{algorithm:<10}{name:<8}  unsupported: {err}")
+            continue
+
+        encode_rate = ops_per_second(lambda: backend.encode(claims), args.seconds)
+        decode_rate = ops_per_second(lambda: backend.decode(token), args.seconds)
+        print(f"{algorithm:<10}{name:<8}{encode_rate:>12,.0f}{decode_rate:>12,.0f}")
@@ -0,0 +1,87 @@
+import argparse
+import statistics
+import sys
+import time
+
+sys.path.append('')
+
+parser = argparse.ArgumentParser(
+    description='Compare OFFSET and keyset (cursor) pages of the team listing from page 1 to deep pages. '
+                'Seeds temporary teams, removed again at the end.'
+)
+parser.add_argument('--rows', type=int, default=200_100, help='Teams to seed; page 10,000 of 20 needs 200,000.')
+parser.add_argument('--limit', type=int, default=20, help='Page size.')
+parser.add_argument('--pages', default='1,10,100,1000,10000', help='Comma separated pages to measure.')
+parser.add_argument('--repeat', type=int, default=20, help='Measurements per page; the median is reported.')
+args = parser.parse_args()
+
+from sqlalchemy import text
+
+from app.core.constants.pagination import COUNT_EXACT, COUNT_NONE
+from app.core.database import get_session
+from app.models.team import Team
+from app.repositories.team import TeamRepository
+from app.utils.pagination import encode_cursor
+
+PREFIX = 'bench-pagination-'
+
+
+def seed() -> None:
+    with get_session() as db:
+        db.execute(
+            text(
+                "INSERT INTO teams (team_name, created_at) "
+                "SELECT :prefix || n, timezone('UTC', now()) - n * interval '1 second' "
+                "FROM generate_series(1, :rows) AS n"
+            ),
+            {'prefix': PREFIX, 'rows': args.rows},
+        )
+    with get_session() as db:
+        db.execute(text('ANALYZE teams'))
+
+
+def cleanup() -> None:
+    with get_session() as db:
+        db.execute(text('DELETE FROM teams WHERE team_name LIKE :prefix'), {'prefix': PREFIX + '%'})
+
+
+def cursor_before(page: int) -> str:
+    """Cursor a client holds after walking to `page` (the last row of the page before)."""
+    with get_session() as db:
+        row = (
+            db.query(Team.created_at, Team.id)
+            .filter(Team.deleted_at.is_(None))
+            .order_by(Team.created_at.desc(), Team.id.desc())
+            .offset((page - 1) * args.limit - 1)
+            .limit(1)
+            .one()
+        )
+    return encode_cursor(row.created_at, row.id)
+
+
+def median_ms(fn) -> float:
+    fn()
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    repo = TeamRepository()
+    seed()
+    try:
+        print(f"{'page':>8} {'offset+exact':>14} {'offset+none':>13} {'cursor':>10}  (median ms, limit {args.limit})")
+        for page in (int(page) for page in args.pages.split(',')):
+            cursor = cursor_before(page) if page > 1 else None
+            offset_exact = median_ms(lambda: repo.list(args.limit, page, None, COUNT_EXACT))
+            offset_none = median_ms(lambda: repo.list(args.limit, page, None, COUNT_NONE))
+            keyset = median_ms(lambda: repo.list(args.limit, 1, None, COUNT_NONE, cursor))
+            print(f'{page:>8} {offset_exact:>14.2f} {offset_none:>13.2f} {keyset:>10.2f}')
+    finally:
+        cleanup()
+
+
+main()
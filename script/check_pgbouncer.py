@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+sys.path.append('')
+
+parser = argparse.ArgumentParser(
+    description='Run the repositories through PgBouncer (transaction pooling) with DATABASE_MODE=pgbouncer '
+                'and DATABASE_URI pointing at PgBouncer, e.g. the pgbouncer_soccer service of docker-compose.'
+)
+parser.add_argument('--concurrency', type=int, default=50, help='Concurrent clients; keep it above the PgBouncer default_pool_size.')
+parser.add_argument('--rounds', type=int, default=20, help='Repository round trips per client.')
+args = parser.parse_args()
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.constants.database import DB_MODE_PGBOUNCER
+from app.core.database import AsyncSessionLocal, SessionLocal, engine
+from app.repositories.auth import AsyncAuthRepository, AuthRepository
+from app.repositories.role import AsyncRoleRepository, RoleRepository
+from app.repositories.team import AsyncTeamRepository, TeamRepository
+from app.repositories.token import AsyncTokenRepository, TokenRepository
+
+if settings.database_mode != DB_MODE_PGBOUNCER:
+    sys.exit('Set DATABASE_MODE=pgbouncer to run this check.')
+
+
+async def async_client(client: int) -> None:
+    # One session, many transactions: each may land on another server connection
+    async with AsyncSessionLocal() as db:
+        roles = AsyncRoleRepository(db)
+        teams = AsyncTeamRepository(db)
+        auth = AsyncAuthRepository(db)
+        tokens = AsyncTokenRepository(db)
+        for round in range(args.rounds):
+            team = await teams.create({'team_name': f'pgbouncer-{uuid4().hex[:12]}', 'coach_name': 'check'})
+            await teams.update(team.id, {'coach_name': f'check {client}/{round}'})
+            await roles.get_all()
+            await auth.find_by_username_or_email(f'nobody-{client}')
+            await tokens.is_token_revoked(uuid4().hex)
+            await teams.delete(team.id)
+            # Ends the transaction without leaving check data behind
+            await db.rollback()
+
+
+def sync_client(client: int) -> None:
+    with SessionLocal() as db:
+        roles = RoleRepository(db)
+        teams = TeamRepository(db)
+        auth = AuthRepository(db)
+        tokens = TokenRepository(db)
+        for round in range(args.rounds):
+            team = teams.create({'team_name': f'pgbouncer-{uuid4().hex[:12]}', 'coach_name': 'check'})
+            teams.update(team.id, {'coach_name': f'check {client}/{round}'})
+            roles.get_all()
+            auth.find_by_username_or_email(f'nobody-{client}')
+            tokens.is_token_revoked(uuid4().hex)
+            teams.delete(team.id)
+            db.rollback()
+
+
+def backend_pids() -> set:
+    """Server pids seen by one client connection across transactions."""
+    pids = set()
+    with engine.connect() as connection:
+        for _ in range(args.concurrency):
+            pids.add(connection.execute(text('SELECT pg_backend_pid()')).scalar())
+            connection.commit()
+    return pids
+
+
+async def main() -> int:
+    failures = 0
+
+    if AsyncSessionLocal is not None:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(async_client(i) for i in range(args.concurrency)), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        failures += len(errors)
+        print(f'async repositories: {args.concurrency - len(errors)}/{args.concurrency} clients ok in {time.perf_counter() - started:.2f}s')
+        for error in errors[:5]:
+            print(f'  {type(error).__name__}: {error}')
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(args.concurrency, 32)) as executor:
+        futures = [executor.submit(sync_client, i) for i in range(args.concurrency)]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    failures += len(errors)
+    print(f'sync repositories: {args.concurrency - len(errors)}/{args.concurrency} clients ok in {time.perf_counter() - started:.2f}s')
+    for error in errors[:5]:
+        print(f'  {type(error).__name__}: {error}')
+
+    pids = backend_pids()
+    if len(pids) == 1:
+        print('warning: every transaction ran on the same server connection; is PgBouncer in pool_mode=transaction?')
+    else:
+        print(f'transactions of one client connection ran on {len(pids)} server connections')
+
+    return 1 if failures else 0
+
+
+sys.exit(asyncio.run(main()))
@@ -0,0 +1,209 @@
+import argparse
+import json
+import sys
+from typing import Callable, List, Tuple
+
+sys.path.append('')
+
+parser = argparse.ArgumentParser(
+    description='EXPLAIN every query the repositories run against seeded data and fail on sequential scans '
+                'of large tables. Seeds inside a transaction that is rolled back: nothing is left behind.'
+)
+parser.add_argument('--rows', type=int, default=100_000, help='Users, teams and guardians to seed.')
+parser.add_argument('--large', type=int, default=10_000, help='Tables with at least this many rows must not be scanned.')
+args = parser.parse_args()
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.constants.pagination import COUNT_EXACT, COUNT_NONE
+from app.core.constants.search import SEARCH_CONTAINS, SEARCH_FULLTEXT, SEARCH_SIMILAR
+from app.core.database import engine
+from app.models.team import Team
+from app.repositories.auth import AuthRepository
+from app.repositories.guardian import GuardianRepository
+from app.repositories.role import RoleRepository
+from app.repositories.team import TeamRepository
+from app.repositories.user import UserRepository
+from app.schemas.user_mgt import UserFilter, UserUpdate
+
+# Every seeded user has a role, a player and a guardian profile; every
+# tenth an official one. Players and officials are spread over the teams,
+# one in ten users and teams is soft deleted.
+SEED = [
+    "INSERT INTO roles (name) VALUES ('plan-check')",
+    "INSERT INTO users (full_name, username, password, email, created_at, deleted_at) "
+    "SELECT 'Plan Check ' || n || ' ' || md5(n::text), 'plan_check_' || n, 'x', 'plan_check_' || n || '@example.com', "
+    "timezone('UTC', now()) - n * interval '1 second', "
+    "CASE WHEN n % 10 = 0 THEN timezone('UTC', now()) END "
+    "FROM generate_series(1, :rows) AS n",
+    "INSERT INTO user_roles (user_id, role_id) "
+    "SELECT u.id, r.id FROM users u, roles r WHERE u.username LIKE 'plan\\_check\\_%' AND r.name = 'plan-check'",
+    "INSERT INTO teams (team_name, coach_name, created_at, deleted_at) "
+    "SELECT 'Plan Check FC ' || n || ' ' || md5(n::text), 'Coach ' || n, timezone('UTC', now()) - n * interval '1 second', "
+    "CASE WHEN n % 10 = 0 THEN timezone('UTC', now()) END "
+    "FROM generate_series(1, :rows) AS n",
+    "INSERT INTO guardians (user_id, name, kartu_keluarga, ktp, created_at) "
+    "SELECT id, full_name, md5(username), md5(email), created_at FROM users WHERE username LIKE 'plan\\_check\\_%'",
+    "INSERT INTO players (user_id, name, position) "
+    "SELECT id, full_name, 'MF' FROM users WHERE username LIKE 'plan\\_check\\_%'",
+    "INSERT INTO officials (user_id, name, position) "
+    "SELECT id, full_name, 'Coach' FROM users WHERE username LIKE 'plan\\_check\\_%' AND id % 10 = 0",
+    "INSERT INTO team_players (team_id, player_id) "
+    "SELECT t.id, p.id FROM (SELECT id, row_number() OVER (ORDER BY id) AS n FROM players) p "
+    "JOIN (SELECT id, row_number() OVER (ORDER BY id) AS n FROM teams WHERE team_name LIKE 'Plan Check FC %') t "
+    "ON t.n = (p.n % :rows) + 1",
+    "INSERT INTO team_officials (team_id, official_id) "
+    "SELECT t.id, o.id FROM (SELECT id, row_number() OVER (ORDER BY id) AS n FROM officials) o "
+    "JOIN (SELECT id, row_number() OVER (ORDER BY id) AS n FROM teams WHERE team_name LIKE 'Plan Check FC %') t "
+    "ON t.n = (o.n % :rows) + 1",
+    "INSERT INTO guardian_players (guardian_id, player_id) "
+    "SELECT g.id, p.id FROM guardians g JOIN players p ON p.user_id = g.user_id",
+]
+
+ANALYZED = ["users", "user_roles", "roles", "teams", "guardians", "players", "officials",
+            "team_players", "team_officials", "guardian_players"]
+
+
+def seed(connection) -> None:
+    for statement in SEED:
+        connection.execute(text(statement), {'rows': args.rows})
+    for table in ANALYZED:
+        connection.execute(text(f'ANALYZE {table}'))
+
+
+def large_tables(connection) -> set:
+    return set(connection.execute(
+        text("SELECT relname FROM pg_class WHERE relkind IN ('r', 'p') AND reltuples >= :large "
+             "AND relnamespace = 'public'::regnamespace"),
+        {'large': args.large},
+    ).scalars())
+
+
+def seq_scans(plan: dict, large: set) -> List[str]:
+    """Large relations read by a Seq Scan anywhere in the plan tree."""
+    found = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') in large:
+        found.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        found.extend(seq_scans(child, large))
+    return found
+
+
+def checks(db: Session) -> List[Tuple[str, Callable[[], object]]]:
+    """Repository calls to check, bound to the seeded transaction."""
+    user_id, username, email = db.execute(text(
+        "SELECT id, username, email FROM users WHERE username = :username"
+    ), {'username': f'plan_check_{args.rows // 2 + 1}'}).one()
+    team_id = db.scalar(text("SELECT max(id) FROM teams WHERE deleted_at IS NULL"))
+
+    roles = RoleRepository(db)
+    users = UserRepository(None, roles, db)
+    auth = AuthRepository(db)
+    teams = TeamRepository(db)
+    guardians = GuardianRepository(db)
+    trigram = db.scalar(text("SELECT count(*) FROM pg_extension WHERE extname = 'pg_trgm'")) > 0
+
+    user_cursor = users.get_all_filtered(UserFilter(limit=20, count=COUNT_NONE)).next_cursor
+    team_cursor = teams.list(20, 1, None, COUNT_NONE).next_cursor
+    guardian_cursor = guardians.list_all(20, 1, None, COUNT_NONE).next_cursor
+
+    listed = [
+        ('user list, exact total', lambda: users.get_all_filtered(UserFilter(limit=20))),
+        ('user list, no total', lambda: users.get_all_filtered(UserFilter(limit=20, count=COUNT_NONE))),
+        ('user list, cursor', lambda: users.get_all_filtered(UserFilter(limit=20, cursor=user_cursor))),
+        ('user list, deep page', lambda: users.get_all_filtered(UserFilter(limit=20, page=50, count=COUNT_NONE))),
+        ('user search, fulltext', lambda: users.get_all_filtered(
+            UserFilter(search='check 4242', search_mode=SEARCH_FULLTEXT))),
+        ('team list, exact total', lambda: teams.list(20, 1, None, COUNT_EXACT)),
+        ('team list, cursor', lambda: teams.list(20, 1, None, COUNT_NONE, team_cursor)),
+        ('team search, fulltext', lambda: teams.list(20, 1, 'fc 4242', COUNT_EXACT, None, SEARCH_FULLTEXT)),
+        ('guardian list, exact total', lambda: guardians.list_all(20, 1)),
+        ('guardian list, cursor', lambda: guardians.list_all(20, 1, None, COUNT_NONE, guardian_cursor)),
+        ('guardian search, fulltext', lambda: guardians.list_all(20, 1, 'check 4242', search_mode=SEARCH_FULLTEXT)),
+    ]
+    if trigram:
+        listed += [
+            ('user search, contains', lambda: users.get_all_filtered(UserFilter(search='eck 4242'))),
+            ('team search, similar', lambda: teams.list(20, 1, 'fc 4242', COUNT_EXACT, None, SEARCH_SIMILAR)),
+            ('guardian search, contains', lambda: guardians.list_all(20, 1, 'eck 4242', search_mode=SEARCH_CONTAINS)),
+        ]
+    else:
+        print('pg_trgm is not installed: contains/similar searches are not checked')
+
+    return listed + [
+        ('user find_by_id', lambda: users.find_by_id(user_id)),
+        ('user find_by_username', lambda: users.find_by_username(username)),
+        ('user find_by_id_with_roles', lambda: users.find_by_id_with_roles(user_id)),
+        ('user is_username_used', lambda: users.is_username_used(username, user_id)),
+        ('user is_email_used', lambda: users.is_email_used(email, user_id)),
+        ('auth find_by_id', lambda: auth.find_by_id(user_id)),
+        ('auth find_by_username_or_email', lambda: auth.find_by_username_or_email(email)),
+        ('auth is_username_or_email_used', lambda: auth.is_username_or_email_used(username, email, user_id)),
+        ('role get_by_user_id', lambda: roles.get_by_user_id(user_id)),
+        ('user update with role', lambda: users.update(user_id, UserUpdate(full_name='Plan Check', role='plan-check'))),
+        ('user delete', lambda: users.delete(user_id)),
+        ('team find_by_id', lambda: teams.find_by_id(team_id)),
+        ('team players and officials', lambda: (
+            db.get(Team, team_id).team_players, db.get(Team, team_id).team_officials)),
+        ('team update', lambda: teams.update(team_id, {'coach_name': 'Plan Check'})),
+        ('team delete', lambda: teams.delete(team_id)),
+        ('guardian find_by_user_id', lambda: guardians.find_by_user_id(user_id)),
+        ('guardian players', lambda: guardians.find_by_user_id(user_id).guardian_players),
+    ]
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            print(f'seeding {args.rows} users, teams and guardians...')
+            seed(connection)
+            large = large_tables(connection)
+            print(f"large tables: {', '.join(sorted(large))}")
+
+            statements = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                if not executemany:
+                    statements.append((statement, parameters))
+
+            event.listen(connection, 'before_cursor_execute', capture)
+            db = Session(bind=connection, autoflush=False, expire_on_commit=False)
+            for label, call in checks(db):
+                statements.clear()
+                call()
+                db.flush()
+
+                scanned = []
+                for statement, parameters in statements:
+                    if statement.lstrip().upper().startswith(('EXPLAIN', 'ANALYZE')):
+                        continue
+                    # Raw cursor: not captured, and the statement is planned, never run
+                    cursor = connection.connection.dbapi_connection.cursor()
+                    cursor.execute(f'EXPLAIN (FORMAT JSON) {statement}', parameters or None)
+                    plan = cursor.fetchone()[0]
+                    cursor.close()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    for relation in seq_scans(plan[0]['Plan'], large):
+                        scanned.append((relation, statement))
+
+                if scanned:
+                    failures += 1
+                    print(f'FAIL {label}')
+                    for relation, statement in scanned:
+                        print(f"     Seq Scan on {relation}: {' '.join(statement.split())[:160]}")
+                else:
+                    print(f'ok   {label} ({len(statements)} statements)')
+            event.remove(connection, 'before_cursor_execute', capture)
+            db.close()
+        finally:
+            transaction.rollback()
+
+    print(f'{failures} queries scan large tables' if failures else 'no sequential scans of large tables')
+    return 1 if failures else 0
+
+
+sys.exit(main())
@@ -0,0 +1,24 @@
+import argparse
+import sys
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+parser = argparse.ArgumentParser(description='perf_logs partition maintenance. Run it daily, e.g. from cron.')
+parser.add_argument('--premake', type=int, default=None, help='Number of future partitions to keep ready.')
+parser.add_argument('--retention-days', type=int, default=None, help='Drop partitions older than this many days.')
+parser.add_argument('--detach-only', action='store_true', help='Detach expired partitions instead of dropping them.')
+args = parser.parse_args()
+
+sys.path.append('')
+
+from app.core.config import settings
+from app.services.audit_partition import AuditPartitionService
+
+service = AuditPartitionService(
+    premake=args.premake if args.premake is not None else settings.perf_logs_partition_premake,
+    retention_days=args.retention_days if args.retention_days is not None else settings.perf_logs_retention_days,
+)
+
+created, expired = service.maintain(detach_only=args.detach_only)
+print(f'Created partitions: {", ".join(created) or "-"}')
+print(f'{"Detached" if args.detach_only else "Dropped"} partitions: {", ".join(expired) or "-"}')
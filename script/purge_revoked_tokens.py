@@ -0,0 +1,21 @@
+import argparse
+import sys
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+sys.path.append('')
+
+from app.core.constants.auth import REVOKED_TOKEN_PURGE_BATCH_SIZE
+
+parser = argparse.ArgumentParser(description='Delete expired revoked_tokens and refresh_tokens entries. Run it periodically, e.g. from cron.')
+parser.add_argument('--batch-size', type=int, default=REVOKED_TOKEN_PURGE_BATCH_SIZE, help='Rows deleted per transaction.')
+args = parser.parse_args()
+
+from app.repositories.refresh_token import RefreshTokenRepository
+from app.repositories.token import TokenRepository
+
+purged = TokenRepository().purge_expired(args.batch_size)
+print(f'Purged {purged} expired revoked tokens.')
+
+purged = RefreshTokenRepository().purge_expired(args.batch_size)
+print(f'Purged {purged} expired refresh tokens.')